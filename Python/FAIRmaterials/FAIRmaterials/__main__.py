@@ -1,12 +1,358 @@
 import argparse
 from pathlib import Path
 from rdflib import Graph as rdfGraph
-import graphviz
 from FAIRmaterials.fair_sheet_parser import FairSheetParser
 from FAIRmaterials.rdflib_graph_saver import RDFLibGraphSaver
-from FAIRmaterials.rdflib_graph_merger import RDFLibGraphMerger
+from FAIRmaterials.graphviz_renderer import GraphvizRenderer
+from FAIRmaterials.render_pool import RenderPool
+from FAIRmaterials.rdflib_graph_merger import RDFLibGraphMerger, LocalNameIndex
+from FAIRmaterials.external_ontology_cache import ExternalOntologyCache
+from FAIRmaterials.external_ontology_registry import ExternalOntologyRegistry
+from FAIRmaterials.fair_sheet_records import read_ontology_info
+from FAIRmaterials.build_manifest import BuildManifest
+from FAIRmaterials.term_interner import TermInterner
+from FAIRmaterials.value_csv_ingester import ValueCsvIngester
+from FAIRmaterials.sheet_watcher import SheetWatcher
+from FAIRmaterials.profiler import Profiler, set_profiler, get_profiler, profile_stage
+import contextvars
+import cProfile
 import os
-import shutil
+import sys
+import time
+import warnings
+from concurrent.futures import Future, ProcessPoolExecutor
+
+def build_ontology(folder_path, prefix, include_graph_valuetype, include_pylode_docs, add_external_onto_info, include_ntriples=False, compress_ntriples=False, force=False, external_ontology_registry=None, graphviz_renderer=None, render_pool=None, snapshot_format=None, term_interner=None):
+    """
+    Builds the ontology for a single set of FAIR sheets and saves all of its outputs.
+
+    The function only depends on its arguments and writes exclusively into the ``<ontology name>_output`` folder,
+    so it can be run in a separate worker process for every sheet prefix. If the build manifest in that folder shows
+    that the sheets, options and package version are unchanged, the outputs are kept and the saved graph is returned.
+
+    Args:
+        folder_path (pathlib.Path): Folder where the FAIRSheetInput CSV files are located.
+        prefix (str): The prefix for the set of ontology CSV files.
+        include_graph_valuetype (bool): Whether to include valuetype and units in the Graphviz PNG.
+        include_pylode_docs (bool): Whether to output HTML documentation for the created ontology.
+        add_external_onto_info (bool): Whether to import description and label info from external ontology terms.
+        include_ntriples (bool): Whether to also save the ontology as N-Triples (Optional).
+        compress_ntriples (bool): Whether to gzip-compress the N-Triples file (Optional).
+        force (bool): Whether to rebuild the ontology even if its inputs are unchanged (Optional).
+        external_ontology_registry (ExternalOntologyRegistry): Run-scoped registry of external ontologies shared by all prefixes (Optional).
+        graphviz_renderer (GraphvizRenderer): Renderer of the Graphviz diagram, defaults to a single diagram with the default thresholds (Optional).
+        render_pool (RenderPool): Pool rendering the Graphviz diagram and HTML documentation in the background (Optional).
+        snapshot_format (str): Whether to also save a binary snapshot of the ontology as "npz" or "npy" (Optional).
+        term_interner (TermInterner): Run-wide table of terms shared by all prefixes and the merge step (Optional).
+
+    Returns:
+        rdflib.Graph: The RDFLib graph of the built ontology, used for the merge step.
+    """
+    with profile_stage("build_ontology", prefix=prefix) as counts:
+        sheet_paths = FairSheetParser.get_sheet_paths(folder_path, prefix)
+        output_folder = f"{read_ontology_info(sheet_paths['ontology_info']).name}_output"
+        build_manifest = get_build_manifest(folder_path, prefix, include_graph_valuetype, include_pylode_docs, add_external_onto_info, include_ntriples, compress_ntriples, graphviz_renderer, snapshot_format)
+        if not force and build_manifest.is_up_to_date(output_folder):
+            counts["up_to_date"] = True
+            return BuildManifest.load_graph(output_folder)
+
+        # graphviz is only imported once an ontology is built, so that up-to-date runs start faster
+        import graphviz
+
+        rdflib_graph = rdfGraph()
+        graphviz_graph = graphviz.Digraph(strict=False)
+
+        # Create FairSheetParser instance
+        fair_sheet_parser = FairSheetParser(
+            folder_path=folder_path,
+            prefix=prefix,
+            include_graph_valuetype=include_graph_valuetype,
+            rdflib_graph=rdflib_graph,
+            graphviz_graph=graphviz_graph,
+            add_external_onto_info=add_external_onto_info,
+            external_ontology_registry=external_ontology_registry,
+            term_interner=term_interner,
+        )
+        counts["triples"] = len(fair_sheet_parser.get_rdf_graph())
+        counts["graphviz_lines"] = len(fair_sheet_parser.get_graphviz_graph().body)
+
+        save_ontology(fair_sheet_parser, build_manifest, include_pylode_docs, include_ntriples, compress_ntriples, graphviz_renderer, render_pool, snapshot_format)
+        return fair_sheet_parser.get_rdf_graph()
+
+def get_build_manifest(folder_path, prefix, include_graph_valuetype, include_pylode_docs, add_external_onto_info, include_ntriples=False, compress_ntriples=False, graphviz_renderer=None, snapshot_format=None):
+    """
+    Creates the build manifest of a single set of FAIR sheets from its current sheets and the build options.
+
+    Args:
+        folder_path (pathlib.Path): Folder where the FAIRSheetInput CSV files are located.
+        prefix (str): The prefix for the set of ontology CSV files.
+        include_graph_valuetype (bool): Whether to include valuetype and units in the Graphviz PNG.
+        include_pylode_docs (bool): Whether to output HTML documentation for the created ontology.
+        add_external_onto_info (bool): Whether to import description and label info from external ontology terms.
+        include_ntriples (bool): Whether to also save the ontology as N-Triples (Optional).
+        compress_ntriples (bool): Whether to gzip-compress the N-Triples file (Optional).
+        graphviz_renderer (GraphvizRenderer): Renderer of the Graphviz diagram (Optional).
+        snapshot_format (str): Whether to also save a binary snapshot of the ontology as "npz" or "npy" (Optional).
+
+    Returns:
+        BuildManifest: The manifest of the build.
+    """
+    options = {
+        "include_graph_valuetype": include_graph_valuetype,
+        "include_pylode_docs": include_pylode_docs,
+        "add_external_onto_info": add_external_onto_info,
+        "include_ntriples": include_ntriples,
+        "compress_ntriples": compress_ntriples,
+        "graphviz": (graphviz_renderer or GraphvizRenderer()).get_options(),
+        "snapshot_format": snapshot_format,
+        "external_ontology_sources": FairSheetParser.get_external_ontology_sources(folder_path, prefix) if add_external_onto_info else []
+    }
+    return BuildManifest(FairSheetParser.get_sheet_paths(folder_path, prefix).values(), options)
+
+def save_ontology(fair_sheet_parser, build_manifest, include_pylode_docs, include_ntriples=False, compress_ntriples=False, graphviz_renderer=None, render_pool=None, snapshot_format=None):
+    """
+    Saves all outputs of a parsed ontology into its ``<ontology name>_output`` folder and writes its build manifest.
+
+    With a render pool, the diagram and documentation render in the background and the manifest is written by the
+    pool once they have succeeded. The manifest of the previous build is removed first, and no manifest is written if
+    a render failed or timed out, so that the next run builds the ontology again.
+
+    Args:
+        fair_sheet_parser (FairSheetParser): The parser holding the RDFLib and Graphviz graphs of the ontology.
+        build_manifest (BuildManifest): The manifest of the build, written after all outputs.
+        include_pylode_docs (bool): Whether to output HTML documentation for the created ontology.
+        include_ntriples (bool): Whether to also save the ontology as N-Triples (Optional).
+        compress_ntriples (bool): Whether to gzip-compress the N-Triples file (Optional).
+        graphviz_renderer (GraphvizRenderer): Renderer of the Graphviz diagram (Optional).
+        render_pool (RenderPool): Pool rendering the Graphviz diagram and HTML documentation in the background (Optional).
+        snapshot_format (str): Whether to also save a binary snapshot of the ontology as "npz" or "npy" (Optional).
+
+    Returns:
+        dict: A dictionary of the saved outputs and their file paths, or futures for outputs that are still rendering.
+    """
+    ontology_name = fair_sheet_parser.get_ontology_name()
+    output_folder = f"{ontology_name}_output"
+    BuildManifest.remove(output_folder)
+    rdflib_graph_saver = RDFLibGraphSaver(ontology_name, fair_sheet_parser.get_rdf_graph(), fair_sheet_parser.get_graphviz_graph(), graphviz_renderer, fair_sheet_parser.get_graphviz_node_ids())
+    # Save the TTL, JSON-LD and optional N-Triples files, the Graphviz graph visualization and the optional PyLode documentation
+    outputs = rdflib_graph_saver.save_all(
+        include_pylode_docs=include_pylode_docs,
+        include_ntriples=include_ntriples,
+        compress_ntriples=compress_ntriples,
+        render_pool=render_pool,
+        snapshot_format=snapshot_format,
+    )
+
+    # The archive of the input sheets is written straight into this ontology's own output folder
+    with profile_stage("zip_input_sheets"):
+        outputs["zip"] = fair_sheet_parser.zip_input_csv_files(output_folder)
+
+    # The manifest is written last, so that an interrupted build is never mistaken for a complete one
+    renders = [output for output in outputs.values() if isinstance(output, Future)]
+    if renders:
+        render_pool.when_done(f"{ontology_name} build manifest", renders, write_build_manifest, build_manifest, output_folder, outputs)
+    else:
+        write_build_manifest(build_manifest, output_folder, outputs)
+    return outputs
+
+def write_build_manifest(build_manifest, output_folder, outputs):
+    """
+    Writes the manifest of a build, unless one of its outputs is missing, e.g. a diagram whose layout timed out.
+
+    Args:
+        build_manifest (BuildManifest): The manifest of the build.
+        output_folder (str): The output folder of the ontology.
+        outputs (dict): Dictionary of the saved outputs and their file paths or futures, as returned by RDFLibGraphSaver.save_all().
+
+    Returns:
+        str: The file path of the manifest, or None if the build is incomplete.
+    """
+    missing = RDFLibGraphSaver.get_missing_outputs(outputs)
+    if missing:
+        warnings.warn(f"The build in {output_folder} is incomplete ({', '.join(missing)} missing) and will be repeated by the next run")
+        return None
+    return build_manifest.write(output_folder, RDFLibGraphSaver.resolve_outputs(outputs))
+
+def save_merged_ontology(merged_graph, merge_title, include_pylode_docs, include_ntriples=False, compress_ntriples=False, render_pool=None, snapshot_format=None):
+    """
+    Saves all outputs of the merged ontology.
+
+    Args:
+        merged_graph (rdflib.Graph): The merged ontology graph, including its ownership metadata.
+        merge_title (str): Title of the merged ontology, used as its name (Optional, defaults to "merged_ontology").
+        include_pylode_docs (bool): Whether to output HTML documentation for the merged ontology.
+        include_ntriples (bool): Whether to also save the merged ontology as N-Triples (Optional).
+        compress_ntriples (bool): Whether to gzip-compress the N-Triples file (Optional).
+        render_pool (RenderPool): Pool generating the HTML documentation in the background (Optional).
+        snapshot_format (str): Whether to also save a binary snapshot of the merged ontology as "npz" or "npy" (Optional).
+
+    Returns:
+        dict: A dictionary of the saved outputs and their file paths, or futures for outputs that are still rendering.
+    """
+    if merge_title is not None:
+        merged_rdflib_graph_saver = RDFLibGraphSaver(merge_title, merged_graph, None)
+    else:
+        merged_rdflib_graph_saver = RDFLibGraphSaver("merged_ontology", merged_graph, None)
+    # Save the merged outputs, the merged graph has no Graphviz visualization
+    with profile_stage("save_merged_ontology", triples=len(merged_graph)):
+        return merged_rdflib_graph_saver.save_all(
+            include_graphviz=False,
+            include_pylode_docs=include_pylode_docs,
+            include_ntriples=include_ntriples,
+            compress_ntriples=compress_ntriples,
+            render_pool=render_pool,
+            snapshot_format=snapshot_format,
+        )
+
+def report_renders(render_pool, print_times=False):
+    """
+    Waits for the renders of a render pool and reports failures with a warning.
+
+    Args:
+        render_pool (RenderPool): The pool to wait for.
+        print_times (bool): Whether to also print the time of every finished artifact, e.g. when the run is profiled (Optional).
+    """
+    for render in render_pool.wait():
+        if render["error"] is None:
+            if print_times:
+                print(f"Finished {render['artifact']} in {render['seconds']:.3f} s")
+        else:
+            warnings.warn(f"Failed to render {render['artifact']} after {render['seconds']:.3f} s: {render['error']}")
+
+def watch_ontologies(args, external_ontology_registry, graphviz_renderer=None, render_pool=None, term_interner=None):
+    """
+    Builds all ontologies of a folder and rebuilds them whenever their sheets change, until the process is interrupted.
+
+    The parsers of all prefixes, the external ontology registry and the merged graph are kept in memory. When sheets
+    change, only the changed sheets of the affected prefixes and the sheets depending on them are parsed again, the
+    merged graph is updated with the triples that were removed and added, and the outputs of the affected prefixes
+    and of the merged ontology are saved again. The latency of every rebuild is printed.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+        external_ontology_registry (ExternalOntologyRegistry): Registry of the external ontologies, kept for all rebuilds.
+        graphviz_renderer (GraphvizRenderer): Renderer of the Graphviz diagrams (Optional).
+        render_pool (RenderPool): Pool rendering the diagrams and documentation of a rebuild in the background (Optional).
+        term_interner (TermInterner): Table of terms shared by all parsers and the merged graph, kept for all rebuilds (Optional).
+    """
+    import graphviz
+
+    folder_path = args.folder_path
+    watcher = SheetWatcher(folder_path, interval=args.watch_interval, debounce=args.watch_debounce)
+    parsers = {}
+    # The triples of every prefix as last merged, kept apart from the live graphs to compute what a rebuild changed
+    merged_triples = {}
+    label_index = LocalNameIndex()
+    merged_graph = RDFLibGraphMerger.add_ontology_ownership(RDFLibGraphMerger.merge_many([], label_index=label_index), args.merge_base_uri, args.merge_title, args.merge_version, args.merge_description)
+
+    def rebuild_prefix(prefix, changed_sheets):
+        sheet_paths = FairSheetParser.get_sheet_paths(folder_path, prefix)
+        if not all(path.exists() for path in sheet_paths.values()):
+            # Removed or incomplete sets of sheets are dropped from the merged ontology
+            parsers.pop(prefix, None)
+            return set()
+        fair_sheet_parser = parsers.get(prefix)
+        if fair_sheet_parser is None:
+            fair_sheet_parser = FairSheetParser(folder_path, prefix, args.include_graph_valuetype, rdfGraph(), graphviz.Digraph(strict=False), args.add_external_onto_info, external_ontology_registry=external_ontology_registry, term_interner=term_interner)
+            parsers[prefix] = fair_sheet_parser
+            rebuilt_sheets = set(FairSheetParser.SHEETS) if args.add_external_onto_info else set(FairSheetParser.SHEETS[:-1])
+        else:
+            rebuilt_sheets = fair_sheet_parser.rebuild(changed_sheets)
+        build_manifest = get_build_manifest(folder_path, prefix, args.include_graph_valuetype, args.include_pylode_docs, args.add_external_onto_info, args.include_ntriples, args.compress_ntriples, graphviz_renderer, args.snapshot)
+        if not build_manifest.is_up_to_date(f"{fair_sheet_parser.get_ontology_name()}_output"):
+            save_ontology(fair_sheet_parser, build_manifest, args.include_pylode_docs, args.include_ntriples, args.compress_ntriples, graphviz_renderer, render_pool, args.snapshot)
+        return rebuilt_sheets
+
+    def rebuild(changed_sheets):
+        start = time.perf_counter()
+        # External ontologies stay loaded between rebuilds, only newly referenced ones are fetched
+        if args.add_external_onto_info:
+            prefetch_external_ontologies(external_ontology_registry, sorted({
+                source for prefix in changed_sheets if FairSheetParser.get_sheet_paths(folder_path, prefix)["namespace"].exists()
+                for source in FairSheetParser.get_external_ontology_sources(folder_path, prefix)
+            }), args.external_onto_deadline)
+        for prefix, sheets in sorted(changed_sheets.items()):
+            prefix_start = time.perf_counter()
+            try:
+                with profile_stage("rebuild", prefix=prefix, sheets=sorted(sheets)):
+                    rebuilt_sheets = rebuild_prefix(prefix, sheets)
+            except Exception as e:
+                # A sheet may be saved while it is still being edited, the prefix is parsed from scratch after its next change
+                parsers.pop(prefix, None)
+                warnings.warn(f"Failed to rebuild the ontology of {prefix}: {e}")
+                continue
+
+            triples = set(parsers[prefix].get_rdf_graph()) if prefix in parsers else set()
+            old_triples = merged_triples.pop(prefix, set())
+            RDFLibGraphMerger.update_merged_graph(merged_graph, old_triples - triples, triples - old_triples, list(merged_triples.values()), label_index=label_index, term_interner=term_interner)
+            if prefix in parsers:
+                merged_triples[prefix] = triples
+                for namespace_prefix, namespace in parsers[prefix].get_rdf_graph().namespaces():
+                    merged_graph.bind(namespace_prefix, namespace)
+            print(f"Rebuilt {prefix} ({', '.join(sheet for sheet in FairSheetParser.SHEETS if sheet in rebuilt_sheets) or 'removed'}) in {time.perf_counter() - prefix_start:.3f} s")
+
+        # Terms that were only used by replaced triples would otherwise be kept for as long as the process watches
+        if term_interner is not None:
+            term_interner.retain([merged_graph, *merged_triples.values()])
+
+        if len(merged_triples) > 1:
+            save_merged_ontology(merged_graph, args.merge_title, args.include_pylode_docs, args.include_ntriples, args.compress_ntriples, render_pool, args.snapshot)
+        if render_pool is not None:
+            report_renders(render_pool, get_profiler() is not None)
+        print(f"Rebuild finished in {time.perf_counter() - start:.3f} s")
+
+    rebuild(SheetWatcher.get_changed_sheets(os.listdir(folder_path)))
+    print(f"Watching {folder_path} for changes, press Ctrl+C to stop")
+    try:
+        while True:
+            changed_sheets = watcher.wait_for_changes()
+            if changed_sheets:
+                rebuild(changed_sheets)
+    except KeyboardInterrupt:
+        pass
+
+def prefetch_external_ontologies(external_ontology_registry, sources, deadline):
+    """
+    Fetches external ontologies into the registry, recorded as a stage of the profile.
+
+    Args:
+        external_ontology_registry (ExternalOntologyRegistry): The registry the ontologies are loaded into.
+        sources (list): The sources of the external ontologies.
+        deadline (float): Total time in seconds allowed for fetching all ontologies, or None for no limit.
+    """
+    with profile_stage("prefetch_external_ontologies", sources=len(sources)):
+        external_ontology_registry.prefetch(sources, deadline=deadline)
+
+# Registry of external ontologies inside a worker process of the --jobs mode
+_worker_external_ontology_registry = None
+# Whether the worker processes record profiles of their builds
+_worker_profile = False
+
+def _init_build_worker(external_ontology_registry, profile=False):
+    """
+    Stores the external ontology registry sent to a worker process when the process pool starts.
+    """
+    global _worker_external_ontology_registry, _worker_profile
+    _worker_external_ontology_registry = external_ontology_registry
+    _worker_profile = profile
+
+def _build_ontology_in_worker(*arguments, **options):
+    """
+    Runs build_ontology() in a worker process with the registry of that worker.
+
+    Returns the graph together with the stages recorded in the worker, which are empty unless profiling is enabled.
+    """
+    if not _worker_profile:
+        return build_ontology(*arguments, external_ontology_registry=_worker_external_ontology_registry, **options), []
+    profiler = Profiler()
+    set_profiler(profiler)
+    try:
+        # A forked worker inherits the open stages of the main process, the stages are recorded from an empty context
+        # and placed under the open stages of the main process by Profiler.add_stages()
+        graph = contextvars.Context().run(build_ontology, *arguments, external_ontology_registry=_worker_external_ontology_registry, **options)
+    finally:
+        set_profiler(None)
+    return graph, profiler.get_stages()
 
 def main():
     """
@@ -26,6 +372,33 @@ def main():
         --merge_author (str): string containing authors for the merged RDF dataset (Optional).
         --merge_URL (str): string containing URL for the merged RDF dataset.
         --merge_description (str): String containing description for the merged RDF dataset.
+        --include_ntriples (bool): Whether to also save the ontologies as N-Triples (Optional).
+        --compress_ntriples (bool): Whether to gzip-compress the N-Triples files (Optional).
+        --snapshot (str): Whether to also save binary NumPy snapshots of the ontologies as npz or npy (Optional).
+        --force (bool): Whether to rebuild all ontologies even if their sheets and options are unchanged (Optional).
+        --watch (bool): Whether to keep running and rebuild the ontologies whenever their sheets change (Optional).
+        --watch_interval (float): Time in seconds between two scans of the folder in watch mode (Optional).
+        --watch_debounce (float): Time in seconds the folder has to be quiet after a change before rebuilding in watch mode (Optional).
+        --jobs (int): Number of worker processes used to build the ontologies in parallel (Optional, defaults to 1).
+        --external_onto_cache_dir (str): Folder used to cache external ontologies between runs (Optional).
+        --external_onto_cache_size (int): Maximum size of the external ontology cache in megabytes (Optional).
+        --offline (bool): Whether to load external ontologies only from the cache (Optional).
+        --external_onto_timeout (float): Timeout of each external ontology request in seconds (Optional).
+        --external_onto_host_timeout (str): Timeout for a single host as HOST=SECONDS, can be repeated (Optional).
+        --external_onto_retries (int): Number of times a failed external ontology request is retried (Optional).
+        --external_onto_workers (int): Number of external ontologies fetched concurrently (Optional).
+        --external_onto_deadline (float): Total time in seconds allowed for fetching all external ontologies (Optional).
+        --graphviz_node_threshold (int): Number of nodes above which the Graphviz graph is laid out with sfdp or neato and saved as SVG (Optional).
+        --graphviz_edge_threshold (int): Number of edges above which the Graphviz graph is laid out with sfdp or neato and saved as SVG (Optional).
+        --graphviz_large_engine (str): Layout engine of Graphviz graphs above a threshold, sfdp or neato (Optional).
+        --graphviz_timeout (float): Time in seconds a Graphviz layout may take (Optional).
+        --graphviz_partition (str): Whether to save one diagram per namespace or per top-level class subtree (Optional).
+        --render_workers (int): Number of diagrams and documents rendered in the background, 0 to render them in turn (Optional).
+        --profile (str): JSON file the wall time, CPU time, peak memory and sizes of every stage are written to (Optional).
+        --profile_cprofile (str): File the cProfile statistics of the run are written to (Optional).
+        --values (str): Value CSV file streamed into an N-Triples file of individuals of an ontology, as PREFIX=CSV; can be repeated (Optional).
+        --values_chunk_rows (int): Number of value CSV rows whose triples are written at once (Optional).
+        --values_cache_size (int): Number of written individuals and links remembered to skip duplicates (Optional).
     
     Raises:
         argparse.ArgumentError: If there is an error in parsing command-line arguments.
@@ -49,9 +422,123 @@ def main():
     parser.add_argument('--merge_base_uri', help="string containing URL for the merged RDF dataset (Optional)")
     parser.add_argument('--merge_description', help="string containing description for the merged RDF dataset (Optional)")
     parser.add_argument('--merge_version', help="string containing version for the merged RDF dataset (Optional)")
+    parser.add_argument('--include_ntriples', help="Also save the ontologies as N-Triples, written line by line (Optional)", action="store_true")
+    parser.add_argument('--compress_ntriples', help="Gzip-compress the N-Triples files (Optional)", action="store_true")
+    parser.add_argument('--snapshot', help="Also save every ontology as a binary NumPy snapshot, a single .npz file or a folder of memory-mappable .npy files; needs numpy (Optional)", choices=("npz", "npy"))
+    parser.add_argument('--force', help="Rebuild every ontology, even if its sheets, the options and the package version are unchanged since the last build (Optional)", action="store_true")
+    parser.add_argument('--watch', help="Keep running and rebuild the changed ontologies whenever their sheets change, until interrupted with Ctrl+C (Optional)", action="store_true")
+    parser.add_argument('--watch_interval', help="Time in seconds between two scans of the folder in watch mode (Optional)", type=float, default=1.0)
+    parser.add_argument('--watch_debounce', help="Time in seconds the folder has to be quiet after a change before the ontologies are rebuilt in watch mode (Optional)", type=float, default=0.5)
+    parser.add_argument('--jobs', help="Number of worker processes used to build the ontologies of the different sheet prefixes in parallel (Optional)", type=int, default=1)
+    parser.add_argument('--external_onto_cache_dir', help="Folder used to cache external ontologies between runs (Optional)", type=Path)
+    parser.add_argument('--external_onto_cache_size', help="Maximum size of the external ontology cache in megabytes (Optional)", type=int, default=256)
+    parser.add_argument('--offline', help="Load external ontologies only from the cache, without network access (Optional)", action="store_true")
+    parser.add_argument('--external_onto_timeout', help="Timeout of each external ontology request in seconds (Optional)", type=float, default=ExternalOntologyRegistry.DEFAULT_TIMEOUT)
+    parser.add_argument('--external_onto_host_timeout', help="Timeout of the external ontology requests to one host, given as HOST=SECONDS; can be repeated (Optional)", action="append", default=[])
+    parser.add_argument('--external_onto_retries', help="Number of times a failed external ontology request is retried (Optional)", type=int, default=ExternalOntologyRegistry.DEFAULT_RETRIES)
+    parser.add_argument('--external_onto_workers', help="Number of external ontologies fetched concurrently (Optional)", type=int, default=ExternalOntologyRegistry.DEFAULT_MAX_WORKERS)
+    parser.add_argument('--external_onto_deadline', help="Total time in seconds allowed for fetching all external ontologies (Optional)", type=float)
+    parser.add_argument('--graphviz_node_threshold', help="Number of nodes above which the Graphviz graph is laid out with the large graph engine and saved as SVG (Optional)", type=int, default=GraphvizRenderer.DEFAULT_NODE_THRESHOLD)
+    parser.add_argument('--graphviz_edge_threshold', help="Number of edges above which the Graphviz graph is laid out with the large graph engine and saved as SVG (Optional)", type=int, default=GraphvizRenderer.DEFAULT_EDGE_THRESHOLD)
+    parser.add_argument('--graphviz_large_engine', help="Layout engine of Graphviz graphs above a threshold (Optional)", choices=GraphvizRenderer.LARGE_ENGINES, default="sfdp")
+    parser.add_argument('--graphviz_timeout', help="Time in seconds a Graphviz layout may take before it is stopped (Optional)", type=float, default=GraphvizRenderer.DEFAULT_TIMEOUT)
+    parser.add_argument('--graphviz_partition', help="Save one SVG diagram per namespace or per top-level class subtree instead of a single diagram (Optional)", choices=GraphvizRenderer.PARTITIONS)
+    parser.add_argument('--render_workers', help="Number of Graphviz diagrams and HTML documents rendered in the background while the next ontologies are built, 0 to render them in turn (Optional)", type=int, default=RenderPool.DEFAULT_MAX_WORKERS)
+    parser.add_argument('--profile', help="Write the wall time, CPU time, peak memory and sizes of every stage to this JSON file (Optional)", type=Path)
+    parser.add_argument('--profile_cprofile', help="Write the cProfile statistics of the run to this file, to be read with pstats or snakeviz (Optional)", type=Path)
+    parser.add_argument('--values', help="Stream a value CSV file, whose columns are full names of value types, into an N-Triples file of individuals of the ontology of a sheet prefix, given as PREFIX=CSV; can be repeated (Optional)", action="append", default=[])
+    parser.add_argument('--values_chunk_rows', help="Number of value CSV rows whose triples are written at once (Optional)", type=int, default=ValueCsvIngester.DEFAULT_CHUNK_ROWS)
+    parser.add_argument('--values_cache_size', help="Number of written individuals and links remembered to skip duplicates, which bounds the memory of the value ingestion (Optional)", type=int, default=ValueCsvIngester.DEFAULT_MAX_CACHED_KEYS)
     # Parse arguments
     args = parser.parse_args()
 
+    profiler = None
+    if args.profile is not None:
+        profiler = Profiler()
+        set_profiler(profiler)
+    c_profile = None
+    if args.profile_cprofile is not None:
+        c_profile = cProfile.Profile()
+        c_profile.enable()
+    try:
+        with profile_stage("main"):
+            run(args, parser)
+    finally:
+        # The profiles are also written when the run fails or watch mode is interrupted
+        if c_profile is not None:
+            c_profile.disable()
+            c_profile.dump_stats(args.profile_cprofile)
+        if profiler is not None:
+            set_profiler(None)
+            profiler.write(args.profile, version=BuildManifest.get_package_version(), argv=sys.argv)
+
+def run(args, parser):
+    """
+    Builds the ontologies of the sheet folder, or watches the folder, as requested by the parsed command-line arguments.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+        parser (argparse.ArgumentParser): The parser of the arguments, used to report invalid arguments.
+    """
+
+    external_ontology_cache = None
+    if args.external_onto_cache_dir is not None or args.offline:
+        external_ontology_cache = ExternalOntologyCache(args.external_onto_cache_dir, args.external_onto_cache_size * 1024 * 1024, args.offline)
+    host_timeouts = {}
+    for host_timeout in args.external_onto_host_timeout:
+        host, _, seconds = host_timeout.rpartition("=")
+        if host == "":
+            parser.error(f"argument --external_onto_host_timeout: expected HOST=SECONDS, got '{host_timeout}'")
+        host_timeouts[host] = float(seconds)
+    value_csvs = []
+    for value_csv in args.values:
+        prefix, _, csv_path = value_csv.partition("=")
+        if csv_path == "":
+            parser.error(f"argument --values: expected PREFIX=CSV, got '{value_csv}'")
+        value_csvs.append((prefix, Path(csv_path)))
+    if value_csvs and args.watch:
+        parser.error("argument --values: not supported in watch mode")
+    if args.values_chunk_rows < 1 or args.values_cache_size < 1:
+        parser.error("arguments --values_chunk_rows and --values_cache_size must be at least 1")
+    # A single registry is shared by all prefixes so that every external ontology is only loaded once per run
+    external_ontology_registry = ExternalOntologyRegistry(
+        external_ontology_cache,
+        timeout=args.external_onto_timeout,
+        host_timeouts=host_timeouts,
+        retries=args.external_onto_retries,
+        max_workers=args.external_onto_workers,
+    )
+    try:
+        graphviz_renderer = GraphvizRenderer(args.graphviz_node_threshold, args.graphviz_edge_threshold, args.graphviz_large_engine, args.graphviz_timeout, args.graphviz_partition)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Graphviz diagrams and PyLODE documentation render in the background while the next ontologies are built
+    render_pool = RenderPool(args.render_workers) if args.render_workers > 0 else None
+    # Like the registry, a single table of terms is shared by all prefixes and the merged ontology
+    term_interner = TermInterner()
+    try:
+        if args.watch:
+            watch_ontologies(args, external_ontology_registry, graphviz_renderer, render_pool, term_interner)
+        else:
+            build_ontologies(args, external_ontology_registry, graphviz_renderer, render_pool, term_interner, value_csvs)
+    finally:
+        if render_pool is not None:
+            report_renders(render_pool, get_profiler() is not None)
+            render_pool.shutdown()
+
+def build_ontologies(args, external_ontology_registry, graphviz_renderer, render_pool=None, term_interner=None, value_csvs=()):
+    """
+    Builds the ontologies of every sheet prefix of the folder and the merged ontology.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+        external_ontology_registry (ExternalOntologyRegistry): Registry of the external ontologies shared by all prefixes.
+        graphviz_renderer (GraphvizRenderer): Renderer of the Graphviz diagrams.
+        render_pool (RenderPool): Pool rendering the diagrams and documentation in the background (Optional). Builds in worker processes render in the workers.
+        term_interner (TermInterner): Table of terms shared by all prefixes and the merged ontology (Optional). Builds in worker processes intern their terms in a table of the worker, the merge step interns them again.
+        value_csvs (list): (prefix, path) pairs of the value CSV files streamed into N-Triples files once the ontologies are built (Optional).
+    """
     # Group files by prefix
     files = [f for f in os.listdir(args.folder_path) if os.path.isfile(os.path.join(args.folder_path, f))]
     grouped_files = []
@@ -59,66 +546,85 @@ def main():
         prefix = file.split("-")[0]
         grouped_files.append(prefix)
 
-    ontologies = []
-    
-    for prefix in set(grouped_files):
-        rdflib_graph = rdfGraph()
-        graphviz_graph = graphviz.Digraph(strict=False)
-
-        # Create FairSheetParser instance
-        fair_sheet_parser = FairSheetParser(
-            folder_path=args.folder_path,
-            prefix=prefix,
-            include_graph_valuetype=args.include_graph_valuetype,
-            rdflib_graph=rdflib_graph,
-            graphviz_graph=graphviz_graph,
-            add_external_onto_info=args.add_external_onto_info,
-        )
-
-        rdflib_graph = fair_sheet_parser.get_rdf_graph()
-        graphviz_graph = fair_sheet_parser.get_graphviz_graph()
-        ontology_name = fair_sheet_parser.get_ontology_name()
-        rdflib_graph_saver = RDFLibGraphSaver(ontology_name, rdflib_graph, graphviz_graph)
-        # Save RDFLib graph to OWL file
-        rdflib_graph_saver.save_rdflib_graph_owl()
+    prefixes = sorted(set(grouped_files))
+    build_args = [
+        (args.folder_path, prefix, args.include_graph_valuetype, args.include_pylode_docs, args.add_external_onto_info, args.include_ntriples, args.compress_ntriples, args.force)
+        for prefix in prefixes
+    ]
 
-        # Save RDFLib graph to JSON-LD file
-        rdflib_graph_saver.save_rdflib_graph_jsonld()
-        
-        # Save Graphviz graph visualization
-        rdflib_graph_saver.save_graphviz_graph()
+    # Fetch all external ontologies concurrently before the builds start, every build then reads them from the registry
+    if args.add_external_onto_info:
+        prefetch_external_ontologies(external_ontology_registry, sorted({
+            source for prefix in prefixes for source in FairSheetParser.get_external_ontology_sources(args.folder_path, prefix)
+        }), args.external_onto_deadline)
 
-        # Generate PyLode documentation
-        if args.include_pylode_docs:
-            rdflib_graph_saver.generate_pylode_html()
-        
-        ontologies.append(rdflib_graph)
+    if args.jobs > 1:
+        # Build every prefix in its own worker process, the finished graphs are sent back for the merge step.
+        # Every worker receives a copy of the loaded registry.
+        with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_build_worker, initargs=(external_ontology_registry, get_profiler() is not None)) as executor:
+            futures = [executor.submit(_build_ontology_in_worker, *arguments, graphviz_renderer=graphviz_renderer, snapshot_format=args.snapshot) for arguments in build_args]
+            ontologies = []
+            for future in futures:
+                graph, stages = future.result()
+                ontologies.append(graph)
+                if get_profiler() is not None:
+                    # The stages of the workers keep the process id they ran in
+                    get_profiler().add_stages(stages)
+    else:
+        ontologies = [build_ontology(*arguments, external_ontology_registry=external_ontology_registry, graphviz_renderer=graphviz_renderer, render_pool=render_pool, snapshot_format=args.snapshot, term_interner=term_interner) for arguments in build_args]
 
-        zip_file_name = fair_sheet_parser.zip_input_csv_files()
-        
-        shutil.move(zip_file_name, os.path.join(f"{ontology_name}_output", zip_file_name))
-        
     if len(ontologies) > 1:
         merger = RDFLibGraphMerger()
-        merged_graph = ontologies[0]
-        remaining_graphs = ontologies[1:]
-        for graph in remaining_graphs:
-            merged_graph = merger.merge_ontologies(merged_graph, graph)
+        merged_graph = merger.merge_many(ontologies, term_interner=term_interner)
 
         merged_graph = merger.add_ontology_ownership(merged_graph, args.merge_base_uri, args.merge_title, args.merge_version, args.merge_description)
-        if args.merge_title is not None:
-            merged_rdflib_graph_saver = RDFLibGraphSaver(args.merge_title, merged_graph, None)
-        else:
-            merged_rdflib_graph_saver = RDFLibGraphSaver("merged_ontology", merged_graph, None)
-        # Save RDFLib graph to OWL file
-        merged_rdflib_graph_saver.save_rdflib_graph_owl()
+        save_merged_ontology(merged_graph, args.merge_title, args.include_pylode_docs, args.include_ntriples, args.compress_ntriples, render_pool, args.snapshot)
+
+    if value_csvs:
+        ingest_values(args.folder_path, prefixes, value_csvs, args.compress_ntriples, args.values_chunk_rows, args.values_cache_size, term_interner)
 
-        # Save RDFLib graph to JSON-LD file
-        merged_rdflib_graph_saver.save_rdflib_graph_jsonld()
+def ingest_values(folder_path, prefixes, value_csvs, compress=False, chunk_rows=ValueCsvIngester.DEFAULT_CHUNK_ROWS, max_cached_keys=ValueCsvIngester.DEFAULT_MAX_CACHED_KEYS, term_interner=None):
+    """
+    Streams value CSV files into N-Triples files of individuals, saved in the ``<ontology name>_output`` folder of their ontology as ``<CSV name>.values.nt``.
+
+    The ``.values`` suffix keeps the files apart from the N-Triples file of the ontology itself, even if a value CSV
+    file has the name of its ontology.
+
+    The sheets of every prefix are parsed once more, without external ontology information, to look up the URIs of
+    its entities and properties. A value CSV file that names an unknown prefix or cannot be ingested is skipped with
+    a warning.
+
+    Args:
+        folder_path (pathlib.Path): Folder where the FAIRSheetInput CSV files are located.
+        prefixes (list): The sheet prefixes of the folder.
+        value_csvs (list): (prefix, path) pairs of the value CSV files; prefixes are matched without surrounding whitespace.
+        compress (bool): Whether to gzip-compress the N-Triples files (Optional).
+        chunk_rows (int): Number of rows whose triples are written at once (Optional).
+        max_cached_keys (int): Number of written individuals and links remembered to skip duplicates (Optional).
+        term_interner (TermInterner): Run-wide table of terms shared by all prefixes (Optional).
+
+    Returns:
+        list: The file paths of the written N-Triples files.
+    """
+    import graphviz
 
-        # Generate PyLode documentation
-        if args.include_pylode_docs:
-            merged_rdflib_graph_saver.generate_pylode_html()
+    sheet_prefixes = {prefix.strip(): prefix for prefix in prefixes}
+    ingesters = {}
+    file_paths = []
+    for prefix, csv_path in value_csvs:
+        sheet_prefix = sheet_prefixes.get(prefix.strip())
+        if sheet_prefix is None:
+            warnings.warn(f"Skipped the value CSV file {csv_path}: no sheets with the prefix {prefix}")
+            continue
+        try:
+            if sheet_prefix not in ingesters:
+                fair_sheet_parser = FairSheetParser(folder_path, sheet_prefix, False, rdfGraph(), graphviz.Digraph(strict=False), False, term_interner=term_interner)
+                ingesters[sheet_prefix] = (fair_sheet_parser.get_ontology_name(), ValueCsvIngester(fair_sheet_parser, chunk_rows, max_cached_keys))
+            ontology_name, ingester = ingesters[sheet_prefix]
+            file_paths.append(ingester.ingest(csv_path, os.path.join(f"{ontology_name}_output", f"{Path(csv_path).stem}.values.nt"), compress))
+        except (OSError, ValueError) as e:
+            warnings.warn(f"Failed to ingest the value CSV file {csv_path}: {e}")
+    return file_paths
 
 # Execute main function if the script is run directly
 if __name__ == "__main__":
@@ -0,0 +1,167 @@
+from rdflib import Graph as rdfGraph
+from importlib import metadata
+import hashlib
+import json
+import os
+
+class BuildManifest:
+    """
+    A record of the inputs an ontology output folder was built from.
+
+    The manifest stores the SHA-256 hashes of the input sheets, the build options and the FAIRmaterials version, together
+    with the files that were written. When a later build has the same inputs and all of the files still exist, the
+    build can be skipped and the saved TTL file loaded instead of parsing the sheets again.
+
+    Attributes:
+        __sheet_hashes (dict): Dictionary of the sheet file names and the SHA-256 hashes of their content.
+        __options (dict): Dictionary of the build options that affect the outputs.
+        __version (str): Version of the FAIRmaterials package that built the outputs.
+    """
+
+    MANIFEST_FILE = "build_manifest.json"
+
+    def __init__(self, sheet_paths, options, version=None):
+        """
+        Initializes the BuildManifest object by hashing the input sheets.
+
+        Args:
+            sheet_paths (iterable of pathlib.Path): Paths to the input CSV sheets.
+            options (dict): Dictionary of the build options that affect the outputs; the values must be JSON serializable.
+            version (str): Version of the package (Optional, defaults to the installed FAIRmaterials version).
+        """
+        self.__sheet_hashes = {os.path.basename(path): self.hash_file(path) for path in sorted(sheet_paths)}
+        self.__options = dict(sorted(options.items()))
+        self.__version = version if version is not None else self.get_package_version()
+
+    @staticmethod
+    def hash_file(path):
+        """
+        Computes the SHA-256 hash of a file.
+
+        Args:
+            path (pathlib.Path): Path to the file.
+
+        Returns:
+            str: The hexadecimal hash of the file content.
+        """
+        file_hash = hashlib.sha256()
+        with open(path, "rb") as hashed_file:
+            for chunk in iter(lambda: hashed_file.read(1024 * 1024), b""):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    @staticmethod
+    def get_package_version():
+        """
+        Gets the installed version of the FAIRmaterials package
+
+        Returns:
+            str: The version, or "unknown" when the package is run from a source tree without being installed.
+        """
+        try:
+            return metadata.version("FAIRmaterials")
+        except metadata.PackageNotFoundError:
+            return "unknown"
+
+    def get_inputs(self):
+        """
+        Gets the recorded inputs of the build
+
+        Returns:
+            dict: A dictionary with the package version, the build options and the hashes of the sheets.
+        """
+        return {"version": self.__version, "options": self.__options, "sheets": self.__sheet_hashes}
+
+    def is_up_to_date(self, output_folder):
+        """
+        Checks whether an output folder was built from the same inputs and still contains all of its outputs.
+
+        Args:
+            output_folder (str): The output folder of the ontology.
+
+        Returns:
+            bool: True if the outputs can be reused, False if the ontology has to be built.
+        """
+        manifest = self.read(output_folder)
+        if manifest is None or manifest.get("inputs") != self.get_inputs():
+            return False
+        return all(os.path.exists(os.path.join(output_folder, file_name)) for file_name in manifest.get("outputs", []))
+
+    def write(self, output_folder, outputs):
+        """
+        Writes the manifest into an output folder after a successful build.
+
+        Args:
+            output_folder (str): The output folder of the ontology.
+            outputs (dict): Dictionary of the saved outputs and their file paths; it must contain the "ttl" output.
+
+        Returns:
+            str: The file path of the manifest.
+        """
+        manifest = {
+            "inputs": self.get_inputs(),
+            "graph": os.path.basename(outputs["ttl"]),
+            "outputs": sorted(os.path.basename(file_path) for file_path in outputs.values())
+        }
+        if "snapshot" in outputs:
+            manifest["snapshot"] = os.path.basename(outputs["snapshot"])
+        file_path = os.path.join(output_folder, self.MANIFEST_FILE)
+        temp_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        os.replace(temp_path, file_path)
+        return file_path
+
+    @classmethod
+    def remove(cls, output_folder):
+        """
+        Removes the manifest of an output folder, so that its outputs are rebuilt unless a new manifest is written.
+
+        Args:
+            output_folder (str): The output folder of the ontology.
+        """
+        file_path = os.path.join(output_folder, cls.MANIFEST_FILE)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    @classmethod
+    def read(cls, output_folder):
+        """
+        Reads the manifest of an output folder.
+
+        Args:
+            output_folder (str): The output folder of the ontology.
+
+        Returns:
+            dict: The manifest, or None if the folder has no readable manifest.
+        """
+        file_path = os.path.join(output_folder, cls.MANIFEST_FILE)
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, "r") as manifest_file:
+            try:
+                return json.load(manifest_file)
+            except json.JSONDecodeError:
+                return None
+
+    @classmethod
+    def load_graph(cls, output_folder):
+        """
+        Loads the RDFLib graph saved by the build recorded in an output folder.
+
+        Args:
+            output_folder (str): The output folder of the ontology.
+
+        Returns:
+            rdflib.Graph: The graph loaded from the saved snapshot if there is one, otherwise parsed from the saved TTL file.
+        """
+        manifest = cls.read(output_folder)
+        if "snapshot" in manifest:
+            try:
+                from FAIRmaterials.graph_snapshot import GraphSnapshot
+            except ImportError:
+                # Without NumPy the graph is parsed from the TTL file
+                pass
+            else:
+                return GraphSnapshot.load(os.path.join(output_folder, manifest["snapshot"])).to_graph()
+        return rdfGraph().parse(os.path.join(output_folder, manifest["graph"]), format="ttl")
@@ -0,0 +1,252 @@
+from rdflib import Graph as rdfGraph
+from rdflib.namespace import RDFS, SKOS, DCTERMS
+import urllib.request
+import urllib.error
+import socket
+import hashlib
+import tempfile
+import threading
+import json
+import time
+import os
+
+class ExternalOntologyCache:
+    """
+    A persistent on-disk cache for the external ontologies listed in the Ontology Info column of the NameSpace sheet.
+
+    Every cached ontology is keyed by its URL and stored together with the ETag sent by the server and a hash of the
+    downloaded content. Instead of the original Turtle file, only the triples that FAIRmaterials imports from external
+    ontologies are kept, stored as N-Triples, so that later runs load them without parsing the full ontology again.
+
+    Attributes:
+        __cache_dir (str): Folder containing the cached ontologies and the cache index.
+        __max_size (int): Maximum total size of the cached ontologies in bytes; least recently used entries are evicted first.
+        __offline (bool): Flag that determines whether ontologies are only loaded from the cache, without any network access.
+        __index_path (str): Path to the JSON index of the cache.
+        __lock (threading.Lock): Lock held while the index is read, changed and written, so that threads loading ontologies in parallel do not lose each other's entries.
+    """
+
+    DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "FAIRmaterials", "external_ontologies")
+    DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+    CACHED_PREDICATES = (SKOS.definition, DCTERMS.description, SKOS.altLabel, RDFS.label)
+
+    def __init__(self, cache_dir=None, max_size=DEFAULT_MAX_SIZE, offline=False):
+        """
+        Initializes the ExternalOntologyCache object and creates the cache folder if it doesn't exist.
+
+        Args:
+            cache_dir (str): Folder used for the cache (Optional, defaults to ~/.cache/FAIRmaterials/external_ontologies).
+            max_size (int): Maximum total size of the cached ontologies in bytes.
+            offline (bool): Flag to only load ontologies from the cache.
+        """
+        self.__cache_dir = str(cache_dir) if cache_dir is not None else self.DEFAULT_CACHE_DIR
+        self.__max_size = max_size
+        self.__offline = offline
+        self.__index_path = os.path.join(self.__cache_dir, "index.json")
+        self.__lock = threading.Lock()
+
+        if not os.path.exists(self.__cache_dir):
+            os.makedirs(self.__cache_dir)
+
+    def load(self, source, timeout=None, retries=0):
+        """
+        Loads an external ontology, from the cache if it is up to date and from its source otherwise.
+
+        Args:
+            source (str): URL or file path of the ontology Turtle file.
+            timeout (float): Timeout of each request in seconds (Optional).
+            retries (int): Number of times a failed request is retried (Optional).
+
+        Returns:
+            rdflib.Graph: A graph containing the cached triples of the ontology.
+
+        Raises:
+            LookupError: If the cache is offline and does not contain the ontology.
+        """
+        with self.__lock:
+            entry = self.__read_index().get(source)
+        if entry is not None and not os.path.exists(os.path.join(self.__cache_dir, entry["file"])):
+            entry = None
+
+        if self.__offline:
+            if entry is None:
+                raise LookupError(f"Ontology {source} is not in the cache and the cache is offline")
+            return self.__load_entry(source, entry)
+
+        content, etag = self.fetch(source, entry["etag"] if entry is not None else None, timeout, retries)
+        if content is None:
+            # The server confirmed that the cached copy is still current
+            return self.__load_entry(source, entry)
+
+        content_hash = hashlib.sha256(content).hexdigest()
+        if entry is not None and entry["content_hash"] == content_hash:
+            entry["etag"] = etag
+            return self.__load_entry(source, entry)
+
+        graph = rdfGraph().parse(data=content, format='ttl', publicID=source)
+        return self.__store(source, graph, etag, content_hash)
+
+    def clear(self):
+        """
+        Removes all cached ontologies.
+        """
+        with self.__lock:
+            for source, entry in self.__read_index().items():
+                file_path = os.path.join(self.__cache_dir, entry["file"])
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+            self.__write_index({})
+
+    def get_cached_sources(self):
+        """
+        Gets the sources of all cached ontologies
+
+        Returns:
+            list: The URLs or file paths of all cached ontologies, from least to most recently used.
+        """
+        with self.__lock:
+            index = self.__read_index()
+        return sorted(index, key=lambda source: index[source]["last_used"])
+
+    @staticmethod
+    def compact(graph):
+        """
+        Reduces an external ontology to the triples that FAIRmaterials imports from it.
+
+        Args:
+            graph (rdflib.Graph): The full external ontology.
+
+        Returns:
+            rdflib.Graph: A new graph containing only the triples whose predicate is in CACHED_PREDICATES.
+        """
+        compact_graph = rdfGraph()
+        for predicate in ExternalOntologyCache.CACHED_PREDICATES:
+            compact_graph.addN((s, p, o, compact_graph) for s, p, o in graph.triples((None, predicate, None)))
+        return compact_graph
+
+    @staticmethod
+    def fetch(source, etag=None, timeout=None, retries=0):
+        """
+        Fetches the raw content of an ontology file.
+
+        Connection errors, timeouts and server errors (5xx) are retried with an exponential backoff, client errors are raised immediately.
+
+        Args:
+            source (str): URL or file path of the ontology Turtle file.
+            etag (str): ETag of the cached copy, sent as a conditional request header (Optional).
+            timeout (float): Timeout of each request in seconds (Optional).
+            retries (int): Number of times a failed request is retried (Optional).
+
+        Returns:
+            tuple: A tuple containing:
+                - bytes: The content of the file, or None if the server reported the cached copy as unchanged.
+                - str: The ETag of the content, or None if the source did not provide one.
+        """
+        if not source.startswith(("http://", "https://")):
+            with open(source, "rb") as ontology_file:
+                return ontology_file.read(), None
+
+        headers = {"Accept": "text/turtle, */*;q=0.5"}
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        request = urllib.request.Request(source, headers=headers)
+        for attempt in range(retries + 1):
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    return response.read(), response.headers.get("ETag")
+            except urllib.error.HTTPError as e:
+                if e.code == 304:
+                    return None, etag
+                if e.code < 500 or attempt == retries:
+                    raise
+            except (urllib.error.URLError, socket.timeout):
+                if attempt == retries:
+                    raise
+            time.sleep(min(0.5 * 2 ** attempt, 8))
+
+    def __store(self, source, graph, etag, content_hash):
+        """
+        Stores the compact form of an ontology in the cache and evicts old entries if the cache is too large.
+        """
+        compact_graph = self.compact(graph)
+
+        file_name = hashlib.sha256(source.encode("utf-8")).hexdigest() + ".nt"
+        file_path = os.path.join(self.__cache_dir, file_name)
+        temp_file, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.__cache_dir)
+        os.close(temp_file)
+        compact_graph.serialize(destination=temp_path, format="nt", encoding="utf-8")
+        os.replace(temp_path, file_path)
+
+        with self.__lock:
+            index = self.__read_index()
+            index[source] = {
+                "file": file_name,
+                "etag": etag,
+                "content_hash": content_hash,
+                "size": os.path.getsize(file_path),
+                "last_used": time.time()
+            }
+            self.__evict(index, keep=source)
+            self.__write_index(index)
+        return compact_graph
+
+    def __load_entry(self, source, entry):
+        """
+        Loads the compact form of a cached ontology and marks it as recently used.
+        """
+        graph = rdfGraph().parse(os.path.join(self.__cache_dir, entry["file"]), format="nt")
+
+        with self.__lock:
+            index = self.__read_index()
+            entry["last_used"] = time.time()
+            index[source] = entry
+            self.__write_index(index)
+        return graph
+
+    def __evict(self, index, keep):
+        """
+        Removes the least recently used entries from the index until the cache fits into its maximum size.
+        """
+        total_size = sum(entry["size"] for entry in index.values())
+        for source in sorted(index, key=lambda source: index[source]["last_used"]):
+            if total_size <= self.__max_size:
+                break
+            if source == keep:
+                continue
+            entry = index.pop(source)
+            total_size -= entry["size"]
+            file_path = os.path.join(self.__cache_dir, entry["file"])
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def __read_index(self):
+        """
+        Reads the cache index, mapping every cached source to its file, ETag, content hash, size and last use.
+        """
+        if not os.path.exists(self.__index_path):
+            return {}
+        with open(self.__index_path, "r") as index_file:
+            try:
+                return json.load(index_file)
+            except json.JSONDecodeError:
+                return {}
+
+    def __write_index(self, index):
+        """
+        Writes the cache index.
+        """
+        # Write to a unique temporary file first so that concurrent builds never read a partially written index
+        temp_file, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.__cache_dir)
+        with os.fdopen(temp_file, "w") as index_file:
+            json.dump(index, index_file, indent=2)
+        os.replace(temp_path, self.__index_path)
+
+    def __getstate__(self):
+        # The lock cannot be pickled, e.g. when the cache is sent to worker processes with the registry
+        state = self.__dict__.copy()
+        del state["_ExternalOntologyCache__lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
@@ -0,0 +1,200 @@
+from rdflib import Graph as rdfGraph
+from concurrent.futures import Future, ThreadPoolExecutor, InvalidStateError, wait
+from urllib.parse import urlparse
+from FAIRmaterials.external_ontology_cache import ExternalOntologyCache
+import threading
+
+class ExternalOntologyRegistry:
+    """
+    A run-scoped registry of the external ontologies used to add external ontology information to the FAIR sheets.
+
+    One registry is shared by all FairSheetParser instances of a run, so every external ontology is loaded at most once
+    no matter how many sheet prefixes reference it. Concurrent requests for an ontology that is still loading wait for
+    the running load instead of starting a second one.
+
+    Every request has a timeout, which can be set per host, and failed requests are retried. prefetch() fetches and
+    parses many ontologies concurrently on a bounded thread pool within a total deadline.
+
+    Attributes:
+        __external_ontology_cache (ExternalOntologyCache): Cache used to load external ontologies, or None to always parse them from their source.
+        __timeout (float): Default timeout of each request in seconds.
+        __host_timeouts (dict): Dictionary of host names and the request timeout in seconds used for that host.
+        __retries (int): Number of times a failed request is retried.
+        __max_workers (int): Maximum number of ontologies loaded concurrently by prefetch().
+        __loads (dict): Dictionary of ontology sources and the futures of their loads.
+        __lock (threading.Lock): Lock guarding the dictionary of loads.
+    """
+
+    DEFAULT_TIMEOUT = 30
+    DEFAULT_RETRIES = 2
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, external_ontology_cache=None, timeout=DEFAULT_TIMEOUT, host_timeouts=None, retries=DEFAULT_RETRIES, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Initializes the ExternalOntologyRegistry object.
+
+        Args:
+            external_ontology_cache (ExternalOntologyCache): Cache used to load external ontologies (Optional).
+            timeout (float): Default timeout of each request in seconds.
+            host_timeouts (dict): Dictionary of host names and the request timeout in seconds used for that host (Optional).
+            retries (int): Number of times a failed request is retried.
+            max_workers (int): Maximum number of ontologies loaded concurrently by prefetch().
+        """
+        self.__external_ontology_cache = external_ontology_cache
+        self.__timeout = timeout
+        self.__host_timeouts = dict(host_timeouts or {})
+        self.__retries = retries
+        self.__max_workers = max_workers
+        self.__loads = {}
+        self.__lock = threading.Lock()
+
+    def get(self, source):
+        """
+        Gets an external ontology, loading it if no other caller has requested it yet.
+
+        Args:
+            source (str): URL or file path of the ontology Turtle file.
+
+        Returns:
+            rdflib.Graph: A graph containing the triples FAIRmaterials imports from the ontology.
+
+        Raises:
+            Exception: The error raised while loading the ontology. Failed loads are not retried within a run.
+        """
+        future, is_owner = self.__claim(source)
+        if is_owner:
+            self.__run_load(source, future)
+        return future.result()
+
+    def load(self, source):
+        """
+        Loads an external ontology without consulting the registry.
+
+        Args:
+            source (str): URL or file path of the ontology Turtle file.
+
+        Returns:
+            rdflib.Graph: A graph containing the triples FAIRmaterials imports from the ontology.
+        """
+        timeout = self.get_timeout(source)
+        if self.__external_ontology_cache is not None:
+            return self.__external_ontology_cache.load(source, timeout, self.__retries)
+        content, _ = ExternalOntologyCache.fetch(source, timeout=timeout, retries=self.__retries)
+        return ExternalOntologyCache.compact(rdfGraph().parse(data=content, format='ttl', publicID=source))
+
+    def get_timeout(self, source):
+        """
+        Gets the request timeout used for an ontology source
+
+        Args:
+            source (str): URL or file path of the ontology Turtle file.
+
+        Returns:
+            float: The timeout of the source's host, or the default timeout.
+        """
+        return self.__host_timeouts.get(urlparse(source).hostname, self.__timeout)
+
+    def prefetch(self, sources, deadline=None):
+        """
+        Fetches and parses several external ontologies concurrently ahead of time.
+
+        Errors are kept and raised again by get(). Ontologies that are still loading when the deadline passes are
+        marked as failed with a TimeoutError, so that the build does not wait for them.
+
+        Args:
+            sources (iterable of str): URLs or file paths of the ontology Turtle files.
+            deadline (float): Total time in seconds to wait for all ontologies (Optional).
+
+        Returns:
+            dict: A dictionary of the sources, in the given order, and whether each of them was loaded successfully.
+        """
+        claims = {source: self.__claim(source) for source in sources}
+        executor = ThreadPoolExecutor(max_workers=self.__max_workers, thread_name_prefix="external-ontology")
+        try:
+            for source, (future, is_owner) in claims.items():
+                if is_owner:
+                    executor.submit(self.__run_load, source, future)
+            wait([future for future, _ in claims.values()], timeout=deadline)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # The results are reported in the order of the sources, independent of the order in which the loads finished
+        results = {}
+        for source, (future, _) in claims.items():
+            if not future.done():
+                self.__resolve(future, exception=TimeoutError(f"Loading ontology {source} did not finish within {deadline} seconds"))
+            results[source] = future.exception() is None
+        return results
+
+    def __claim(self, source):
+        """
+        Gets the future of the load of an ontology, creating it if the ontology was not requested before.
+
+        Returns:
+            tuple: A tuple containing the future and whether the caller is responsible for running the load.
+        """
+        with self.__lock:
+            future = self.__loads.get(source)
+            if future is not None:
+                return future, False
+            future = Future()
+            self.__loads[source] = future
+            return future, True
+
+    def __run_load(self, source, future):
+        """
+        Loads an ontology and stores the graph or the error in its future.
+        """
+        try:
+            result = self.load(source)
+        except Exception as e:
+            self.__resolve(future, exception=e)
+        else:
+            self.__resolve(future, result=result)
+
+    @staticmethod
+    def __resolve(future, result=None, exception=None):
+        """
+        Sets the outcome of a load unless the load was already given up on.
+        """
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass
+
+    def get_loaded_sources(self):
+        """
+        Gets the sources of all external ontologies that were successfully loaded
+
+        Returns:
+            list: The sorted URLs or file paths of the loaded ontologies.
+        """
+        with self.__lock:
+            return sorted(source for source, future in self.__loads.items() if future.done() and future.exception() is None)
+
+    def __getstate__(self):
+        # Only finished loads are sent to worker processes, the lock and pending futures cannot be pickled
+        with self.__lock:
+            finished = {source: future for source, future in self.__loads.items() if future.done()}
+        results = {source: future.result() for source, future in finished.items() if future.exception() is None}
+        errors = {source: str(future.exception()) for source, future in finished.items() if future.exception() is not None}
+        settings = {
+            "external_ontology_cache": self.__external_ontology_cache,
+            "timeout": self.__timeout,
+            "host_timeouts": self.__host_timeouts,
+            "retries": self.__retries,
+            "max_workers": self.__max_workers
+        }
+        return {"settings": settings, "results": results, "errors": errors}
+
+    def __setstate__(self, state):
+        self.__init__(**state["settings"])
+        for source, graph in state["results"].items():
+            self.__loads[source] = Future()
+            self.__loads[source].set_result(graph)
+        for source, error in state["errors"].items():
+            self.__loads[source] = Future()
+            self.__loads[source].set_exception(RuntimeError(error))
@@ -0,0 +1,215 @@
+from pathlib import Path
+import csv
+import os
+import random
+
+class FairSheetGenerator:
+    """
+    A class to write synthetic but valid sets of FAIR sheets, used to test and benchmark the package at production scale.
+
+    Every prefix gets its own ontology with the same shape: entities arranged in subclass chains of the given depth,
+    relationships and value types between random entities, and some entities and properties belonging to external
+    namespaces that are shared by all prefixes. All random choices come from a seeded generator, so the same arguments
+    always write the same sheets.
+
+    Attributes:
+        __entities (int): Number of entities of every ontology.
+        __depth (int): Length of the subclass chains the entities are arranged in, 1 for no subclasses.
+        __relationships (int): Number of relationships of every ontology.
+        __value_types (int): Number of value types of every ontology.
+        __external_namespaces (int): Number of external namespaces shared by all ontologies.
+        __prefixes (int): Number of ontologies, each written as its own set of five sheets.
+        __external_ontology_files (bool): Flag that determines whether or not to write a Turtle file for every external namespace.
+        __seed (int): Seed of the random choices.
+    """
+
+    BASE_URI = "http://example.com/synthetic"
+    UNIT_NAMESPACE = "http://qudt.org/vocab/unit/"
+    DATATYPES = ("xsd:integer", "xsd:string", "xsd:date", "xsd:dateTime", "xsd:float", "xsd:boolean")
+    # Every tenth term belongs to an external namespace, every fifth entity has a unit
+    EXTERNAL_TERM_INTERVAL = 10
+    UNIT_INTERVAL = 5
+
+    def __init__(self, entities=100, depth=3, relationships=100, value_types=100, external_namespaces=2, prefixes=1, external_ontology_files=False, seed=0):
+        """
+        Initializes the FairSheetGenerator object.
+
+        Args:
+            entities (int): Number of entities of every ontology.
+            depth (int): Length of the subclass chains the entities are arranged in, 1 for no subclasses.
+            relationships (int): Number of relationships of every ontology.
+            value_types (int): Number of value types of every ontology.
+            external_namespaces (int): Number of external namespaces shared by all ontologies.
+            prefixes (int): Number of ontologies, each written as its own set of five sheets.
+            external_ontology_files (bool): Whether to write a Turtle file with definitions for every external namespace and reference it in the NameSpace sheets.
+            seed (int): Seed of the random choices.
+
+        Raises:
+            ValueError: If there are no entities, the depth is smaller than 1 or a count is negative.
+        """
+        if entities < 1 or depth < 1:
+            raise ValueError("At least one entity and a depth of at least 1 are needed")
+        if min(relationships, value_types, external_namespaces, prefixes) < 0:
+            raise ValueError("The numbers of relationships, value types, external namespaces and prefixes cannot be negative")
+        self.__entities = entities
+        self.__depth = depth
+        self.__relationships = relationships
+        self.__value_types = value_types
+        self.__external_namespaces = external_namespaces
+        self.__prefixes = prefixes
+        self.__external_ontology_files = external_ontology_files
+        self.__seed = seed
+
+    def get_prefix(self, index):
+        """
+        Gets the sheet prefix of an ontology.
+
+        Args:
+            index (int): Index of the ontology.
+
+        Returns:
+            str: The prefix of the five sheets of the ontology.
+        """
+        return f"Synthetic{index}"
+
+    def get_external_namespace(self, index):
+        """
+        Gets the prefix and URL of an external namespace.
+
+        Args:
+            index (int): Index of the external namespace.
+
+        Returns:
+            tuple: The prefix and the URL of the namespace.
+        """
+        return f"Ext{index}", f"{self.BASE_URI}/external{index}/"
+
+    def generate(self, folder_path: Path):
+        """
+        Writes the sheets of all ontologies, and the external ontology files if enabled, into a folder.
+
+        Args:
+            folder_path (pathlib.Path): The folder the sheets are written to. It is created if it does not exist.
+
+        Returns:
+            list: The prefixes of the written ontologies.
+        """
+        folder_path = Path(folder_path)
+        os.makedirs(folder_path, exist_ok=True)
+
+        external_ontology_paths = {}
+        if self.__external_ontology_files and self.__external_namespaces > 0:
+            # The files are kept in a subfolder, since every file of the sheet folder is read as a sheet
+            external_folder = folder_path / "external"
+            os.makedirs(external_folder, exist_ok=True)
+            for index in range(self.__external_namespaces):
+                prefix, url = self.get_external_namespace(index)
+                external_ontology_paths[prefix] = external_folder / f"{prefix.lower()}.ttl"
+                self.__write_external_ontology(external_ontology_paths[prefix], url, index)
+
+        prefixes = []
+        for index in range(self.__prefixes):
+            prefix = self.get_prefix(index)
+            self.__write_ontology(folder_path, prefix, index, external_ontology_paths)
+            prefixes.append(prefix)
+        return prefixes
+
+    def __get_entity(self, index):
+        """
+        Gets the name and ontology of an entity.
+        """
+        if self.__external_namespaces > 0 and index % self.EXTERNAL_TERM_INTERVAL == self.EXTERNAL_TERM_INTERVAL - 1:
+            return f"Entity{index}", self.get_external_namespace(index % self.__external_namespaces)[0]
+        return f"Entity{index}", ""
+
+    def __get_full_name(self, name, ontology):
+        """
+        Gets the full name an entity is referenced by in the sheets.
+        """
+        return f"{ontology}:{name}" if ontology else name
+
+    def __write_ontology(self, folder_path, prefix, ontology_index, external_ontology_paths):
+        """
+        Writes the five sheets of one ontology.
+        """
+        ontology_name = prefix
+        base_uri = f"{self.BASE_URI}/{ontology_name.lower()}#"
+        # Every ontology gets its own random sequence, so adding prefixes does not change the existing ones
+        randomizer = random.Random(f"{self.__seed}-{ontology_index}")
+
+        with open(folder_path / f"{prefix}- OntologyInfo.csv", "w", newline="") as file:
+            csv.writer(file).writerows([
+                ["Ontology Name", ontology_name],
+                ["Ontology URI", base_uri],
+                ["Ontology Version", "1.0"],
+                ["Ontology Author(s)", "Synthetic Author, Second Author"],
+                ["Ontology Description", f"Synthetic ontology {ontology_index}"]
+            ])
+
+        with open(folder_path / f"{prefix}- NameSpace.csv", "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["Prefix Name", "Ontology URL", "Ontology Info"])
+            writer.writerow(["The prefix of the namespace", "The URL of the namespace", "The Turtle file of the ontology"])
+            writer.writerow([ontology_name, base_uri, ""])
+            writer.writerow(["unit", self.UNIT_NAMESPACE, ""])
+            for index in range(self.__external_namespaces):
+                external_prefix, url = self.get_external_namespace(index)
+                ontology_path = external_ontology_paths.get(external_prefix)
+                writer.writerow([external_prefix, url, str(ontology_path) if ontology_path is not None else ""])
+
+        entities = [self.__get_entity(index) for index in range(self.__entities)]
+        full_names = [self.__get_full_name(name, ontology) for name, ontology in entities]
+
+        with open(folder_path / f"{prefix}- VariableDefinitions.csv", "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["Variable Name", "Belongs to Ontology", "Parent Variable", "Definition of Variable", "Alternative Name(s)", "Unit", "Logical Axioms", "fullName"])
+            writer.writerow(["The name of the variable", "", "", "", "", "", "", ""])
+            for index, (name, ontology) in enumerate(entities):
+                # Entities form chains of the given depth, each entity is a subclass of the one before it in its chain
+                parent = full_names[index - 1] if index % self.__depth != 0 else ""
+                alt_names = f"{name}Alias, {name}Synonym" if index % 2 == 0 else ""
+                unit = "unit:M" if index % self.UNIT_INTERVAL == 0 else ""
+                writer.writerow([name, ontology, parent, f"Definition of {name}", alt_names, unit, "", full_names[index]])
+
+        with open(folder_path / f"{prefix}- RelationshipDefinitions.csv", "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["Relationship Name", "Belongs to Ontology", "Domain", "Range", "Definition", "Logical Axioms", "Alternative Name(s)", "fullName"])
+            writer.writerow(["The name of the relationship", "", "", "", "", "", "", ""])
+            for index in range(self.__relationships):
+                name, ontology = self.__get_property(f"relation{index}", index)
+                domain = randomizer.choice(full_names)
+                range_ = randomizer.choice(full_names)
+                writer.writerow([name, ontology, domain, range_, f"Definition of {name}", "", f"{name}Alias" if index % 2 == 0 else "", self.__get_full_name(name, ontology)])
+
+        with open(folder_path / f"{prefix}- ValueTypeDefinitions.csv", "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["ValueType Name", "Belongs to Ontology", "Domain", "Range", "Definition of Property", "Logical Axioms", "Alternative Name(s)", "fullName"])
+            writer.writerow(["The name of the value type", "", "", "", "", "", "", ""])
+            for index in range(self.__value_types):
+                name, ontology = self.__get_property(f"value{index}", index)
+                domain = randomizer.choice(full_names)
+                range_ = randomizer.choice(self.DATATYPES)
+                writer.writerow([name, ontology, domain, range_, f"Definition of {name}", "", f"{name}Alias" if index % 2 == 0 else "", f"{self.__get_full_name(name, ontology)}({domain}->{range_})"])
+
+    def __get_property(self, name, index):
+        """
+        Gets the name and ontology of a relationship or value type.
+        """
+        if self.__external_namespaces > 0 and index % self.EXTERNAL_TERM_INTERVAL == self.EXTERNAL_TERM_INTERVAL - 1:
+            return name, self.get_external_namespace(index % self.__external_namespaces)[0]
+        return name, ""
+
+    def __write_external_ontology(self, path, url, namespace_index):
+        """
+        Writes a Turtle file with a definition and an alternative label for every term of an external namespace.
+        """
+        external_prefix = self.get_external_namespace(namespace_index)[0]
+        terms = [self.__get_entity(index) for index in range(self.__entities)]
+        terms += [self.__get_property(f"relation{index}", index) for index in range(self.__relationships)]
+        terms += [self.__get_property(f"value{index}", index) for index in range(self.__value_types)]
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("@prefix skos: <http://www.w3.org/2004/02/skos/core#> .\n\n")
+            for term, ontology in terms:
+                if ontology != external_prefix:
+                    continue
+                file.write(f'<{url}{term}> skos:definition "External definition of {term}" ;\n    skos:altLabel "External {term}" .\n')
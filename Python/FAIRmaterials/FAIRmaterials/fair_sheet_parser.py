@@ -1,12 +1,16 @@
 from rdflib import Graph as rdfGraph, Namespace, Literal, URIRef, OWL, XSD 
 from rdflib.namespace import RDF, RDFS, SKOS, DCTERMS
-import csv
 from collections import defaultdict
-import re
 from pathlib import Path
 import zipfile
 import os
 import warnings
+from FAIRmaterials.external_ontology_registry import ExternalOntologyRegistry
+from FAIRmaterials.garbage_collection import paused_garbage_collection
+from FAIRmaterials.term_interner import TermInterner
+from FAIRmaterials.graphviz_node_ids import GraphvizNodeIds
+from FAIRmaterials.fair_sheet_records import read_ontology_info, read_namespaces, read_entities, read_relationships, read_value_types
+from FAIRmaterials.profiler import profile_stage
 
 class FairSheetParser:
     """
@@ -18,6 +22,11 @@ class FairSheetParser:
         __data_property_path (pathlib.Path): Path to the data property CSV file that the user fills out.
         __namespace_path (pathlib.Path): Path to the namespace CSV file that the user fills out.
         __entity_path (pathlib.Path): Path to the entity CSV file that the user fills out.
+        __ontology_info_record (OntologyInfoRecord): Metadata of the ontology read from the ontology information CSV file.
+        __namespace_records (list): NamespaceRecord for every row of the namespace CSV file.
+        __entity_records (list): EntityRecord for every row of the entity CSV file.
+        __relationship_records (list): RelationshipRecord for every row of the object property CSV file.
+        __value_type_records (list): ValueTypeRecord for every row of the data property CSV file.
         __datatype_conversions (dict): Dictionary for datatype conversions of strings to XSD objects.
         __rdflib_graph (rdflib.Graph): an RDFLib graph that will contain all information about the ontology.
         __graphviz_graph (graphviz.Digraph): an Graphviz graph that will used to visualize all information about the ontology.
@@ -25,15 +34,29 @@ class FairSheetParser:
         __ontology_name (str): Name of the ontology.
         __ontology_version (str): Version of the ontology.
         __include_graph_valuetype (bool): Flag that determines whether or not to include valuetype and unit edges in Graphviz graph.
+        __graphviz_node_ids (GraphvizNodeIds): Memoized mapping of URIs to Graphviz node IDs, shared by all parse methods.
+        __graphviz_start (int): Number of lines the Graphviz graph body had before the sheets were parsed.
+        __graphviz_lines (dict): Dictionary of sheets and the Graphviz graph body lines they produced.
+        __triple_buffer (dict): Triples of the sheet being parsed that are not yet in the RDFLib graph, in insertion order and without duplicates.
+        __sheet_triples (dict): Dictionary of sheets and the triples they added to the RDFLib graph, so that a sheet can be retracted on its own.
+        __add_external_onto_info (bool): Flag that determines whether or not to import information about external ontology terms.
         __individual_relationship (dict): Dictionary to store existing relationships between individuals of entities.
+        __property_links (dict): Dictionary of sheets and, for each, a dictionary of (domain, range) pairs and the URIs of the properties linking them.
         __namespace_uris (dict): Dictionary of namespace prefixes and their corresponding base URIs.
         __ontology_info (dict): Dictionary to store ontology OWL URIs and the ontology's correspnding Base URI.
         __entity_uris (dict): Dictionary of entity URIs.
         __obj_property_uris (dict): Dictionary of object property URIs.
         __data_property_uris (dict): Dictionary of data property URIs.
+        __referenced_terms (dict): Dictionary of sheets and, for each, a dictionary of namespace URIs and the set of term URIs defined under each namespace.
+        __external_ontology_registry (ExternalOntologyRegistry): Registry the external ontologies are loaded from, shared by all parsers of a run.
+        __term_interner (TermInterner): Table every term of the RDFLib graph is interned in, shared by all parsers of a run.
     """
 
-    def __init__(self, folder_path: Path, prefix: str, include_graph_valuetype, rdflib_graph, graphviz_graph, add_external_onto_info):
+    # Sheets in the order they are parsed, each one may use the results of the sheets before it.
+    # "external" stands for the information imported from external ontologies.
+    SHEETS = ("ontology_info", "namespace", "entity", "relationship", "value_type", "external")
+
+    def __init__(self, folder_path: Path, prefix: str, include_graph_valuetype, rdflib_graph, graphviz_graph, add_external_onto_info, external_ontology_cache=None, external_ontology_registry=None, term_interner=None):
         """
         Initializes the FairSheetParser object with the provided ontology sheet folder and populates the RDFLib graph and Graphviz PNG using the information provided in these sheets.
 
@@ -43,19 +66,19 @@ class FairSheetParser:
             include_graph_valuetype (bool): Flag to include valuetype and unit edges in the Graphviz png.
             rdflib_graph (rdflib.Graph): An empty rdflib graph
             graphviz_graph (graphviz.Digraph): An empty graphviz graph
+            add_external_onto_info (bool): Flag to import description and label info from external ontology terms.
+            external_ontology_cache (ExternalOntologyCache): Cache used to load external ontologies (Optional).
+            external_ontology_registry (ExternalOntologyRegistry): Run-scoped registry shared with other parsers; when given, external ontologies are loaded through it instead of through external_ontology_cache (Optional).
+            term_interner (TermInterner): Run-scoped table of terms shared with other parsers and the merge step, so that equal terms are one object (Optional, defaults to a table of this parser).
         """
 
         ## create real pathes to find csv files
-        ontology_info_path = folder_path / f"{prefix}- OntologyInfo.csv"
-        obj_property_path = folder_path / f"{prefix}- RelationshipDefinitions.csv"
-        data_property_path = folder_path / f"{prefix}- ValueTypeDefinitions.csv"
-        namespace_path = folder_path / f"{prefix}- NameSpace.csv"
-        entity_path = folder_path / f"{prefix}- VariableDefinitions.csv"
-        self.__ontology_info_path = ontology_info_path
-        self.__obj_property_path = obj_property_path
-        self.__data_property_path = data_property_path
-        self.__namespace_path = namespace_path
-        self.__entity_path = entity_path
+        sheet_paths = self.get_sheet_paths(folder_path, prefix)
+        self.__ontology_info_path = sheet_paths["ontology_info"]
+        self.__obj_property_path = sheet_paths["relationship"]
+        self.__data_property_path = sheet_paths["value_type"]
+        self.__namespace_path = sheet_paths["namespace"]
+        self.__entity_path = sheet_paths["entity"]
         self.__datatype_conversions = {
             "xsd:integer": XSD.integer,
             "xsd:string": XSD.string,
@@ -67,43 +90,220 @@ class FairSheetParser:
 
         self.__rdflib_graph = rdflib_graph
         self.__graphviz_graph = graphviz_graph
+        self.__graphviz_node_ids = GraphvizNodeIds()
+        self.__graphviz_start = len(graphviz_graph.body)
+        self.__graphviz_lines = {}
+        self.__triple_buffer = {}
+        self.__sheet_triples = {}
+        if external_ontology_registry is None:
+            external_ontology_registry = ExternalOntologyRegistry(external_ontology_cache)
+        self.__external_ontology_registry = external_ontology_registry
+        self.__term_interner = term_interner if term_interner is not None else TermInterner()
 
-        with open(self.__ontology_info_path, 'r') as onto_info_file:
-            csv_reader = csv.reader(onto_info_file)
-            ontology_metadata = list(csv_reader)
+        self.__include_graph_valuetype = include_graph_valuetype
+        self.__add_external_onto_info = add_external_onto_info
+        self.__individual_relationship = {}
+        self.__property_links = {}
+        self.__referenced_terms = {}
 
-            self.__ontology_base_uri = Namespace(ontology_metadata[1][1])
-            self.__rdflib_graph.add((self.__ontology_base_uri.Ontology, RDF.type, OWL.Ontology))
+        # Read every sheet once into typed records, all outputs are built from these records
+        self.__read_sheets(self.SHEETS)
+        self.__build(self.SHEETS)
 
-            self.__ontology_name = ontology_metadata[0][1]
-            self.__rdflib_graph.add((self.__ontology_base_uri.Ontology, RDFS.label, Literal(self.__ontology_name)))
-            self.__rdflib_graph.add((self.__ontology_base_uri.Ontology, DCTERMS.title, Literal(self.__ontology_name)))
+    @staticmethod
+    def get_sheet_paths(folder_path: Path, prefix: str):
+        """
+        Gets the paths of the five CSV sheets of an ontology.
 
-            self.__ontology_version = ontology_metadata[2][1]
-            self.__rdflib_graph.add((self.__ontology_base_uri.Ontology, OWL.versionInfo, Literal(self.__ontology_version)))
+        Args:
+            folder_path (pathlib.Path): The folder containing ontology CSV files.
+            prefix (str): The prefix for a set of ontology CSV files.
 
-            authorsList = [author.strip() for author in ontology_metadata[3][1].split(",")]
-            if authorsList[0] != "":
-                for author in authorsList:
-                    self.__rdflib_graph.add((self.__ontology_base_uri.Ontology, DCTERMS.creator, Literal(author)))
+        Returns:
+            dict: A dictionary of the sheets ("ontology_info", "namespace", "entity", "relationship", "value_type") and their paths.
+        """
+        return {
+            "ontology_info": folder_path / f"{prefix}- OntologyInfo.csv",
+            "namespace": folder_path / f"{prefix}- NameSpace.csv",
+            "entity": folder_path / f"{prefix}- VariableDefinitions.csv",
+            "relationship": folder_path / f"{prefix}- RelationshipDefinitions.csv",
+            "value_type": folder_path / f"{prefix}- ValueTypeDefinitions.csv"
+        }
 
-            self.__rdflib_graph.add((self.__ontology_base_uri.Ontology, DCTERMS.description, Literal(ontology_metadata[4][1])))
+    @staticmethod
+    def get_external_ontology_sources(folder_path: Path, prefix: str):
+        """
+        Reads the external ontology files listed in the Ontology Info column of a NameSpace sheet, without parsing any other sheet.
 
-        self.__include_graph_valuetype = include_graph_valuetype
-        self.__individual_relationship = {}
+        Args:
+            folder_path (pathlib.Path): The folder containing ontology CSV files.
+            prefix (str): The prefix for a set of ontology CSV files.
+
+        Returns:
+            list: The URLs or file paths of the external ontology files.
+        """
+        namespace_path = FairSheetParser.get_sheet_paths(folder_path, prefix)["namespace"]
+        return [record.ontology_info for record in read_namespaces(namespace_path) if record.ontology_info]
+
+    def rebuild(self, changed_sheets):
+        """
+        Updates the RDFLib and Graphviz graphs after some of the sheets were edited.
+
+        Only the changed sheets and the sheets that depend on them are read and parsed again. The triples and Graphviz
+        lines of these sheets are retracted first, all other triples and lines are kept. A change of the ontology
+        information sheet rebuilds every sheet, a change of the namespace or entity sheet rebuilds the entities and
+        the properties using them, and a change of the relationship or value type sheet only rebuilds that sheet.
+        When the entities are rebuilt, every Graphviz line is drawn again and the Graphviz node IDs are reassigned.
+
+        Args:
+            changed_sheets (iterable of str): The changed sheets, as keys of get_sheet_paths().
+
+        Returns:
+            set: The sheets that were parsed again, including "external" if external ontology information was imported again.
+
+        Raises:
+            ValueError: If a changed sheet is not one of the sheets of get_sheet_paths().
+        """
+        changed_sheets = set(changed_sheets)
+        unknown_sheets = changed_sheets.difference(self.SHEETS[:-1])
+        if unknown_sheets:
+            raise ValueError(f"Unknown sheets: {', '.join(sorted(unknown_sheets))}")
+
+        if "ontology_info" in changed_sheets:
+            rebuilt_sheets = set(self.SHEETS[:-1])
+        elif "namespace" in changed_sheets:
+            rebuilt_sheets = {"namespace", "entity", "relationship", "value_type"}
+        elif "entity" in changed_sheets:
+            rebuilt_sheets = {"entity", "relationship", "value_type"}
+        else:
+            rebuilt_sheets = set(changed_sheets)
+        if self.__add_external_onto_info and rebuilt_sheets:
+            rebuilt_sheets.add("external")
+
+        if "entity" in rebuilt_sheets:
+            # Every Graphviz line is drawn again, the node IDs of renamed terms must not collide with their new names
+            self.__graphviz_node_ids = GraphvizNodeIds()
+        self.__read_sheets(changed_sheets)
+        self.__build(rebuilt_sheets, replace_bindings=True)
+        return rebuilt_sheets
+
+    def __read_sheets(self, sheets):
+        """
+        Reads the records of the given sheets.
+        """
+        with profile_stage("read_sheets", sheets=len(sheets)) as counts:
+            records = []
+            if "ontology_info" in sheets:
+                self.__ontology_info_record = read_ontology_info(self.__ontology_info_path)
+            if "namespace" in sheets:
+                self.__namespace_records = read_namespaces(self.__namespace_path)
+                records.append(self.__namespace_records)
+            if "entity" in sheets:
+                self.__entity_records = read_entities(self.__entity_path)
+                records.append(self.__entity_records)
+            if "relationship" in sheets:
+                self.__relationship_records = read_relationships(self.__obj_property_path)
+                records.append(self.__relationship_records)
+            if "value_type" in sheets:
+                self.__value_type_records = read_value_types(self.__data_property_path)
+                records.append(self.__value_type_records)
+            counts["rows"] = sum(len(sheet_records) for sheet_records in records)
+
+    def __build(self, sheets, replace_bindings=False):
+        """
+        Retracts the triples and Graphviz lines of the given sheets and parses the sheets again, in the order of SHEETS.
+        On a rebuild, prefixes bound before may point to a new URL now and are rebound.
+        """
+        if self.__sheet_triples:
+            with profile_stage("retract_sheets", sheets=len(sheets)):
+                for sheet in reversed(self.SHEETS):
+                    if sheet in sheets:
+                        self.__retract_triples(sheet)
+
+        body = self.__graphviz_graph.body
+        for sheet in self.SHEETS:
+            if sheet not in sheets or (sheet == "external" and not self.__add_external_onto_info):
+                continue
+            start = len(body)
+            with profile_stage(f"parse_{sheet}") as counts:
+                if sheet == "ontology_info":
+                    self.parse_ontology_info()
+                elif sheet == "namespace":
+                    self.__namespace_uris, self.__ontology_info = self.parse_namespace(replace=replace_bindings)
+                elif sheet == "entity":
+                    self.__entity_uris = self.parse_entities()
+                elif sheet == "relationship":
+                    self.__obj_property_uris = self.parse_object_properties()
+                elif sheet == "value_type":
+                    self.__data_property_uris = self.parse_data_properties()
+                else:
+                    # Add external ontology information
+                    self.add_external_ontology_info()
+                counts["triples"] = len(self.__sheet_triples.get(sheet, ()))
+                counts["graphviz_lines"] = len(body) - start
+            self.__graphviz_lines[sheet] = body[start:]
+            del body[start:]
+
+        # The lines of unchanged sheets keep their place, so the Graphviz graph is the same as after a full parse
+        body[self.__graphviz_start:] = [line for sheet in self.SHEETS for line in self.__graphviz_lines.get(sheet, [])]
+
+    def parse_ontology_info(self):
+        """
+        Updates the RDFLib graph with the ontology metadata specified in the ontology information CSV file.
+        """
+        ontology_info = self.__ontology_info_record
+
+        self.__ontology_base_uri = Namespace(ontology_info.base_uri)
+        self.__referenced_terms["ontology_info"] = {str(self.__ontology_base_uri): {self.__ontology_base_uri.Ontology}}
+        self.__add_triple((self.__ontology_base_uri.Ontology, RDF.type, OWL.Ontology))
+
+        self.__ontology_name = ontology_info.name
+        self.__add_triple((self.__ontology_base_uri.Ontology, RDFS.label, self.__term_interner.literal(self.__ontology_name)))
+        self.__add_triple((self.__ontology_base_uri.Ontology, DCTERMS.title, self.__term_interner.literal(self.__ontology_name)))
+
+        self.__ontology_version = ontology_info.version
+        self.__add_triple((self.__ontology_base_uri.Ontology, OWL.versionInfo, self.__term_interner.literal(self.__ontology_version)))
+
+        authorsList = [author.strip() for author in ontology_info.authors.split(",")]
+        if authorsList[0] != "":
+            for author in authorsList:
+                self.__add_triple((self.__ontology_base_uri.Ontology, DCTERMS.creator, self.__term_interner.literal(author)))
 
-        self.__namespace_uris, self.__ontology_info = self.parse_namespace()
-        self.__entity_uris = self.parse_entities()
-        self.parse_object_properties()
-        self.parse_data_properties()
+        self.__add_triple((self.__ontology_base_uri.Ontology, DCTERMS.description, self.__term_interner.literal(ontology_info.description)))
+        self.__flush_triples("ontology_info")
 
-        # Add external ontology information
-        if add_external_onto_info:
-            self.add_external_ontology_info()
+    def __add_triple(self, triple):
+        """
+        Buffers a triple of interned terms for the RDFLib graph. Triples that are already buffered are ignored.
+        """
+        self.__triple_buffer[self.__term_interner.intern_triple(triple)] = None
+
+    def __flush_triples(self, sheet):
+        """
+        Adds all buffered triples to the RDFLib graph in one bulk insert, records them as the triples of the sheet and empties the buffer.
+        """
+        graph = self.__rdflib_graph
+        with paused_garbage_collection():
+            graph.addN((subject, predicate, obj, graph) for subject, predicate, obj in self.__triple_buffer)
+        self.__sheet_triples[sheet] = self.__triple_buffer
+        self.__triple_buffer = {}
+
+    def __retract_triples(self, sheet):
+        """
+        Removes the triples of a sheet from the RDFLib graph, except for the triples that other sheets added as well.
+        """
+        sheet_triples = self.__sheet_triples.pop(sheet, {})
+        other_sheet_triples = list(self.__sheet_triples.values())
+        for triple in sheet_triples:
+            if not any(triple in triples for triples in other_sheet_triples):
+                self.__rdflib_graph.remove(triple)
 
-    def parse_namespace(self):
+    def parse_namespace(self, replace=False):
         """
-        Parses the namespace CSV file and updates the RDFLib graph with namespace bindings.
+        Updates the RDFLib graph with the namespace bindings specified in the namespace CSV file.
+
+        Args:
+            replace (bool): Whether to rebind prefixes that are already bound to another namespace, instead of binding the namespace to a new prefix.
 
         Returns:
             tuple: A tuple containing:
@@ -113,280 +313,174 @@ class FairSheetParser:
         namespace_dict = {}
         ontology_info_dict = {}
 
-        with open(self.__namespace_path, newline='') as namespace_file:
-            csv_reader = csv.DictReader(namespace_file)
-            next(csv_reader)
+        for record in self.__namespace_records:
+            prefix_name = record.prefix.lower()
+            namespace_dict[prefix_name] = Namespace(record.url)
+            ontology_info_dict[record.ontology_info] = record.url
+            self.__rdflib_graph.bind(prefix_name, namespace_dict[prefix_name], replace=replace)
 
-            for row in csv_reader:
-                prefix_name = row["Prefix Name"].lower()
-                namespace_dict[prefix_name] = Namespace(row["Ontology URL"])
-                ontology_info_dict[row["Ontology Info"]] = row["Ontology URL"]
-                self.__rdflib_graph.bind(prefix_name, namespace_dict[prefix_name])
-
-            namespace_dict[self.__ontology_name] = self.__ontology_base_uri
-            self.__rdflib_graph.bind(self.__ontology_name, self.__ontology_base_uri)
+        namespace_dict[self.__ontology_name] = self.__ontology_base_uri
+        self.__rdflib_graph.bind(self.__ontology_name, self.__ontology_base_uri, replace=replace)
 
         return namespace_dict, ontology_info_dict
 
     def parse_entities(self):
         """
-        Parses the entity CSV file and updates the RDFLib and Graphviz graphs with the terms, definitions, and other information specified in the CSV file.
+        Updates the RDFLib and Graphviz graphs with the terms, definitions, and other information specified in the entity CSV file.
 
         Returns:
             dict: A dictionary containing processed entities and their URIs.
         """
         entitiesCreated = {}
-        entities_to_process = defaultdict(list)
+        entities_to_process = {}
+        referenced_terms = self.__referenced_terms["entity"] = defaultdict(set)
 
-        pattern = r'[^\w\s]'
+        for entity_record in self.__entity_records:
+            entity = entity_record.full_name
 
-        with open(self.__entity_path, newline='') as entity_file:
-            csv_reader = csv.DictReader(entity_file)
-            next(csv_reader)
+            if entity_record.ontology == "":
+                ontology_namespace = self.__ontology_base_uri
+                entity_uri = self.__term_interner.uri(ontology_namespace + entity)
+            else:
+                ontology_namespace = self.__namespace_uris[entity_record.ontology.lower()]
+                entity_uri = self.__term_interner.uri(ontology_namespace + entity.split(":")[1])
 
-            for row in csv_reader:
-                entity = row['fullName']
+            # A repeated full name keeps its first position but uses the values of its last row
+            entities_to_process[entity] = entity_record
 
-                if row["Belongs to Ontology"] == "":
-                    ontology_namespace = self.__ontology_base_uri
-                    entity_uri = ontology_namespace[Literal(entity)]
-                else:
-                    ontology_namespace = self.__namespace_uris[row["Belongs to Ontology"].lower()]
-                    entity_uri = ontology_namespace[Literal(entity.split(":")[1])]
-
-                entities_to_process[entity] = {
-                    'name': row["Variable Name"],
-                    'parent': row["Parent Variable"],
-                    'definition': row["Definition of Variable"],
-                    'alt_names': row["Alternative Name(s)"].strip().split(","),
-                    'fullName': entity,
-                    'unit': row["Unit"]
-                }
-
-                entitiesCreated[entity] = entity_uri
-
-                if row["Belongs to Ontology"] == "":
-                    self.__graphviz_graph.node(re.sub(pattern, '', entity_uri), label=("mds:" + entity), style='filled', color="lightblue")
-                else:
-                    self.__graphviz_graph.node(re.sub(pattern, '', entity_uri), label=entity, style='filled', color="lightblue")
+            entitiesCreated[entity] = entity_uri
+            referenced_terms[str(ontology_namespace)].add(entity_uri)
 
-            def dfs(entity, entities_to_process):
-                entity_uri = entitiesCreated[(entity["fullName"])]
-                entity_graphviz_id = re.sub(pattern, '', entity_uri)
-                entity_subclassOf_box_id = "superclassOf" + entity_graphviz_id
-                entity_unit_id = entity_graphviz_id + "unit"
+            if entity_record.ontology == "":
+                self.__graphviz_graph.node(self.__graphviz_node_ids.get(entity_uri), label=("mds:" + entity), style='filled', color="lightblue")
+            else:
+                self.__graphviz_graph.node(self.__graphviz_node_ids.get(entity_uri), label=entity, style='filled', color="lightblue")
 
-                self.__rdflib_graph.add((entity_uri, RDF.type, OWL.Class))
-                self.__rdflib_graph.add((entity_uri, RDFS.label, Literal(entity['name'])))
+        for entity in entities_to_process.values():
+            entity_uri = entitiesCreated[entity.full_name]
+            entity_graphviz_id = self.__graphviz_node_ids.get(entity_uri)
+            entity_subclassOf_box_id = "superclassOf" + entity_graphviz_id
+            entity_unit_id = entity_graphviz_id + "unit"
 
-                if entity['unit'] != "":
-                    namespace_unit, unit_unit = entity['unit'].split(':')
-                    unit_uri = self.__namespace_uris[(namespace_unit).lower()][unit_unit]
-                    self.__rdflib_graph.add((entity_uri, URIRef("https://w3id.org/pmd/co/unit"), unit_uri))
+            self.__add_triple((entity_uri, RDF.type, OWL.Class))
+            self.__add_triple((entity_uri, RDFS.label, self.__term_interner.literal(entity.name)))
 
-                if entity['alt_names'][0] != "":
-                    for altName in entity['alt_names']:
-                        self.__rdflib_graph.add((entity_uri, SKOS.altLabel, Literal(altName)))
-                else:
-                    self.__rdflib_graph.add((entity_uri, SKOS.altLabel, Literal("")))
-
-                if entity['definition'] != "":
-                    self.__rdflib_graph.add((entity_uri, SKOS.definition, Literal(entity['definition'])))
-
-                if entity['parent'] != "" and (entities_to_process.__contains__(entity['parent'])):
-                    parent_uri = entitiesCreated[(entity['parent'])]
-                    parent_graphviz_id = re.sub(pattern, '', parent_uri)
-                    self.__rdflib_graph.add((entity_uri, RDFS.subClassOf, parent_uri))
-                    self.__graphviz_graph.node(entity_subclassOf_box_id, label="subclass of", color="darkblue", shape="box")
-                    self.__graphviz_graph.edge(parent_graphviz_id, entity_subclassOf_box_id, style="dashed, bold", dir="back")
-                    self.__graphviz_graph.edge(entity_subclassOf_box_id, entity_graphviz_id, style="dashed, bold", dir="none")
-
-                    if self.__include_graph_valuetype and entity["unit"] != "":
-                        self.__graphviz_graph.node(entity_unit_id, label="unit", color="darkblue", style="filled", shape="box", fontcolor="white")
-                        self.__graphviz_graph.node(entity['fullName'] + "unit", label=entity["unit"], color="yellow", style="filled", fontcolor="black")
-                        self.__graphviz_graph.edge(entity_graphviz_id, entity_unit_id, style="bold", dir="none")
-                        self.__graphviz_graph.edge(entity_unit_id, entity['fullName'] + "unit", style="bold", dir="forward")
-
-                elif entity['parent'] != "":
-                    parent_uri = entitiesCreated[entity["parent"]]
-                    parent_graphviz_id = re.sub(pattern, '', parent_uri)
-                    self.__rdflib_graph.add((entity_uri, RDFS.subClassOf, parent_uri))
-                    self.__graphviz_graph.node(entity_subclassOf_box_id, label="subclass of", color="darkblue", shape="box")
-                    self.__graphviz_graph.edge(parent_graphviz_id, entity_subclassOf_box_id, style="dashed, bold", dir="back")
-                    self.__graphviz_graph.edge(entity_subclassOf_box_id, entity_graphviz_id, style="dashed, bold", dir="none")
-
-                    if self.__include_graph_valuetype and entity["unit"] != "":
-                        self.__graphviz_graph.node(entity_unit_id, label="unit", color="darkblue", style="filled", shape="box", fontcolor="white")
-                        self.__graphviz_graph.node(entity['fullName'] + "unit", label=entity["unit"], color="yellow", style="filled", fontcolor="black")
-                        self.__graphviz_graph.edge(entity_graphviz_id, entity_unit_id, style="bold", dir="none")
-                        self.__graphviz_graph.edge(entity_unit_id, entity['fullName'] + "unit", style="bold", dir="forward")
-
-                entities_to_process.pop(entity['fullName'])
-                return entity['fullName']
-
-            for entity in list(entities_to_process.keys()):
-                dfs(entities_to_process[entity], entities_to_process)
+            if entity.unit != "":
+                namespace_unit, unit_unit = entity.unit.split(':')
+                unit_uri = self.__term_interner.uri(self.__namespace_uris[(namespace_unit).lower()] + unit_unit)
+                self.__add_triple((entity_uri, URIRef("https://w3id.org/pmd/co/unit"), unit_uri))
 
+            if entity.alt_names[0] != "":
+                for altName in entity.alt_names:
+                    self.__add_triple((entity_uri, SKOS.altLabel, self.__term_interner.literal(altName)))
+            else:
+                self.__add_triple((entity_uri, SKOS.altLabel, self.__term_interner.literal("")))
+
+            if entity.definition != "":
+                self.__add_triple((entity_uri, SKOS.definition, self.__term_interner.literal(entity.definition)))
+
+            if entity.parent != "":
+                parent_uri = entitiesCreated[entity.parent]
+                parent_graphviz_id = self.__graphviz_node_ids.get(parent_uri)
+                self.__add_triple((entity_uri, RDFS.subClassOf, parent_uri))
+                self.__graphviz_graph.node(entity_subclassOf_box_id, label="subclass of", color="darkblue", shape="box")
+                self.__graphviz_graph.edge(parent_graphviz_id, entity_subclassOf_box_id, style="dashed, bold", dir="back")
+                self.__graphviz_graph.edge(entity_subclassOf_box_id, entity_graphviz_id, style="dashed, bold", dir="none")
+
+                if self.__include_graph_valuetype and entity.unit != "":
+                    self.__graphviz_graph.node(entity_unit_id, label="unit", color="darkblue", style="filled", shape="box", fontcolor="white")
+                    self.__graphviz_graph.node(entity.full_name + "unit", label=entity.unit, color="yellow", style="filled", fontcolor="black")
+                    self.__graphviz_graph.edge(entity_graphviz_id, entity_unit_id, style="bold", dir="none")
+                    self.__graphviz_graph.edge(entity_unit_id, entity.full_name + "unit", style="bold", dir="forward")
+
+        self.__flush_triples("entity")
         return entitiesCreated
 
-    # def parse_values_csv(self):
-    #     """
-    #     Method to parse the values CSV file.
-
-    #     Returns:
-    #         dict: Dictionary mapping ontology names to their base URIs.
-    #     """
-
-    #     values_dict = {}
-    #     with open(self.__values_path, newline='') as values_file:
-    #         csv_reader = csv.DictReader(values_file)
-    #         count = 1
-    #         existing_objects = {}
-    #         column_vars = []
-    #         column_obj_indices = []
-    #         column_obj_start_index = 0
-    #         column_obj_end_index = 0
-    #         current_obj = None
-
-    #         # Iterate over each column in the CSV file
-    #         for column in csv_reader.fieldnames:
-    #             # Extract domain and relationship from column header using regex patterns
-    #             domain_pattern = r'\((.*?)\-\>'
-    #             relationship_pattern = r'^([^()]*)'
-    #             domain = re.search(domain_pattern, column).group(1)
-    #             relationship = re.search(relationship_pattern, column).group(1)
-    #             column_vars.append({'domain': domain, 'relationship': relationship})
-    #             if current_obj is None:
-    #                 current_obj = domain
-    #                 column_obj_start_index = 0
-    #             elif current_obj != domain:
-    #                 column_obj_indices.append((column_obj_start_index, column_obj_end_index-1))
-    #                 column_obj_start_index = column_obj_end_index
-    #             column_obj_end_index += 1
-    #         column_obj_indices.append((column_obj_start_index, column_obj_end_index-1))
-
-    #         # Iterate over each row in the CSV file
-    #         for row in csv_reader:
-    #             curr_objects = {}
-    #             row_keys = list(row.keys())
-    #             row_values = list(row.values())
-
-    #             # Iterate over each group of columns representing an object
-    #             for i, j in column_obj_indices:
-    #                 # Generate a unique hash for the object based on column variables and row data
-    #                 object_hash = hash(str(column_vars[i:j+1]) + str(row_keys[i:j+1] + row_values[i:j+1]))
-    #                 domain = column_vars[i]['domain']
-
-    #                 # Check if the object already exists, if not, create a new RDF instance
-    #                 if object_hash not in existing_objects:
-    #                     entity_uri = self.__entity_uris[domain]
-    #                     instance_key = URIRef(entity_uri + str(count))
-    #                     self.__rdflib_graph.add((instance_key, RDF.type, URIRef(entity_uri)))
-    #                     existing_objects[object_hash] = instance_key
-    #                 else:
-    #                     instance_key = existing_objects[object_hash]
-
-    #                 # Add RDF triples for each property of the object
-    #                 for index in range(i,j+1):
-    #                     relationship_val = self.__data_property_uris[column_vars[index]['relationship']]
-    #                     self.__rdflib_graph.add((URIRef(instance_key), URIRef(relationship_val), Literal(row_values[index])))
-    #                 curr_objects[domain] = instance_key
-
-    #             # Add RDF triples for relationships specified in __individual_relationship
-    #             for domain in self.__individual_relationship.keys():
-    #                 for relationshipRange, relationship in self.__individual_relationship[domain]:
-    #                     if domain not in curr_objects.keys():
-    #                         entity_uri = self.__entity_uris[domain]
-    #                         instance_key = URIRef(entity_uri + str(count))
-    #                         self.__rdflib_graph.add((instance_key, RDF.type, URIRef(entity_uri)))
-    #                         curr_objects[domain] = instance_key
-    #                     if relationshipRange not in curr_objects.keys():
-    #                         entity_uri = self.__entity_uris[relationshipRange]
-    #                         instance_key = URIRef(entity_uri + str(count))
-    #                         self.__rdflib_graph.add((instance_key, RDF.type, URIRef(entity_uri)))
-    #                         curr_objects[relationshipRange] = instance_key
-    #                     self.__rdflib_graph.add((URIRef(curr_objects[domain]), relationship, URIRef(curr_objects[relationshipRange])))
-                    
-    #             count+=1
-
-    #         # Add ontology name and base URI to the values dictionary
-    #         values_dict[self.__ontology_name] = self.__ontology_base_uri
-
-    #     return values_dict
-
     def parse_object_properties(self):
         """
-        Parses the relationship CSV file and updates the RDFLib and Graphviz graphs with the terms, definitions, and other information about relationships specified in the CSV file.
+        Updates the RDFLib and Graphviz graphs with the terms, definitions, and other information about relationships specified in the relationship CSV file.
 
         Returns:
             dict: A dictionary containing processed object properties and their corresponding URIs.
         """
-        pattern = r'[^\w\s]'
-        with open(self.__obj_property_path, newline='') as obj_property_file:
-            csv_reader = csv.DictReader(obj_property_file)
-            next(csv_reader)
-
-            obj_property_list = {}
-
-            for row in csv_reader:
-                # Skip rows where Domain or Range are empty
-                if not row["Domain"] or not row["Range"]:
-                    continue
-                obj_property_uri = self.__namespace_uris[self.__ontology_name][Literal(row["Relationship Name"])]
-                graphviz_obj_prop_uri = re.sub(pattern, '', obj_property_uri + row["Domain"] + row["Range"])
-
-                if row["Belongs to Ontology"] == "" and (obj_property_uri not in obj_property_list.values()):
-                    self.__rdflib_graph.add((obj_property_uri, RDF.type, OWL.ObjectProperty))
-                    self.__graphviz_graph.node(graphviz_obj_prop_uri, label=row["Relationship Name"], color="darkblue", style="filled", fontcolor="white", shape="box")
-                    self.__rdflib_graph.add((obj_property_uri, RDFS.label, Literal(row["Relationship Name"])))
-                    
-                    if row["Definition"] != "":
-                        self.__rdflib_graph.add((obj_property_uri, SKOS.definition, Literal(row["Definition"])))
-                    
-                    if row["Alternative Name(s)"] != "":
-                        alternativeNamesList = row["Alternative Name(s)"].strip().split(",")
-                        if alternativeNamesList[0] != "":
-                            for altName in alternativeNamesList:
-                                self.__rdflib_graph.add((obj_property_uri, SKOS.altLabel, Literal(altName)))
-
-                    obj_property_list[row["fullName"]] = obj_property_uri
-                    self.__rdflib_graph.add((obj_property_uri, RDF.type, OWL.ObjectProperty))
-
-                elif row["Belongs to Ontology"] != "" and (obj_property_uri not in obj_property_list.values()):
-                    obj_property_uri = self.__namespace_uris[row["Belongs to Ontology"].lower()][Literal(row["Relationship Name"])]
-                    graphviz_obj_prop_uri = re.sub(pattern, '', obj_property_uri + row["Domain"] + row["Range"])
-                    self.__rdflib_graph.add((obj_property_uri, RDF.type, OWL.ObjectProperty))
-                    self.__graphviz_graph.node(graphviz_obj_prop_uri, label=row["Relationship Name"], color="darkblue", style="filled", fontcolor="white", shape="box")
-                    obj_property_list[row["fullName"]] = obj_property_uri
-                elif row["Belongs to Ontology"] != "":
-                    obj_property_uri = self.__namespace_uris[row["Belongs to Ontology"]][Literal(row["Relationship Name"])]
-                    graphviz_obj_prop_uri = re.sub(pattern, '', obj_property_uri + row["Domain"] + row["Range"])
-
-                self.__rdflib_graph.add((obj_property_uri, RDFS.domain, self.__entity_uris[row["Domain"]]))
-                self.__rdflib_graph.add((obj_property_uri, RDFS.range, self.__entity_uris[row["Range"]]))
-
-                if row["Domain"] not in self.__individual_relationship:
-                    self.__individual_relationship[row["Domain"]] = []
-                self.__individual_relationship[row["Domain"]] += [(row["Range"], obj_property_uri)]
-
-                graphviz_domain = re.sub(pattern, '', self.__entity_uris[row["Domain"]])
-                graphviz_range = re.sub(pattern, '', self.__entity_uris[row["Range"]])
-                self.__graphviz_graph.edge(graphviz_domain, graphviz_obj_prop_uri, style="bold", dir="none")
-                self.__graphviz_graph.edge(graphviz_obj_prop_uri, graphviz_range, style="bold", dir="forward")
+        obj_property_list = {}
+        # URIs already in obj_property_list, kept as a set so each row is checked in constant time
+        seen_property_uris = set()
+        referenced_terms = self.__referenced_terms["relationship"] = defaultdict(set)
+        property_links = self.__property_links["relationship"] = defaultdict(list)
+        self.__individual_relationship = {}
+
+        for row in self.__relationship_records:
+            # Skip rows where Domain or Range are empty
+            if not row.domain or not row.range:
+                continue
+            property_namespace = self.__namespace_uris[self.__ontology_name]
+            obj_property_uri = self.__term_interner.uri(property_namespace + row.name)
+            graphviz_obj_prop_uri = self.__graphviz_node_ids.get(obj_property_uri + row.domain + row.range)
+
+            if row.ontology == "" and (obj_property_uri not in seen_property_uris):
+                self.__add_triple((obj_property_uri, RDF.type, OWL.ObjectProperty))
+                self.__graphviz_graph.node(graphviz_obj_prop_uri, label=row.name, color="darkblue", style="filled", fontcolor="white", shape="box")
+                self.__add_triple((obj_property_uri, RDFS.label, self.__term_interner.literal(row.name)))
+                
+                if row.definition != "":
+                    self.__add_triple((obj_property_uri, SKOS.definition, self.__term_interner.literal(row.definition)))
+                
+                if row.alt_names[0] != "":
+                    for altName in row.alt_names:
+                        self.__add_triple((obj_property_uri, SKOS.altLabel, self.__term_interner.literal(altName)))
+
+                obj_property_list[row.full_name] = obj_property_uri
+                seen_property_uris.add(obj_property_uri)
+
+            elif row.ontology != "" and (obj_property_uri not in seen_property_uris):
+                property_namespace = self.__namespace_uris[row.ontology.lower()]
+                obj_property_uri = self.__term_interner.uri(property_namespace + row.name)
+                graphviz_obj_prop_uri = self.__graphviz_node_ids.get(obj_property_uri + row.domain + row.range)
+                self.__add_triple((obj_property_uri, RDF.type, OWL.ObjectProperty))
+                self.__graphviz_graph.node(graphviz_obj_prop_uri, label=row.name, color="darkblue", style="filled", fontcolor="white", shape="box")
+                obj_property_list[row.full_name] = obj_property_uri
+                seen_property_uris.add(obj_property_uri)
+            elif row.ontology != "":
+                property_namespace = self.__namespace_uris[row.ontology]
+                obj_property_uri = self.__term_interner.uri(property_namespace + row.name)
+                graphviz_obj_prop_uri = self.__graphviz_node_ids.get(obj_property_uri + row.domain + row.range)
+
+            referenced_terms[str(property_namespace)].add(obj_property_uri)
+            self.__add_triple((obj_property_uri, RDFS.domain, self.__entity_uris[row.domain]))
+            self.__add_triple((obj_property_uri, RDFS.range, self.__entity_uris[row.range]))
+
+            if row.domain not in self.__individual_relationship:
+                self.__individual_relationship[row.domain] = []
+            self.__individual_relationship[row.domain] += [(row.range, obj_property_uri)]
+            property_links[(row.domain, row.range)].append(obj_property_uri)
+
+            graphviz_domain = self.__graphviz_node_ids.get(self.__entity_uris[row.domain])
+            graphviz_range = self.__graphviz_node_ids.get(self.__entity_uris[row.range])
+            self.__graphviz_graph.edge(graphviz_domain, graphviz_obj_prop_uri, style="bold", dir="none")
+            self.__graphviz_graph.edge(graphviz_obj_prop_uri, graphviz_range, style="bold", dir="forward")
             
+        self.__flush_triples("relationship")
         return obj_property_list
 
     def add_external_ontology_info(self):
         """
         Adds external ontology information to all terms in the RDFLib graph that belonged to other ontologies in the FAIR sheets.
+
+        Only the terms recorded while the sheets were parsed are looked up in the external ontologies, so the cost of this
+        method depends on the number of referenced terms instead of the size of the RDFLib graph.
         """
+        imported_predicates = {SKOS.definition, DCTERMS.description, SKOS.altLabel}
+
         for ontology_file, base_uri in self.__ontology_info.items():
+            # Skip namespaces without an Ontology Info file
+            if ontology_file == "":
+                continue
             try:
-                graph = rdfGraph().parse(ontology_file, format='ttl')
+                graph = self.__external_ontology_registry.get(ontology_file)
             except Exception as e:
                 warnings.warn(f"Failed to parse ontology file {ontology_file}: {e}")
                 continue  # Skip to the next ontology file
-            graph = rdfGraph().parse(ontology_file, format='ttl')
             if "http:" in base_uri:
                 http_uri = base_uri
                 https_uri = base_uri.replace("http", "https")
@@ -394,93 +488,105 @@ class FairSheetParser:
                 http_uri = base_uri.replace("https", "http")
                 https_uri = base_uri
 
+            # Collect the local names of all recorded terms under the http or https form of the base URI
             referenced_terms = set()
-            for subj, pred, obj in self.__rdflib_graph:
-                if subj.startswith(http_uri):
-                    referenced_terms.add(str(subj)[len(http_uri):])
-                if subj.startswith(https_uri):
-                    referenced_terms.add(str(subj)[len(https_uri):])
-            
-            for term in referenced_terms:
-                term = URIRef(base_uri + term)
-                for s, p, o in graph.triples((term, SKOS.definition, None)):
-                    self.__rdflib_graph.add((s, p, o))
-                for s, p, o in graph.triples((term, DCTERMS.description, None)):
-                    self.__rdflib_graph.add((s, p, o))
-                for s, p, o in graph.triples((term, SKOS.altLabel, None)):
-                    self.__rdflib_graph.add((s, p, o))
-                # for s, p, o in graph.triples((term, RDFS.label, None)):
-                #     self.__rdflib_graph.add((s, p, o))
+            for namespace, terms in self.__all_referenced_terms():
+                for uri in (http_uri, https_uri):
+                    if namespace.startswith(uri):
+                        referenced_terms.update(str(term)[len(uri):] for term in terms)
+                    elif uri.startswith(namespace):
+                        referenced_terms.update(str(term)[len(uri):] for term in terms if term.startswith(uri))
+
+            # Look up every term once, all imported triples are added in one batch
+            for term in sorted(referenced_terms):
+                term = self.__term_interner.uri(base_uri + term)
+                for predicate, object_ in graph.predicate_objects(term):
+                    if predicate in imported_predicates:
+                        self.__add_triple((term, predicate, object_))
+        self.__flush_triples("external")
+
+    def __all_referenced_terms(self):
+        """
+        Gets the namespace URIs and the terms referenced under them, over all sheets.
+        """
+        all_referenced_terms = defaultdict(set)
+        for sheet_referenced_terms in self.__referenced_terms.values():
+            for namespace, terms in sheet_referenced_terms.items():
+                all_referenced_terms[namespace].update(terms)
+        return all_referenced_terms.items()
 
     def parse_data_properties(self):
         """
-        Parses data properties from a CSV file and updates the RDFLib and Graphviz graphs.
+        Updates the RDFLib and Graphviz graphs with the data properties specified in the data property CSV file.
 
-        This method reads data properties from a specified CSV file and processes each row to 
-        generate URIs for data properties, create RDF triples, and update a Graphviz graph. 
-        The method handles different namespaces based on the ontology specified in the CSV rows.
+        This method processes each row of the data property sheet to generate URIs for data properties, 
+        create RDF triples, and update a Graphviz graph. The method handles different namespaces based 
+        on the ontology specified in the CSV rows.
 
         Returns:
             dict: A dictionary containing processed data properties and their URIs.
         
         Raises:
-            FileNotFoundError: If the data property CSV file cannot be found.
-            csv.Error: If there is an error reading the CSV file.
-        """
-        pattern = r'[^\w\s]'
-        with open(self.__data_property_path, newline='') as data_property_file:
-            csv_reader = csv.DictReader(data_property_file)
-            next(csv_reader)
-
-            data_property_list = {}
-
-            for row in csv_reader:
-
-                # Skip rows where Domain or Range are empty
-                if not row["Domain"] or not row["Range"]:
-                    continue
-
-                # Generate URI for the data property
-                data_property_uri = self.__namespace_uris[self.__ontology_name][Literal(row["ValueType Name"])]
-                graphviz_data_prop_uri = re.sub(pattern, '', data_property_uri + row["Domain"] + row["Range"])
-
-                # If conditions met, adds triples representing the data property with its type, label, definition, and alternative names
-                if row["Belongs to Ontology"] == "" and (data_property_uri not in data_property_list.values()):
-                    self.__rdflib_graph.add((data_property_uri, RDF.type, OWL.DatatypeProperty))
-                    self.__rdflib_graph.add((data_property_uri, RDFS.label, Literal(row["ValueType Name"])))
-                    if self.__include_graph_valuetype:
-                        self.__graphviz_graph.node(graphviz_data_prop_uri, label=row["ValueType Name"], color="darkblue", style="filled", fontcolor="white", shape="box")
-                    
-                    if row["Definition of Property"] != "":
-                        self.__rdflib_graph.add((data_property_uri, SKOS.definition, row["Definition"]))
-                    
-                    if row["Alternative Name(s)"] != "":
-                        alternativeNamesList = row["Alternative Name(s)"].strip().split(",")
-                        for altName in alternativeNamesList:
-                            self.__rdflib_graph.add((data_property_uri, SKOS.altLabel, Literal(altName)))
-
-                    data_property_list[row["fullName"].split("(")[0]] = data_property_uri
-                    self.__rdflib_graph.add((data_property_uri, RDF.type, OWL.DatatypeProperty))
-
-                # Else, it uses a different namespace URI based on the ontology specified in the row.    
-                elif row["Belongs to Ontology"] != "" and (data_property_uri not in data_property_list.values()):
-                    data_property_uri = Namespace(self.__namespace_uris[row["Belongs to Ontology"].lower()])[Literal(row["ValueType Name"])]
-                    self.__rdflib_graph.add((data_property_uri, RDF.type, OWL.DatatypeProperty))
-                    data_property_list[row["fullName"].split("(")[0]] = data_property_uri
-                    if self.__include_graph_valuetype:
-                        graphviz_data_prop_uri = re.sub(pattern, '', data_property_uri + row["Domain"] + row["Range"])
-                        self.__graphviz_graph.node(graphviz_data_prop_uri, label=row["ValueType Name"], color="darkblue", style="filled", fontcolor="white", shape="box")
+            KeyError: If a row references an unknown entity, namespace or datatype.
+        """
+        data_property_list = {}
+        # URIs already in data_property_list, kept as a set so each row is checked in constant time
+        seen_property_uris = set()
+        referenced_terms = self.__referenced_terms["value_type"] = defaultdict(set)
+        property_links = self.__property_links["value_type"] = defaultdict(list)
+
+        for row in self.__value_type_records:
+
+            # Skip rows where Domain or Range are empty
+            if not row.domain or not row.range:
+                continue
+
+            # Generate URI for the data property
+            property_namespace = self.__namespace_uris[self.__ontology_name]
+            data_property_uri = self.__term_interner.uri(property_namespace + row.name)
+            graphviz_data_prop_uri = self.__graphviz_node_ids.get(data_property_uri + row.domain + row.range)
+
+            # If conditions met, adds triples representing the data property with its type, label, definition, and alternative names
+            if row.ontology == "" and (data_property_uri not in seen_property_uris):
+                self.__add_triple((data_property_uri, RDF.type, OWL.DatatypeProperty))
+                self.__add_triple((data_property_uri, RDFS.label, self.__term_interner.literal(row.name)))
+                if self.__include_graph_valuetype:
+                    self.__graphviz_graph.node(graphviz_data_prop_uri, label=row.name, color="darkblue", style="filled", fontcolor="white", shape="box")
                 
-                # Adds triples representing the domain and range of the object property 
-                self.__rdflib_graph.add((data_property_uri, RDFS.domain, self.__entity_uris[row["Domain"]]))
-                self.__rdflib_graph.add((data_property_uri, RDFS.range, self.__datatype_conversions[row["Range"]]))
+                if row.definition != "":
+                    self.__add_triple((data_property_uri, SKOS.definition, self.__term_interner.literal(row.definition)))
+                
+                if row.alt_names != ("",):
+                    for altName in row.alt_names:
+                        self.__add_triple((data_property_uri, SKOS.altLabel, self.__term_interner.literal(altName)))
+
+                data_property_list[row.full_name.split("(")[0]] = data_property_uri
+                seen_property_uris.add(data_property_uri)
+
+            # Else, it uses a different namespace URI based on the ontology specified in the row.    
+            elif row.ontology != "" and (data_property_uri not in seen_property_uris):
+                property_namespace = Namespace(self.__namespace_uris[row.ontology.lower()])
+                data_property_uri = self.__term_interner.uri(property_namespace + row.name)
+                self.__add_triple((data_property_uri, RDF.type, OWL.DatatypeProperty))
+                data_property_list[row.full_name.split("(")[0]] = data_property_uri
+                seen_property_uris.add(data_property_uri)
                 if self.__include_graph_valuetype:
-                    graphviz_domain = re.sub(pattern, '', self.__entity_uris[row["Domain"]])
-                    graphviz_range = re.sub(pattern, '', (graphviz_data_prop_uri + row["Range"]))
-                    self.__graphviz_graph.node(graphviz_range, label=row["Range"], color="yellow", style="filled", fontcolor="black")
-                    self.__graphviz_graph.edge(graphviz_domain, graphviz_data_prop_uri, style="bold", dir="none")
-                    self.__graphviz_graph.edge(graphviz_data_prop_uri, graphviz_range, style="bold", dir="forward")
+                    graphviz_data_prop_uri = self.__graphviz_node_ids.get(data_property_uri + row.domain + row.range)
+                    self.__graphviz_graph.node(graphviz_data_prop_uri, label=row.name, color="darkblue", style="filled", fontcolor="white", shape="box")
+            
+            # Adds triples representing the domain and range of the object property 
+            referenced_terms[str(property_namespace)].add(data_property_uri)
+            self.__add_triple((data_property_uri, RDFS.domain, self.__entity_uris[row.domain]))
+            self.__add_triple((data_property_uri, RDFS.range, self.__datatype_conversions[row.range]))
+            property_links[(row.domain, row.range)].append(data_property_uri)
+            if self.__include_graph_valuetype:
+                graphviz_domain = self.__graphviz_node_ids.get(self.__entity_uris[row.domain])
+                graphviz_range = self.__graphviz_node_ids.get(graphviz_data_prop_uri + row.range)
+                self.__graphviz_graph.node(graphviz_range, label=row.range, color="yellow", style="filled", fontcolor="black")
+                self.__graphviz_graph.edge(graphviz_domain, graphviz_data_prop_uri, style="bold", dir="none")
+                self.__graphviz_graph.edge(graphviz_data_prop_uri, graphviz_range, style="bold", dir="forward")
             
+        self.__flush_triples("value_type")
         return data_property_list
     
     def get_rdf_graph(self):
@@ -500,6 +606,15 @@ class FairSheetParser:
             graphviz.Digraph: The current Graphviz graph
         """
         return self.__graphviz_graph
+
+    def get_graphviz_node_ids(self):
+        """
+        Gets the node IDs of the Graphviz graph
+
+        Returns:
+            GraphvizNodeIds: The mapping of URIs to the node IDs used in the Graphviz graph
+        """
+        return self.__graphviz_node_ids
     
     def get_ontology_name(self):
         """
@@ -527,13 +642,111 @@ class FairSheetParser:
             str: The user-specified namespace URIs of the ontology
         """
         return self.__namespace_uris
+
+    def get_entity_uris(self):
+        """
+        Gets the URIs of the entities
+
+        Returns:
+            dict: A dictionary of the full names of the entities and their URIs
+        """
+        return self.__entity_uris
+
+    def get_data_property_uris(self):
+        """
+        Gets the URIs of the data properties
+
+        Returns:
+            dict: A dictionary of the full names of the data properties, without their domain and range, and their URIs
+        """
+        return self.__data_property_uris
+
+    def get_individual_relationships(self):
+        """
+        Gets the object properties that link individuals of the entities
+
+        Returns:
+            dict: A dictionary of the full names of the domain entities and, for each, a list of (range full name, object property URI) pairs
+        """
+        return self.__individual_relationship
     
-    def zip_input_csv_files(self):
+    def get_property_links(self, domain, range):
+        """
+        Gets the properties linking a domain to a range
+
+        Args:
+            domain (str): Full name of the domain entity.
+            range (str): Full name of the range entity, or the XSD datatype of a data property, e.g. xsd:float.
+
+        Returns:
+            list: The URIs of the object and data properties from domain to range, in sheet order.
+        """
+        return [uri for sheet in ("relationship", "value_type") for uri in self.__property_links[sheet].get((domain, range), [])]
+
+    def get_ontology_info_record(self):
+        """
+        Gets the metadata of the ontology read from the ontology information sheet
+
+        Returns:
+            OntologyInfoRecord: The metadata of the ontology
+        """
+        return self.__ontology_info_record
+
+    def get_namespace_records(self):
+        """
+        Gets the rows of the namespace sheet
+
+        Returns:
+            list: A NamespaceRecord for every row of the namespace sheet
+        """
+        return self.__namespace_records
+
+    def get_entity_records(self):
+        """
+        Gets the rows of the entity sheet
+
+        Returns:
+            list: An EntityRecord for every row of the entity sheet
+        """
+        return self.__entity_records
+
+    def get_relationship_records(self):
+        """
+        Gets the rows of the relationship sheet
+
+        Returns:
+            list: A RelationshipRecord for every row of the relationship sheet
+        """
+        return self.__relationship_records
+
+    def get_value_type_records(self):
+        """
+        Gets the rows of the value type sheet
+
+        Returns:
+            list: A ValueTypeRecord for every row of the value type sheet
+        """
+        return self.__value_type_records
+
+    def zip_input_csv_files(self, output_folder="."):
+        """
+        Zips the five input CSV sheets of the ontology into the given output folder.
+
+        Args:
+            output_folder (str): Folder the zip file is written to. Each ontology should use its own folder so that concurrent builds cannot overwrite each other's archive.
+
+        Returns:
+            str: The file path of the created zip file.
+        """
         # List of files to be zipped
         files_to_zip = [self.__ontology_info_path, self.__obj_property_path, self.__data_property_path, self.__namespace_path, self.__entity_path]
 
-        # Define the name of the zip file
-        zip_file_name = 'input_sheets.zip'
+        # Create the folder if it doesn't exist
+        if not os.path.exists(output_folder):
+            os.makedirs(output_folder)
+
+        # Define the path of the zip file
+        zip_file_name = os.path.join(output_folder, 'input_sheets.zip')
 
         # Create a zip file and add the files to it
         with zipfile.ZipFile(zip_file_name, 'w') as zipf:
@@ -0,0 +1,201 @@
+import csv
+
+class SheetRecord:
+    """
+    Base class for the typed records read from the FAIR sheets.
+
+    Records only store the cell values of one row and are the intermediate representation from which the
+    RDFLib graph, the Graphviz graph and other outputs are built. Records use __slots__ to keep thousands of rows cheap,
+    and compare by value so that the records of two versions of a sheet can be diffed.
+    """
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for field, value in zip(self.__slots__, values):
+            setattr(self, field, value)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __hash__(self):
+        return hash((type(self),) + tuple(getattr(self, field) for field in self.__slots__))
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__))
+
+    def __getstate__(self):
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def __setstate__(self, state):
+        SheetRecord.__init__(self, *state)
+
+class OntologyInfoRecord(SheetRecord):
+    """
+    The metadata of an ontology from the OntologyInfo sheet.
+
+    Attributes:
+        name (str): Name of the ontology.
+        base_uri (str): Base URI of the ontology.
+        version (str): Version of the ontology.
+        authors (str): Comma separated authors of the ontology.
+        description (str): Description of the ontology.
+    """
+    __slots__ = ("name", "base_uri", "version", "authors", "description")
+
+class NamespaceRecord(SheetRecord):
+    """
+    A row of the NameSpace sheet.
+
+    Attributes:
+        prefix (str): Prefix of the namespace, as written in the sheet.
+        url (str): Base URI of the namespace.
+        ontology_info (str): URL or file path of the ontology Turtle file, or an empty string.
+    """
+    __slots__ = ("prefix", "url", "ontology_info")
+
+class EntityRecord(SheetRecord):
+    """
+    A row of the VariableDefinitions sheet.
+
+    Attributes:
+        name (str): Name of the variable.
+        ontology (str): Prefix of the ontology the variable belongs to, or an empty string for the ontology itself.
+        parent (str): Full name of the parent variable, or an empty string.
+        definition (str): Definition of the variable.
+        alt_names (tuple): Alternative names, split on commas.
+        unit (str): Unit of the variable as prefix:unit, or an empty string.
+        full_name (str): Full name of the variable, used to reference it from other rows.
+    """
+    __slots__ = ("name", "ontology", "parent", "definition", "alt_names", "unit", "full_name")
+
+class RelationshipRecord(SheetRecord):
+    """
+    A row of the RelationshipDefinitions sheet.
+
+    Attributes:
+        name (str): Name of the relationship.
+        ontology (str): Prefix of the ontology the relationship belongs to, or an empty string for the ontology itself.
+        domain (str): Full name of the variable the relationship starts from.
+        range (str): Full name of the variable the relationship goes to.
+        definition (str): Definition of the relationship.
+        alt_names (tuple): Alternative names, split on commas.
+        full_name (str): Full name of the relationship.
+    """
+    __slots__ = ("name", "ontology", "domain", "range", "definition", "alt_names", "full_name")
+
+class ValueTypeRecord(SheetRecord):
+    """
+    A row of the ValueTypeDefinitions sheet.
+
+    Attributes:
+        name (str): Name of the value type.
+        ontology (str): Prefix of the ontology the value type belongs to, or an empty string for the ontology itself.
+        domain (str): Full name of the variable the value type is attached to.
+        range (str): XSD datatype of the value type, e.g. xsd:float.
+        definition (str): Definition of the value type.
+        alt_names (tuple): Alternative names, split on commas.
+        full_name (str): Full name of the value type.
+    """
+    __slots__ = ("name", "ontology", "domain", "range", "definition", "alt_names", "full_name")
+
+def read_sheet_records(path, record_class, columns):
+    """
+    Reads the rows of a FAIR sheet into records in a single pass. The description row below the header and blank rows are skipped.
+
+    Args:
+        path (pathlib.Path): Path to the CSV sheet.
+        record_class (type): The SheetRecord subclass created for every row.
+        columns (tuple): The sheet column read into each field of the record, in the order of the record's __slots__.
+            The "Alternative Name(s)" column is split on commas into a tuple.
+
+    Returns:
+        list: The records of all rows of the sheet.
+
+    Raises:
+        KeyError: If one of the columns is missing from the sheet.
+    """
+    with open(path, newline='') as sheet_file:
+        csv_reader = csv.reader(sheet_file)
+        rows = (row for row in csv_reader if row)
+        header = next(rows, [])
+        positions = {column: index for index, column in enumerate(header)}
+        indices = [positions[column] for column in columns]
+        alt_names_position = columns.index("Alternative Name(s)") if "Alternative Name(s)" in columns else None
+        next(rows, None)
+
+        records = []
+        for row in rows:
+            row_length = len(row)
+            values = [row[index] if index < row_length else "" for index in indices]
+            if alt_names_position is not None:
+                values[alt_names_position] = tuple(values[alt_names_position].strip().split(","))
+            records.append(record_class(*values))
+        return records
+
+def read_ontology_info(path):
+    """
+    Reads the OntologyInfo sheet.
+
+    Args:
+        path (pathlib.Path): Path to the OntologyInfo CSV sheet.
+
+    Returns:
+        OntologyInfoRecord: The metadata of the ontology.
+    """
+    with open(path, 'r') as onto_info_file:
+        ontology_metadata = list(csv.reader(onto_info_file))
+    return OntologyInfoRecord(*(ontology_metadata[index][1] for index in range(5)))
+
+def read_namespaces(path):
+    """
+    Reads the NameSpace sheet.
+
+    Args:
+        path (pathlib.Path): Path to the NameSpace CSV sheet.
+
+    Returns:
+        list: A NamespaceRecord for every row of the sheet.
+    """
+    return read_sheet_records(path, NamespaceRecord, ("Prefix Name", "Ontology URL", "Ontology Info"))
+
+def read_entities(path):
+    """
+    Reads the VariableDefinitions sheet.
+
+    Args:
+        path (pathlib.Path): Path to the VariableDefinitions CSV sheet.
+
+    Returns:
+        list: An EntityRecord for every row of the sheet.
+    """
+    return read_sheet_records(path, EntityRecord, (
+        "Variable Name", "Belongs to Ontology", "Parent Variable", "Definition of Variable", "Alternative Name(s)", "Unit", "fullName"
+    ))
+
+def read_relationships(path):
+    """
+    Reads the RelationshipDefinitions sheet.
+
+    Args:
+        path (pathlib.Path): Path to the RelationshipDefinitions CSV sheet.
+
+    Returns:
+        list: A RelationshipRecord for every row of the sheet.
+    """
+    return read_sheet_records(path, RelationshipRecord, (
+        "Relationship Name", "Belongs to Ontology", "Domain", "Range", "Definition", "Alternative Name(s)", "fullName"
+    ))
+
+def read_value_types(path):
+    """
+    Reads the ValueTypeDefinitions sheet.
+
+    Args:
+        path (pathlib.Path): Path to the ValueTypeDefinitions CSV sheet.
+
+    Returns:
+        list: A ValueTypeRecord for every row of the sheet.
+    """
+    return read_sheet_records(path, ValueTypeRecord, (
+        "ValueType Name", "Belongs to Ontology", "Domain", "Range", "Definition of Property", "Alternative Name(s)", "fullName"
+    ))
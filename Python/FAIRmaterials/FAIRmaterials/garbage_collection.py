@@ -0,0 +1,33 @@
+from contextlib import contextmanager
+import gc
+import threading
+
+# Garbage collection is a process-wide switch, while bulk inserts pause it from the main thread, the graph saver
+# threads and the render pool at the same time. The pauses are counted under this lock, so that collection is only
+# enabled again when the last pause ends, and only if it was enabled when the first pause began.
+_lock = threading.Lock()
+_pauses = 0
+_was_enabled = False
+
+@contextmanager
+def paused_garbage_collection():
+    """
+    Pauses garbage collection for a bulk insert of terms that never form reference cycles, e.g. triples added to an
+    RDFLib graph. The indexes of the graph store create many small objects, which otherwise trigger collections that
+    traverse the whole graph; pausing them makes large inserts about a quarter faster.
+
+    Pauses can be nested and overlap across threads.
+    """
+    global _pauses, _was_enabled
+    with _lock:
+        if _pauses == 0:
+            _was_enabled = gc.isenabled()
+            gc.disable()
+        _pauses += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _pauses -= 1
+            if _pauses == 0 and _was_enabled:
+                gc.enable()
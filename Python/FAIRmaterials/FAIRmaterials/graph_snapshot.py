@@ -0,0 +1,284 @@
+import os
+import numpy as np
+from rdflib import Graph as rdfGraph, URIRef, BNode, Literal
+from FAIRmaterials.garbage_collection import paused_garbage_collection
+
+class GraphSnapshot:
+    """
+    A compact binary snapshot of an RDFLib graph, stored with NumPy.
+
+    Every distinct term of the graph is stored once in a term dictionary: the UTF-8 texts of all terms in one byte
+    array with their offsets, the kind of every term, and the datatype and language of literals. The triples are an
+    array of term indexes with three columns, int32 unless the dictionary needs int64. The namespace bindings of the
+    graph are kept as well.
+
+    A snapshot is saved either as a single ``.npz`` file or as a folder with one ``.npy`` file per array, which can
+    be memory-mapped so that only the parts that are read are loaded. Loading a snapshot only reads arrays, so it is
+    much faster than parsing Turtle. The snapshot can be turned back into an RDFLib graph with to_graph(), or queried
+    directly with triples(), which compares term indexes without creating a graph.
+
+    Attributes:
+        __arrays (dict): Dictionary of the array names and the arrays of the snapshot.
+        __terms (list): All decoded terms, created on first use by get_terms().
+        __decoded_terms (dict): Dictionary of the indexes and terms decoded one at a time by get_term().
+        __text_ids (dict): Dictionary of the kinds and UTF-8 texts of terms and their indexes, created on first use.
+    """
+
+    FORMAT_VERSION = 1
+    URI, BLANK_NODE, LITERAL = 0, 1, 2
+    ARRAYS = ("format_version", "term_text", "term_offsets", "term_kinds", "term_datatypes", "term_languages", "languages", "triples", "namespace_prefixes", "namespace_uris")
+
+    def __init__(self, arrays):
+        """
+        Initializes the GraphSnapshot object from its arrays, use from_graph() or load() to create a snapshot.
+
+        Args:
+            arrays (dict): Dictionary of the array names and the arrays of the snapshot.
+
+        Raises:
+            ValueError: If arrays are missing or the snapshot was written in an unsupported format version.
+        """
+        missing = [name for name in self.ARRAYS if name not in arrays]
+        if missing:
+            raise ValueError(f"The snapshot is missing the arrays {', '.join(missing)}")
+        if int(arrays["format_version"][0]) != self.FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format version {int(arrays['format_version'][0])}")
+        self.__arrays = arrays
+        self.__terms = None
+        self.__decoded_terms = {}
+        self.__text_ids = None
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Creates a snapshot of an RDFLib graph.
+
+        Args:
+            graph (rdflib.Graph): The graph to snapshot.
+
+        Returns:
+            GraphSnapshot: The snapshot of the graph.
+        """
+        term_ids = {}
+        texts = []
+        kinds = []
+        datatypes = []
+        term_languages = []
+        language_ids = {}
+
+        def get_id(term):
+            term_id = term_ids.get(term)
+            if term_id is not None:
+                return term_id
+            datatype = -1
+            language = -1
+            if isinstance(term, Literal):
+                kind = cls.LITERAL
+                if term.datatype is not None:
+                    datatype = get_id(term.datatype)
+                if term.language is not None:
+                    language = language_ids.setdefault(term.language, len(language_ids))
+            elif isinstance(term, BNode):
+                kind = cls.BLANK_NODE
+            else:
+                kind = cls.URI
+            term_id = term_ids[term] = len(texts)
+            texts.append(str(term).encode("utf-8"))
+            kinds.append(kind)
+            datatypes.append(datatype)
+            term_languages.append(language)
+            return term_id
+
+        triples = [get_id(term) for triple in graph for term in triple]
+        index_type = np.int32 if len(texts) <= np.iinfo(np.int32).max else np.int64
+        offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum([len(text) for text in texts], out=offsets[1:])
+        namespaces = list(graph.namespaces())
+        return cls({
+            "format_version": np.array([cls.FORMAT_VERSION], dtype=np.int32),
+            "term_text": np.frombuffer(b"".join(texts), dtype=np.uint8),
+            "term_offsets": offsets,
+            "term_kinds": np.array(kinds, dtype=np.int8),
+            "term_datatypes": np.array(datatypes, dtype=index_type),
+            "term_languages": np.array(term_languages, dtype=np.int32),
+            "languages": np.array(list(language_ids), dtype=str),
+            "triples": np.array(triples, dtype=index_type).reshape(-1, 3),
+            "namespace_prefixes": np.array([prefix for prefix, _ in namespaces], dtype=str),
+            "namespace_uris": np.array([str(namespace) for _, namespace in namespaces], dtype=str),
+        })
+
+    def save(self, file_path, compress=False):
+        """
+        Saves the snapshot as a ``.npz`` file, or as a folder of ``.npy`` files that can be memory-mapped.
+
+        Args:
+            file_path (str): Path of the ``.npz`` file, or of the folder for any other path.
+            compress (bool): Whether to compress the ``.npz`` file, which makes loading slower.
+
+        Returns:
+            str: The path of the saved file or folder.
+        """
+        if str(file_path).endswith(".npz"):
+            save = np.savez_compressed if compress else np.savez
+            # Written under a temporary name first so that a reader never sees a partial snapshot
+            temp_path = f"{file_path}.{os.getpid()}.tmp.npz"
+            save(temp_path, **self.__arrays)
+            os.replace(temp_path, file_path)
+        else:
+            os.makedirs(file_path, exist_ok=True)
+            for name in self.ARRAYS:
+                np.save(os.path.join(file_path, f"{name}.npy"), self.__arrays[name], allow_pickle=False)
+        return str(file_path)
+
+    @classmethod
+    def load(cls, file_path, mmap=True):
+        """
+        Loads a snapshot saved with save().
+
+        Args:
+            file_path (str): Path of the ``.npz`` file or of the folder of ``.npy`` files.
+            mmap (bool): Whether to memory-map the arrays of a folder instead of reading them; ``.npz`` files are always read.
+
+        Returns:
+            GraphSnapshot: The loaded snapshot.
+        """
+        if str(file_path).endswith(".npz"):
+            with np.load(file_path, allow_pickle=False) as arrays:
+                return cls({name: arrays[name] for name in arrays.files})
+        return cls({
+            name: np.load(os.path.join(file_path, f"{name}.npy"), mmap_mode="r" if mmap else None, allow_pickle=False)
+            for name in cls.ARRAYS
+        })
+
+    def __len__(self):
+        return len(self.__arrays["triples"])
+
+    def get_terms(self):
+        """
+        Gets the terms of the term dictionary
+
+        Returns:
+            list: The RDFLib terms, in the order of their indexes.
+        """
+        if self.__terms is None:
+            arrays = self.__arrays
+            data = arrays["term_text"].tobytes()
+            offsets = arrays["term_offsets"].tolist()
+            texts = [data[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+            languages = arrays["languages"].tolist()
+            terms = [None] * len(texts)
+            kinds = arrays["term_kinds"].tolist()
+            datatypes = arrays["term_datatypes"].tolist()
+            term_languages = arrays["term_languages"].tolist()
+            for term_id, (text, kind) in enumerate(zip(texts, kinds)):
+                if kind == self.URI:
+                    terms[term_id] = URIRef(text)
+                elif kind == self.BLANK_NODE:
+                    terms[term_id] = BNode(text)
+            # Datatypes are URIs, which are all created above
+            for term_id, kind in enumerate(kinds):
+                if kind == self.LITERAL:
+                    datatype = terms[datatypes[term_id]] if datatypes[term_id] >= 0 else None
+                    language = languages[term_languages[term_id]] if term_languages[term_id] >= 0 else None
+                    terms[term_id] = Literal(texts[term_id], lang=language, datatype=datatype)
+            self.__terms = terms
+        return self.__terms
+
+    def get_term(self, term_id):
+        """
+        Gets a single term of the term dictionary, decoding only that term.
+
+        Args:
+            term_id (int): The index of the term.
+
+        Returns:
+            rdflib.term.Node: The term.
+        """
+        if self.__terms is not None:
+            return self.__terms[term_id]
+        term = self.__decoded_terms.get(term_id)
+        if term is None:
+            arrays = self.__arrays
+            text = arrays["term_text"][arrays["term_offsets"][term_id]:arrays["term_offsets"][term_id + 1]].tobytes().decode("utf-8")
+            kind = arrays["term_kinds"][term_id]
+            if kind == self.URI:
+                term = URIRef(text)
+            elif kind == self.BLANK_NODE:
+                term = BNode(text)
+            else:
+                datatype = int(arrays["term_datatypes"][term_id])
+                language = int(arrays["term_languages"][term_id])
+                term = Literal(text, lang=str(arrays["languages"][language]) if language >= 0 else None, datatype=self.get_term(datatype) if datatype >= 0 else None)
+            self.__decoded_terms[term_id] = term
+        return term
+
+    def get_term_id(self, term):
+        """
+        Gets the index of a term in the term dictionary.
+
+        Args:
+            term (rdflib.term.Node): The term to look up.
+
+        Returns:
+            int: The index of the term, or None if the snapshot does not contain it.
+        """
+        if self.__text_ids is None:
+            # Terms are found by their texts, so a lookup does not decode the whole dictionary
+            data = self.__arrays["term_text"].tobytes()
+            offsets = self.__arrays["term_offsets"].tolist()
+            self.__text_ids = {}
+            for term_id, (kind, start, end) in enumerate(zip(self.__arrays["term_kinds"].tolist(), offsets, offsets[1:])):
+                self.__text_ids.setdefault((kind, data[start:end]), []).append(term_id)
+        if isinstance(term, Literal):
+            kind = self.LITERAL
+        elif isinstance(term, BNode):
+            kind = self.BLANK_NODE
+        else:
+            kind = self.URI
+        for term_id in self.__text_ids.get((kind, str(term).encode("utf-8")), ()):
+            # Literals with the same text can differ in their datatype or language
+            if kind != self.LITERAL or self.get_term(term_id) == term:
+                return term_id
+        return None
+
+    def triples(self, pattern=(None, None, None)):
+        """
+        Finds the triples matching a pattern without creating an RDFLib graph.
+
+        Args:
+            pattern (tuple): Subject, predicate and object to match, where None matches any term.
+
+        Returns:
+            list: The matching triples of RDFLib terms.
+        """
+        triples = self.__arrays["triples"]
+        mask = np.ones(len(triples), dtype=bool)
+        for column, term in enumerate(pattern):
+            if term is None:
+                continue
+            term_id = self.get_term_id(term)
+            if term_id is None:
+                return []
+            mask &= triples[:, column] == term_id
+        get_term = self.get_term
+        return [(get_term(subject), get_term(predicate), get_term(obj)) for subject, predicate, obj in triples[mask].tolist()]
+
+    def to_graph(self, graph=None):
+        """
+        Adds the triples and namespace bindings of the snapshot to an RDFLib graph.
+
+        Args:
+            graph (rdflib.Graph): The graph to add the triples to (Optional, defaults to a new graph).
+
+        Returns:
+            rdflib.Graph: The graph with the triples of the snapshot.
+        """
+        if graph is None:
+            graph = rdfGraph()
+        for prefix, namespace in zip(self.__arrays["namespace_prefixes"].tolist(), self.__arrays["namespace_uris"].tolist()):
+            graph.bind(prefix, URIRef(namespace), override=True, replace=True)
+        terms = self.get_terms()
+        # The same bulk insert as FairSheetParser
+        with paused_garbage_collection():
+            graph.addN((terms[subject], terms[predicate], terms[obj], graph) for subject, predicate, obj in self.__arrays["triples"].tolist())
+        return graph
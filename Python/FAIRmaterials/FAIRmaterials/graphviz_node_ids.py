@@ -0,0 +1,85 @@
+import re
+import warnings
+
+class GraphvizNodeIds:
+    """
+    Maps URIs and other node keys to Graphviz node IDs.
+
+    Node IDs are the keys with every character that is not a word character or whitespace removed. Each key is
+    sanitized only once and the result is memoized, so the IDs of entities referenced by many rows are looked up
+    instead of being recomputed. Two distinct keys that sanitize to the same ID would silently merge their nodes, so
+    such collisions are reported with a warning and the later key gets a numbered ID instead.
+
+    Attributes:
+        __node_ids (dict): Dictionary of keys and their node IDs.
+        __keys (dict): Dictionary of node IDs and the key they were assigned to.
+    """
+
+    PATTERN = re.compile(r'[^\w\s]')
+
+    def __init__(self):
+        """
+        Initializes the GraphvizNodeIds object with no assigned node IDs.
+        """
+        self.__node_ids = {}
+        self.__keys = {}
+
+    def get(self, key):
+        """
+        Gets the node ID of a key, assigning one if the key was not seen before.
+
+        Args:
+            key (str): URI or other string identifying the node.
+
+        Returns:
+            str: The Graphviz node ID of the key.
+        """
+        node_id = self.__node_ids.get(key)
+        if node_id is None:
+            # URIRefs do not compare equal to strings, so the key's text is looked up before assigning a new ID
+            text = str(key)
+            node_id = self.__node_ids.get(text)
+            if node_id is None:
+                node_id = self.__assign(text)
+            self.__node_ids[key] = node_id
+        return node_id
+
+    def find(self, key):
+        """
+        Gets the node ID of a key without assigning one.
+
+        Args:
+            key (str): URI or other string identifying the node.
+
+        Returns:
+            str: The Graphviz node ID of the key, or None if the key was not seen before.
+        """
+        node_id = self.__node_ids.get(key)
+        if node_id is None:
+            node_id = self.__node_ids.get(str(key))
+        return node_id
+
+    def __assign(self, key):
+        """
+        Sanitizes a new key and makes its node ID unique.
+        """
+        node_id = self.PATTERN.sub('', key)
+        if node_id in self.__keys:
+            colliding_key = self.__keys[node_id]
+            suffix = 2
+            while f"{node_id}_{suffix}" in self.__keys:
+                suffix += 1
+            warnings.warn(f"The Graphviz node IDs of {colliding_key} and {key} are both {node_id}, using {node_id}_{suffix} for {key}")
+            node_id = f"{node_id}_{suffix}"
+        self.__keys[node_id] = key
+        self.__node_ids[key] = node_id
+        return node_id
+
+    def get_collisions(self):
+        """
+        Gets the keys whose node ID was changed because of a collision
+
+        Returns:
+            dict: A dictionary of the keys and their numbered node IDs.
+        """
+        return {key: node_id for node_id, key in self.__keys.items() if node_id != self.PATTERN.sub('', key)}
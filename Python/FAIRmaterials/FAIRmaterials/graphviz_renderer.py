@@ -0,0 +1,334 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import re
+import subprocess
+import warnings
+from rdflib.namespace import RDF, RDFS, OWL
+from FAIRmaterials.graphviz_node_ids import GraphvizNodeIds
+from FAIRmaterials.profiler import profile_stage
+
+class GraphvizRenderer:
+    """
+    A class to render Graphviz graphs of any size within a bounded time.
+
+    Small graphs are laid out with dot and rendered as PNG, like before. The dot layout does not scale to thousands
+    of nodes, so graphs above the node or edge threshold are laid out with a force-directed engine (sfdp or neato)
+    and rendered as SVG, which stays readable at any zoom level. Every layout runs in its own Graphviz process that is
+    stopped after the timeout.
+
+    Large ontologies can also be split into one diagram per namespace or per subtree of a top-level class. Every class
+    is assigned to one partition; the property, subclass and unit boxes attached to its classes are drawn with it,
+    together with the classes on the other side of those boxes, so that links into other partitions stay visible. The
+    partitions are laid out independently and in parallel.
+
+    Attributes:
+        __node_threshold (int): Number of nodes above which the large graph engine is used.
+        __edge_threshold (int): Number of edges above which the large graph engine is used.
+        __large_engine (str): Layout engine of graphs above a threshold, "sfdp" or "neato".
+        __timeout (float): Time in seconds a single layout may take, or None for no limit.
+        __partition_by (str): How diagrams are split, "namespace", "subtree" or None for a single diagram.
+        __max_workers (int): Number of partitions laid out at the same time, or None for the default of ThreadPoolExecutor.
+    """
+
+    LARGE_ENGINES = ("sfdp", "neato")
+    PARTITIONS = ("namespace", "subtree")
+    DEFAULT_NODE_THRESHOLD = 1000
+    DEFAULT_EDGE_THRESHOLD = 2000
+    DEFAULT_TIMEOUT = 300
+
+    # Node and edge statements of a graph body as written by the graphviz package, e.g. '\tA [label=A]' and '\tA -> "B C"'
+    ID = r'"(?:[^"\\]|\\.)*"|[^\s"\[\]]+'
+    EDGE = re.compile(rf'^\t({ID}) -[->] ({ID})(?:\s|$)')
+    NODE = re.compile(rf'^\t({ID})(?: \[|\s*$)')
+    # Characters replaced in the file names of partitions
+    FILE_NAME = re.compile(r'[^\w-]')
+    # Unquoted keywords start attribute statements instead of nodes
+    KEYWORDS = {"graph", "node", "edge", "subgraph", "strict", "digraph"}
+
+    def __init__(self, node_threshold=DEFAULT_NODE_THRESHOLD, edge_threshold=DEFAULT_EDGE_THRESHOLD, large_engine="sfdp", timeout=DEFAULT_TIMEOUT, partition_by=None, max_workers=None):
+        """
+        Initializes the GraphvizRenderer object.
+
+        Args:
+            node_threshold (int): Number of nodes above which the large graph engine is used.
+            edge_threshold (int): Number of edges above which the large graph engine is used.
+            large_engine (str): Layout engine of graphs above a threshold, "sfdp" or "neato".
+            timeout (float): Time in seconds a single layout may take, or None for no limit.
+            partition_by (str): How diagrams are split, "namespace", "subtree" or None for a single diagram.
+            max_workers (int): Number of partitions laid out at the same time (Optional).
+
+        Raises:
+            ValueError: If the engine or the partitioning is unknown, or a threshold or the timeout is not positive.
+        """
+        if large_engine not in self.LARGE_ENGINES:
+            raise ValueError(f"Unknown large graph engine {large_engine}, expected one of {', '.join(self.LARGE_ENGINES)}")
+        if partition_by is not None and partition_by not in self.PARTITIONS:
+            raise ValueError(f"Unknown partitioning {partition_by}, expected one of {', '.join(self.PARTITIONS)}")
+        if node_threshold < 1 or edge_threshold < 1 or (timeout is not None and timeout <= 0):
+            raise ValueError("The thresholds and the timeout must be positive")
+        self.__node_threshold = node_threshold
+        self.__edge_threshold = edge_threshold
+        self.__large_engine = large_engine
+        self.__timeout = timeout
+        self.__partition_by = partition_by
+        self.__max_workers = max_workers
+
+    def get_partition_by(self):
+        """
+        Gets how diagrams are split
+
+        Returns:
+            str: "namespace", "subtree" or None for a single diagram.
+        """
+        return self.__partition_by
+
+    def get_options(self):
+        """
+        Gets the options that change the rendered diagrams, used in the build manifest.
+
+        Returns:
+            dict: A dictionary of the thresholds, the large graph engine and the partitioning.
+        """
+        return {
+            "node_threshold": self.__node_threshold,
+            "edge_threshold": self.__edge_threshold,
+            "large_engine": self.__large_engine,
+            "partition_by": self.__partition_by
+        }
+
+    @classmethod
+    def parse_body(cls, body):
+        """
+        Parses the statements of a Graphviz graph body.
+
+        Args:
+            body (list): The body lines of a graphviz.Digraph.
+
+        Returns:
+            list: A tuple (kind, node IDs, line) for every line, where kind is "node", "edge" or "other" and the node IDs are quoted as in the body.
+        """
+        statements = []
+        for line in body:
+            match = cls.EDGE.match(line)
+            if match is not None:
+                statements.append(("edge", match.groups(), line))
+                continue
+            match = cls.NODE.match(line)
+            if match is not None and match.group(1) not in cls.KEYWORDS:
+                statements.append(("node", match.groups(), line))
+            else:
+                statements.append(("other", (), line))
+        return statements
+
+    @classmethod
+    def count(cls, statements):
+        """
+        Counts the nodes and edges of parsed body statements.
+
+        Args:
+            statements (list): The statements returned by parse_body().
+
+        Returns:
+            tuple: The number of distinct nodes, including nodes only named by edges, and the number of edges.
+        """
+        nodes = set()
+        edges = 0
+        for kind, node_ids, _ in statements:
+            nodes.update(node_ids)
+            edges += kind == "edge"
+        return len(nodes), edges
+
+    def get_engine(self, nodes, edges):
+        """
+        Gets the layout engine and output format for a graph of the given size.
+
+        Args:
+            nodes (int): Number of nodes of the graph.
+            edges (int): Number of edges of the graph.
+
+        Returns:
+            tuple: The layout engine and the output format.
+        """
+        if nodes > self.__node_threshold or edges > self.__edge_threshold:
+            return self.__large_engine, "svg"
+        return "dot", "png"
+
+    def render(self, graphviz_graph, file_path, output_format=None):
+        """
+        Lays out and renders a Graphviz graph with the engine that fits its size.
+
+        Args:
+            graphviz_graph (graphviz.Digraph): The graph to render.
+            file_path (str): Path of the rendered file without its extension.
+            output_format (str): Output format overriding the one chosen for the size of the graph (Optional).
+
+        Returns:
+            str: The file path of the rendered file.
+
+        Raises:
+            graphviz.backend.ExecutableNotFound: If the Graphviz executable of the engine is not installed.
+            subprocess.CalledProcessError: If Graphviz fails to render the graph.
+            TimeoutError: If the layout takes longer than the timeout.
+        """
+        nodes, edges = self.count(self.parse_body(graphviz_graph.body))
+        engine, default_format = self.get_engine(nodes, edges)
+        output_format = output_format or default_format
+        output_path = f"{file_path}.{output_format}"
+        command = [engine, f"-T{output_format}", "-o", output_path]
+        if engine != "dot":
+            # Force-directed layouts place nodes on top of each other unless overlaps are removed
+            command.append("-Goverlap=false")
+
+        with profile_stage("render_graphviz", engine=engine, nodes=nodes, edges=edges):
+            try:
+                subprocess.run(command, input=graphviz_graph.source.encode("utf-8"), capture_output=True, timeout=self.__timeout, check=True)
+            except FileNotFoundError as e:
+                import graphviz
+                raise graphviz.backend.ExecutableNotFound(command) from e
+            except subprocess.TimeoutExpired as e:
+                raise TimeoutError(f"The {engine} layout of {output_path} with {nodes} nodes and {edges} edges did not finish within {self.__timeout} seconds") from e
+        return output_path
+
+    def get_partitions(self, graphviz_graph, rdflib_graph, graphviz_node_ids=None):
+        """
+        Splits a Graphviz graph into one graph per namespace or per top-level class subtree.
+
+        The classes of the RDFLib graph are assigned to the partitions and found in the Graphviz graph by their node
+        IDs. Nodes that are not attached to any class, e.g. of an ontology without classes, are drawn in the "other"
+        partition.
+
+        Args:
+            graphviz_graph (graphviz.Digraph): The graph to split.
+            rdflib_graph (rdflib.Graph): The RDFLib graph the Graphviz graph was created from.
+            graphviz_node_ids (GraphvizNodeIds): The node IDs the Graphviz graph was created with, including those renamed after a collision (Optional, the class URIs are sanitized again otherwise).
+
+        Returns:
+            dict: A dictionary of the partition names and their graphs, sorted by name.
+        """
+        from graphviz import quoting
+
+        class_partitions = self.__get_class_partitions(rdflib_graph)
+        get_node_id = graphviz_node_ids.find if graphviz_node_ids is not None else GraphvizNodeIds().get
+        core = {}
+        for class_uri, partition in class_partitions.items():
+            node_id = get_node_id(class_uri)
+            if node_id is not None:
+                core[quoting.quote(node_id)] = partition
+
+        statements = self.parse_body(graphviz_graph.body)
+        neighbours = defaultdict(set)
+        for kind, statement_ids, _ in statements:
+            if kind == "edge":
+                tail, head = statement_ids
+                neighbours[tail].add(head)
+                neighbours[head].add(tail)
+
+        # Boxes attached to a class are drawn with its partition, together with every node the boxes link to
+        attached = defaultdict(set)
+        for node_id, partition in core.items():
+            for neighbour in neighbours[node_id]:
+                if neighbour not in core:
+                    attached[partition].add(neighbour)
+        members = {partition: {node_id for node_id, node_partition in core.items() if node_partition == partition} for partition in set(core.values())}
+        drawn = {}
+        for partition, node_ids_of_partition in members.items():
+            drawn[partition] = node_ids_of_partition | attached[partition]
+            for box in attached[partition]:
+                drawn[partition] |= neighbours[box]
+
+        all_nodes = set(neighbours) | {statement_ids[0] for kind, statement_ids, _ in statements if kind == "node"}
+        other = all_nodes - set().union(*drawn.values()) if drawn else all_nodes
+        if other:
+            # A namespace bound to the prefix "other" keeps its classes, the nodes are added to its partition
+            members.setdefault("other", set()).update(other)
+            attached["other"] |= other
+            drawn["other"] = drawn.get("other", set()) | other
+
+        partitions = {}
+        for partition in sorted(drawn):
+            # Edges between two nodes that are only drawn for context belong to another partition
+            owned = members[partition] | attached[partition]
+            body = []
+            for kind, statement_ids, line in statements:
+                if kind == "other":
+                    body.append(line)
+                elif kind == "node" and statement_ids[0] in drawn[partition]:
+                    body.append(line)
+                elif kind == "edge" and all(node_id in drawn[partition] for node_id in statement_ids) and any(node_id in owned for node_id in statement_ids):
+                    body.append(line)
+            partition_graph = graphviz_graph.copy()
+            partition_graph.body = body
+            partitions[partition] = partition_graph
+        return partitions
+
+    def render_partitions(self, graphviz_graph, rdflib_graph, file_path, graphviz_node_ids=None):
+        """
+        Renders one SVG diagram per partition of a Graphviz graph, laying out the partitions in parallel.
+
+        Partitions that fail to render or exceed the timeout are reported with a warning and have no file path.
+
+        Args:
+            graphviz_graph (graphviz.Digraph): The graph to split and render.
+            rdflib_graph (rdflib.Graph): The RDFLib graph the Graphviz graph was created from.
+            file_path (str): Path the file names of the partitions start with.
+            graphviz_node_ids (GraphvizNodeIds): The node IDs the Graphviz graph was created with (Optional).
+
+        Returns:
+            dict: A dictionary of the partition names and the file paths of their diagrams, or None for partitions that failed.
+
+        Raises:
+            graphviz.backend.ExecutableNotFound: If the Graphviz executables are not installed.
+        """
+        import graphviz
+
+        partitions = self.get_partitions(graphviz_graph, rdflib_graph, graphviz_node_ids)
+        with ThreadPoolExecutor(max_workers=self.__max_workers, thread_name_prefix="graphviz-renderer") as executor:
+            futures = {
+                partition: executor.submit(contextvars.copy_context().run, self.render, partition_graph, f"{file_path}_{self.FILE_NAME.sub('_', partition)}", "svg")
+                for partition, partition_graph in partitions.items()
+            }
+        file_paths = {}
+        for partition, future in futures.items():
+            try:
+                file_paths[partition] = future.result()
+            except graphviz.backend.ExecutableNotFound:
+                raise
+            except (TimeoutError, subprocess.CalledProcessError) as e:
+                warnings.warn(f"Failed to render the {partition} partition of the Graphviz graph: {e}")
+                file_paths[partition] = None
+        return file_paths
+
+    def __get_class_partitions(self, rdflib_graph):
+        """
+        Assigns every class of an RDFLib graph to the partition of its namespace or of its top-level class.
+        """
+        namespaces = sorted(((str(namespace), prefix) for prefix, namespace in rdflib_graph.namespaces()), key=lambda item: -len(item[0]))
+
+        def get_qname(uri):
+            for namespace, prefix in namespaces:
+                if uri.startswith(namespace) and len(uri) > len(namespace):
+                    return prefix, uri[len(namespace):]
+            namespace, _, local_name = uri.rpartition("#") if "#" in uri else uri.rpartition("/")
+            return "", local_name
+
+        classes = set(rdflib_graph.subjects(RDF.type, OWL.Class))
+        if self.__partition_by == "namespace":
+            return {class_uri: get_qname(str(class_uri))[0] or "default" for class_uri in classes}
+
+        parents = {}
+        for class_uri in classes:
+            parent = next((parent for parent in rdflib_graph.objects(class_uri, RDFS.subClassOf) if parent in classes), None)
+            if parent is not None:
+                parents[class_uri] = parent
+        class_partitions = {}
+        for class_uri in classes:
+            root = class_uri
+            seen = {root}
+            # Subclass cycles end at the first class seen twice
+            while root in parents and parents[root] not in seen:
+                root = parents[root]
+                seen.add(root)
+            prefix, local_name = get_qname(str(root))
+            class_partitions[class_uri] = f"{prefix}_{local_name}" if prefix else local_name
+        return class_partitions
@@ -0,0 +1,137 @@
+import json
+import re
+from rdflib import URIRef, BNode
+from rdflib.namespace import RDF
+
+class JSONLDWriter:
+    """
+    A class to write an RDFLib graph as compacted JSON-LD without going through RDFLib's generic JSON-LD serializer.
+
+    The writer groups all triples by subject in one pass over the graph and writes one node object per subject into the
+    "@graph" array. IRIs are compacted with the prefixes of the context, rdf:type becomes "@type" and literals become
+    plain strings or value objects, which covers the shape of the ontologies FAIRmaterials emits. The output is
+    equivalent to the graph for any input.
+
+    Attributes:
+        __rdflib_graph (rdflib.Graph): The RDFLib graph to write.
+        __context (dict): Dictionary of prefixes and their namespace URIs, written as the "@context" of the document.
+        __prefixes (dict): Dictionary of the namespace URIs usable for compacting IRIs and their prefixes.
+        __compact_iris (dict): Dictionary of IRIs and their compacted form.
+    """
+
+    # A prefix can only be used in compact IRIs if its namespace ends with one of the JSON-LD gen-delim characters
+    GEN_DELIMS = (":", "/", "?", "#", "[", "]", "@")
+    GEN_DELIM_PATTERN = re.compile(r"[:/?#\[\]@]")
+
+    def __init__(self, rdflib_graph, context=None):
+        """
+        Initializes the JSONLDWriter object.
+
+        Args:
+            rdflib_graph (rdflib.Graph): The RDFLib graph to write.
+            context (dict): Dictionary of prefixes and their namespace URIs (Optional, defaults to the namespaces bound in the graph).
+        """
+        if context is None:
+            context = {prefix: str(namespace) for prefix, namespace in rdflib_graph.namespaces()}
+        self.__rdflib_graph = rdflib_graph
+        self.__context = dict(sorted(context.items()))
+        self.__prefixes = {
+            namespace: prefix for prefix, namespace in self.__context.items()
+            if prefix and ":" not in prefix and not prefix.startswith("@") and namespace.endswith(self.GEN_DELIMS)
+        }
+        self.__compact_iris = {}
+
+    def compact_iri(self, iri):
+        """
+        Compacts an IRI with the longest matching namespace of the context.
+
+        Args:
+            iri (str): The full IRI.
+
+        Returns:
+            str: The compact IRI as prefix:suffix, or the full IRI if no prefix applies.
+        """
+        compact_iri = self.__compact_iris.get(iri)
+        if compact_iri is None:
+            # URIRef.startswith() does not take a start position, so the plain string is used
+            compact_iri = text = str(iri)
+            # Every namespace ends with a gen-delim, so the candidates are the IRI cut after each of them, longest first
+            for match in reversed(list(self.GEN_DELIM_PATTERN.finditer(text))):
+                prefix = self.__prefixes.get(text[:match.end()])
+                # A suffix starting with // would be read back as an absolute IRI with the prefix as its scheme
+                if prefix is not None and not text.startswith("//", match.end()):
+                    compact_iri = f"{prefix}:{text[match.end():]}"
+                    break
+            self.__compact_iris[iri] = compact_iri
+        return compact_iri
+
+    def get_node_objects(self):
+        """
+        Groups the triples of the graph by subject into compacted JSON-LD node objects.
+
+        Returns:
+            list: The node objects, sorted by their "@id".
+        """
+        subjects = {}
+        for subject, predicate, obj in self.__rdflib_graph:
+            subjects.setdefault(subject, {}).setdefault(predicate, []).append(obj)
+
+        node_objects = []
+        for subject, predicates in subjects.items():
+            node_object = {"@id": self.__compact_reference(subject)}
+            types = predicates.get(RDF.type)
+            if types is not None and all(isinstance(obj, (URIRef, BNode)) for obj in types):
+                del predicates[RDF.type]
+                node_object["@type"] = self.__single_or_list([self.__compact_reference(obj) for obj in types])
+            for key, values in sorted((self.compact_iri(predicate), objects) for predicate, objects in predicates.items()):
+                node_object[key] = self.__single_or_list([self.__compact_value(obj) for obj in values])
+            node_objects.append(node_object)
+        node_objects.sort(key=lambda node_object: node_object["@id"])
+        return node_objects
+
+    def write(self, stream):
+        """
+        Writes the graph as a JSON-LD document, one node object per line.
+
+        Args:
+            stream (io.TextIOBase): Text stream the document is written to.
+        """
+        stream.write('{\n  "@context": ')
+        stream.write(json.dumps(self.__context, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+        stream.write(',\n  "@graph": [')
+        separator = "\n    "
+        for node_object in self.get_node_objects():
+            stream.write(separator)
+            # Without indentation the node objects are encoded by the C implementation of the json module
+            stream.write(json.dumps(node_object, ensure_ascii=False))
+            separator = ",\n    "
+        stream.write("\n  ]\n}\n")
+
+    def __compact_reference(self, term):
+        """
+        Gets the "@id" of an IRI or blank node.
+        """
+        if isinstance(term, BNode):
+            return f"_:{term}"
+        return self.compact_iri(term)
+
+    def __compact_value(self, term):
+        """
+        Gets the compacted JSON-LD value of an object of a triple.
+        """
+        if isinstance(term, (URIRef, BNode)):
+            return {"@id": self.__compact_reference(term)}
+        if term.language is not None:
+            return {"@value": str(term), "@language": term.language}
+        if term.datatype is not None:
+            return {"@value": str(term), "@type": self.compact_iri(term.datatype)}
+        return str(term)
+
+    @staticmethod
+    def __single_or_list(values):
+        """
+        Gets a single value on its own and several values as a sorted list.
+        """
+        if len(values) == 1:
+            return values[0]
+        return sorted(values, key=lambda value: json.dumps(value, sort_keys=True))
@@ -0,0 +1,190 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import os
+import sys
+import threading
+import time
+try:
+    import resource
+except ImportError:
+    # The resource module is not available on Windows, where the peak RSS is not recorded
+    resource = None
+
+class Profiler:
+    """
+    A class to record the wall time, CPU time, peak memory and sizes of the stages of a run.
+
+    Stages are recorded with the stage() context manager and can be nested; every stage stores the path of the stages
+    it runs in. The stack of open stages is kept in a context variable, so stages opened in threads that run with a
+    copy of the caller's context are attributed to the caller's stage.
+
+    The package records its stages through profile_stage(), which does nothing unless a profiler was activated with
+    set_profiler(), so the instrumentation costs nothing in normal runs.
+
+    Attributes:
+        __stages (list): The recorded stages, in the order they finished.
+        __lock (threading.Lock): Lock guarding the list of stages, which are recorded from several threads.
+        __start (float): Wall clock time the profiler was created at.
+    """
+
+    def __init__(self):
+        self.__stages = []
+        self.__lock = threading.Lock()
+        self.__start = time.perf_counter()
+
+    @staticmethod
+    def get_peak_rss():
+        """
+        Gets the peak resident set size of the process so far.
+
+        Returns:
+            int: The peak resident set size in bytes, or None if the platform does not report it.
+        """
+        if resource is None:
+            return None
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+    @contextmanager
+    def stage(self, name, **counts):
+        """
+        Records a stage while the context is open.
+
+        Args:
+            name (str): Name of the stage.
+            **counts: Sizes and details known when the stage starts, e.g. the number of rows. More can be added to the yielded dictionary.
+
+        Yields:
+            dict: The counts of the stage, which the caller can update while the stage runs.
+        """
+        parents = _open_stages.get()
+        token = _open_stages.set(parents + (name,))
+        counts = dict(counts)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        peak_rss_start = self.get_peak_rss()
+        error = None
+        try:
+            yield counts
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            wall_seconds = time.perf_counter() - wall_start
+            cpu_seconds = time.process_time() - cpu_start
+            peak_rss = self.get_peak_rss()
+            _open_stages.reset(token)
+            record = {
+                "name": name,
+                "path": "/".join(parents + (name,)),
+                "pid": os.getpid(),
+                "thread": threading.current_thread().name,
+                "start_seconds": wall_start - self.__start,
+                "wall_seconds": wall_seconds,
+                "cpu_seconds": cpu_seconds,
+                "peak_rss_bytes": peak_rss,
+                "peak_rss_increase_bytes": peak_rss - peak_rss_start if peak_rss is not None else None,
+                "counts": counts
+            }
+            if error is not None:
+                record["error"] = error
+            with self.__lock:
+                self.__stages.append(record)
+
+    def add_stages(self, stages):
+        """
+        Adds stages recorded by another profiler, e.g. in a worker process, as children of the currently open stages.
+
+        Args:
+            stages (list): The stages returned by get_stages() of the other profiler.
+        """
+        parents = _open_stages.get()
+        with self.__lock:
+            for stage in stages:
+                self.__stages.append(dict(stage, path="/".join(parents + (stage["path"],))))
+
+    def get_stages(self):
+        """
+        Gets the recorded stages
+
+        Returns:
+            list: A dictionary for every finished stage, in the order the stages finished.
+        """
+        with self.__lock:
+            return list(self.__stages)
+
+    def to_dict(self):
+        """
+        Gets the profile of the run
+
+        Returns:
+            dict: A dictionary with the total wall time, the peak resident set size and the recorded stages.
+        """
+        return {
+            "wall_seconds": time.perf_counter() - self.__start,
+            "cpu_seconds": time.process_time(),
+            "peak_rss_bytes": self.get_peak_rss(),
+            "pid": os.getpid(),
+            "stages": self.get_stages()
+        }
+
+    def write(self, file_path, **metadata):
+        """
+        Writes the profile of the run as a JSON file.
+
+        Args:
+            file_path (str): Path of the JSON file.
+            **metadata: Additional entries of the profile, e.g. the package version and the command-line arguments.
+
+        Returns:
+            str: The file path of the profile.
+        """
+        with open(file_path, "w") as profile_file:
+            json.dump(dict(metadata, **self.to_dict()), profile_file, indent=2, default=str)
+        return file_path
+
+# Names of the stages open in the current context, outermost first
+_open_stages = ContextVar("open_stages", default=())
+
+# The profiler the package records its stages in, or None while profiling is disabled
+_active_profiler = None
+
+def set_profiler(profiler):
+    """
+    Activates a profiler for all stages of the package, or disables profiling.
+
+    Args:
+        profiler (Profiler): The profiler to record stages in, or None to disable profiling.
+    """
+    global _active_profiler
+    _active_profiler = profiler
+
+def get_profiler():
+    """
+    Gets the active profiler
+
+    Returns:
+        Profiler: The active profiler, or None while profiling is disabled.
+    """
+    return _active_profiler
+
+@contextmanager
+def profile_stage(name, **counts):
+    """
+    Records a stage in the active profiler. Without an active profiler the stage is not recorded.
+
+    Args:
+        name (str): Name of the stage.
+        **counts: Sizes and details known when the stage starts.
+
+    Yields:
+        dict: The counts of the stage, which the caller can update while the stage runs.
+    """
+    profiler = _active_profiler
+    if profiler is None:
+        yield counts
+        return
+    with profiler.stage(name, **counts) as stage_counts:
+        yield stage_counts
@@ -1,6 +1,100 @@
 from rdflib import Graph, Namespace, Literal, URIRef
 from rdflib.namespace import RDF, OWL, DCTERMS
 import warnings
+from FAIRmaterials.profiler import profile_stage
+
+class LocalNameIndex:
+    """
+    An index from the local names of ontology terms (the part of a URI after "#" or the last "/") to the base URIs they are defined under.
+
+    Every subject is split only once, no matter how many triples it appears in, and the index can be updated
+    incrementally as graphs are merged and as subjects are removed from the merged graph.
+
+    Attributes:
+        __base_uris (dict): Dictionary of local names and the base URIs each one is defined under, with the number of indexed subjects of each base URI.
+        __indexed_subjects (set): Set of subjects that were already added to the index.
+    """
+
+    def __init__(self):
+        self.__base_uris = {}
+        self.__indexed_subjects = set()
+
+    @staticmethod
+    def split_uri(uri):
+        """
+        Splits a URI into its base URI and its local name.
+
+        Args:
+            uri (str): The URI to split.
+
+        Returns:
+            tuple: A tuple containing the base URI and the local name.
+        """
+        if '#' in uri:
+            base_uri, local_name = uri.split('#', 1)
+        else:
+            base_uri, _, local_name = uri.rpartition('/')
+        return base_uri, local_name
+
+    def add_subject(self, subject):
+        """
+        Adds a subject to the index.
+
+        Args:
+            subject (rdflib.term.Node): The subject to add.
+
+        Returns:
+            bool: True if the subject introduced a new base URI for a local name that was already indexed, False otherwise.
+        """
+        if subject in self.__indexed_subjects:
+            return False
+        self.__indexed_subjects.add(subject)
+
+        base_uri, local_name = self.split_uri(subject)
+        base_uris = self.__base_uris.setdefault(local_name, {})
+        is_conflict = len(base_uris) > 0 and base_uri not in base_uris
+        base_uris[base_uri] = base_uris.get(base_uri, 0) + 1
+        return is_conflict
+
+    def remove_subject(self, subject):
+        """
+        Removes a subject from the index, e.g. once the merged graph no longer contains it.
+
+        Args:
+            subject (rdflib.term.Node): The subject to remove.
+        """
+        if subject not in self.__indexed_subjects:
+            return
+        self.__indexed_subjects.remove(subject)
+
+        base_uri, local_name = self.split_uri(subject)
+        base_uris = self.__base_uris[local_name]
+        base_uris[base_uri] -= 1
+        if base_uris[base_uri] == 0:
+            del base_uris[base_uri]
+            if not base_uris:
+                del self.__base_uris[local_name]
+
+    def add_graph(self, graph):
+        """
+        Adds all subjects of a graph to the index.
+
+        Args:
+            graph (rdflib.Graph): The graph whose subjects are added.
+
+        Returns:
+            set: The local names that received a conflicting base URI from this graph.
+        """
+        return {self.split_uri(subject)[1] for subject in graph.subjects(unique=True) if self.add_subject(subject)}
+
+    def get_conflicts(self):
+        """
+        Gets all local names that are defined under more than one base URI.
+
+        Returns:
+            dict: A dictionary of conflicting local names and the sorted list of base URIs they are defined under.
+        """
+        return {local_name: sorted(base_uris) for local_name, base_uris in self.__base_uris.items() if len(base_uris) > 1}
 
 class RDFLibGraphMerger:
     """
@@ -8,6 +102,8 @@ class RDFLibGraphMerger:
 
     Methods:
         merge_ontologies(ontology_one, ontology_two): Merges two RDF graphs and removes specific triples.
+        merge_many(graphs, label_index=None, term_interner=None): Merges any number of RDF graphs in a single pass and removes specific triples.
+        update_merged_graph(merged_graph, removed_triples, added_triples, other_graphs, label_index=None, term_interner=None): Updates a merged graph after one of its input ontologies changed.
         add_ontology_ownership(merged_graph, base_uri, ontology_title, ontology_version, ontology_authors=[]): Adds ownership metadata to the merged ontology graph.
     """
 
@@ -23,29 +119,121 @@ class RDFLibGraphMerger:
         Returns:
             rdflib.Graph: The merged ontology graph with specific triples removed.
         """
-        # Merge the graphs
-        merged_graph = ontology_one + ontology_two
-
-        # Loop through RDF triples
-        for subject, predicate, object_ in merged_graph:
-            # Check if the subject contains "/Ontology"
-            if "#Ontology" in str(subject):
-                # Remove the triple from the graph
-                merged_graph.remove((subject, predicate, object_))
-
-        unique_subjects = {}
-        # base_uri: xrdtool and xrdrecipe
-        # argument: measurement
-        for s, p, o in merged_graph:
-            if '#' in s:
-                base_uri, argument = s.split('#')
-            else:
-                base_uri, argument = s.rsplit('/', 1)
-
-            if argument in unique_subjects and unique_subjects[argument] != base_uri:
-                warnings.warn("There is already an existing RDF triple with the same Ontology label {}".format(s))
-            else:
-                unique_subjects[argument] = base_uri
+        return RDFLibGraphMerger.merge_many([ontology_one, ontology_two])
+
+    @staticmethod
+    def merge_many(graphs, label_index=None, term_interner=None):
+        """
+        Merges any number of RDF graphs (ontologies) into a single graph in one pass.
+
+        Every input graph is added to the same target graph exactly once, so merging n ontologies does not copy
+        the accumulated graph n times. Triples with subjects containing "#Ontology" are dropped while they are
+        streamed into the target instead of being removed by a second scan over the merged graph.
+
+        The local names of all merged subjects are recorded in a LocalNameIndex. A single warning is raised for
+        every local name that ends up defined under more than one base URI, and the full conflict report can be
+        read from the index with LocalNameIndex.get_conflicts().
+
+        With a TermInterner, the merged graph holds interned terms, so a term that appears in several ontologies, or
+        in graphs loaded from saved outputs or sent back by worker processes, is a single object in memory.
+
+        Args:
+            graphs (iterable of rdflib.Graph): The ontologies to merge.
+            label_index (LocalNameIndex): Index to update with the merged subjects, so that it can be reused across several merges (Optional).
+            term_interner (TermInterner): Run-wide table the merged terms are interned in (Optional).
+
+        Returns:
+            rdflib.Graph: The merged ontology graph with specific triples removed.
+        """
+        if label_index is None:
+            label_index = LocalNameIndex()
+
+        merged_graph = Graph()
+        new_conflicts = set()
+
+        def stream_triples(graph):
+            for triple in graph:
+                subject, predicate, object_ = triple if term_interner is None else term_interner.intern_triple(triple)
+                # Skip the ontology header triples of the input graphs
+                if "#Ontology" in str(subject):
+                    continue
+
+                if label_index.add_subject(subject):
+                    new_conflicts.add(LocalNameIndex.split_uri(subject)[1])
+
+                yield subject, predicate, object_, merged_graph
+
+        with profile_stage("merge") as counts:
+            counts["graphs"] = 0
+            for graph in graphs:
+                for prefix, namespace in graph.namespaces():
+                    merged_graph.bind(prefix, namespace)
+                merged_graph.addN(stream_triples(graph))
+                counts["graphs"] += 1
+            counts["triples"] = len(merged_graph)
+            if term_interner is not None:
+                counts["interned_terms"] = len(term_interner)
+
+        conflicts = label_index.get_conflicts()
+        for local_name in sorted(new_conflicts):
+            warnings.warn("The Ontology label {} is defined under multiple base URIs: {}".format(local_name, ", ".join(conflicts[local_name])))
+
+        return merged_graph
+
+    @staticmethod
+    def update_merged_graph(merged_graph, removed_triples, added_triples, other_graphs, label_index=None, term_interner=None):
+        """
+        Updates a merged graph in place after one of its input ontologies changed, without merging all ontologies again.
+
+        Triples with subjects containing "#Ontology" are skipped, as in merge_many(). A removed triple stays in the
+        merged graph if another input ontology still contains it. Subjects without any remaining triple are removed
+        from the label index.
+
+        Args:
+            merged_graph (rdflib.Graph): The merged ontology graph.
+            removed_triples (iterable of tuple): Triples the changed ontology no longer contains.
+            added_triples (iterable of tuple): Triples that were added to the changed ontology.
+            other_graphs (list): The unchanged input ontologies, as graphs or sets of triples.
+            label_index (LocalNameIndex): Index the merged subjects are recorded in, to warn about new conflicting local names (Optional).
+            term_interner (TermInterner): Run-wide table the added terms are interned in (Optional).
+
+        Returns:
+            rdflib.Graph: The updated merged ontology graph.
+        """
+        new_conflicts = set()
+        with profile_stage("update_merged_graph") as counts:
+            counts["removed_triples"] = 0
+            removed_subjects = set()
+            for triple in removed_triples:
+                if "#Ontology" in str(triple[0]):
+                    continue
+                if not any(triple in graph for graph in other_graphs):
+                    merged_graph.remove(triple)
+                    removed_subjects.add(triple[0])
+                    counts["removed_triples"] += 1
+
+            added_quads = []
+            for triple in added_triples:
+                subject, predicate, object_ = triple if term_interner is None else term_interner.intern_triple(triple)
+                if "#Ontology" in str(subject):
+                    continue
+                if label_index is not None and label_index.add_subject(subject):
+                    new_conflicts.add(LocalNameIndex.split_uri(subject)[1])
+                added_quads.append((subject, predicate, object_, merged_graph))
+            merged_graph.addN(added_quads)
+            counts["added_triples"] = len(added_quads)
+
+            # Subjects are only removed once the added triples are in, so that a changed subject is not reported as a
+            # new conflict
+            if label_index is not None:
+                for subject in removed_subjects:
+                    if (subject, None, None) not in merged_graph:
+                        label_index.remove_subject(subject)
+
+        if new_conflicts:
+            conflicts = label_index.get_conflicts()
+            for local_name in sorted(new_conflicts):
+                warnings.warn("The Ontology label {} is defined under multiple base URIs: {}".format(local_name, ", ".join(conflicts[local_name])))
 
         return merged_graph
 
@@ -1,7 +1,14 @@
 import os
+import gzip
 import tempfile
-from pylode import VocPub
-import graphviz
+from functools import partial
+from concurrent.futures import Future, ThreadPoolExecutor
+import contextvars
+import warnings
+from rdflib import Literal
+from FAIRmaterials.json_ld_writer import JSONLDWriter
+from FAIRmaterials.graphviz_renderer import GraphvizRenderer
+from FAIRmaterials.profiler import profile_stage
 
 class RDFLibGraphSaver:
     """
@@ -11,12 +18,19 @@ class RDFLibGraphSaver:
         __rdflib_graph (rdflib.Graph): an RDFLib graph containing all information about the ontology.
         __graphviz_graph (graphviz.Digraph): an Graphviz graph containing all information about the ontology.
         __ontology_name (str): Name of the ontology.
+        __graphviz_renderer (GraphvizRenderer): Renderer choosing the layout engine, timeout and partitions of the Graphviz diagrams.
+        __graphviz_node_ids (GraphvizNodeIds): The node IDs the Graphviz graph was created with, used to find its classes when it is partitioned.
     """
 
-    def __init__(self, ontology_name, rdflib_graph, graphviz_graph):
+    # The characters that must be escaped in quoted N-Quads literals
+    ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r"})
+
+    def __init__(self, ontology_name, rdflib_graph, graphviz_graph, graphviz_renderer=None, graphviz_node_ids=None):
         self.__ontology_name = ontology_name
         self.__rdflib_graph = rdflib_graph
         self.__graphviz_graph = graphviz_graph
+        self.__graphviz_renderer = graphviz_renderer if graphviz_renderer is not None else GraphvizRenderer()
+        self.__graphviz_node_ids = graphviz_node_ids
 
     def save_rdflib_graph_owl(self):
         """
@@ -42,9 +56,9 @@ class RDFLibGraphSaver:
         # Define the file path within the folder
         file_path = os.path.join(output_folder, f"{self.__ontology_name}.ttl") # change to ttl to follow testing expectations
         
-        # Write the RDFLib graph to the file in TTL format
-        with open(file_path, "wb") as f:
-            f.write(self.__rdflib_graph.serialize(format="ttl").encode('utf-8'))
+        # Stream the RDFLib graph to the file in TTL format, without building the whole document in memory
+        with profile_stage("save_ttl", triples=len(self.__rdflib_graph)), open(file_path, "wb") as f:
+            self.__rdflib_graph.serialize(destination=f, format="ttl", encoding="utf-8")
             
         return file_path
 
@@ -81,19 +95,101 @@ class RDFLibGraphSaver:
         # Define the file path within the folder
         file_path = os.path.join(output_folder, f"{self.__ontology_name}.json")
         
-        # Write the RDFLib graph to the file in JSON-LD format
-        with open(file_path, "wb") as f:
-            f.write(self.__rdflib_graph.serialize(format="json-ld", context=json_ld_context).encode('utf-8'))
+        # Write the RDFLib graph to the file in JSON-LD format, grouping the triples directly into node objects
+        with profile_stage("save_jsonld", triples=len(self.__rdflib_graph)), open(file_path, "w", encoding="utf-8") as f:
+            JSONLDWriter(self.__rdflib_graph, json_ld_context).write(f)
             
         return file_path
+
+    def save_rdflib_graph_ntriples(self, compress=False, quads=False):
+        """
+        Saves the RDFLib graph to an N-Triples or N-Quads file.
+
+        The triples are written one line at a time, so the memory needed on top of the graph does not grow with its size.
+
+        Args:
+            compress (bool): Whether to gzip-compress the file.
+            quads (bool): Whether to write N-Quads, naming the graph of every triple, instead of N-Triples.
+
+        Returns:
+            str: The file path of the saved N-Triples (.nt) or N-Quads (.nq) file, ending in .gz if compressed.
+
+        Raises:
+            ValueError: RDF Graph is empty.
+        """
+
+        ## add in null graph checking
+        if len(self.__rdflib_graph) == 0:
+            raise ValueError("The RDF graph is empty.")
+
+        # Define the folder name
+        output_folder = f"{self.__ontology_name}_output"
+        
+        # Create the folder if it doesn't exist
+        if not os.path.exists(output_folder):
+            os.makedirs(output_folder)
+
+        # Define the file path within the folder
+        extension = ".nq" if quads else ".nt"
+        if compress:
+            extension += ".gz"
+        file_path = os.path.join(output_folder, f"{self.__ontology_name}{extension}")
+
+        open_file = gzip.open if compress else open
+        with profile_stage("save_nquads" if quads else "save_ntriples", triples=len(self.__rdflib_graph), compressed=compress), open_file(file_path, "wb") as f:
+            if quads:
+                graph_name = self.__rdflib_graph.identifier
+                context = graph_name.n3()
+                for s, p, o in self.__rdflib_graph:
+                    f.write(f"{s.n3()} {p.n3()} {self.__to_nquads_term(o)} {context} .\n".encode("utf-8"))
+            else:
+                self.__rdflib_graph.serialize(destination=f, format="nt", encoding="utf-8")
+
+        return file_path
     
+    def save_rdflib_graph_snapshot(self, file_format="npz"):
+        """
+        Saves the RDFLib graph as a binary NumPy snapshot, which is loaded much faster than the TTL file.
+
+        Args:
+            file_format (str): "npz" for a single .npz file, or "npy" for a folder of .npy files that can be memory-mapped.
+
+        Returns:
+            str: The file path of the saved .npz file or snapshot folder.
+
+        Raises:
+            ValueError: RDF Graph is empty or the format is unknown.
+        """
+        if len(self.__rdflib_graph) == 0:
+            raise ValueError("The RDF graph is empty.")
+        if file_format not in ("npz", "npy"):
+            raise ValueError(f"Unknown snapshot format {file_format}, expected npz or npy")
+        # NumPy is an optional dependency, only needed for snapshots
+        from FAIRmaterials.graph_snapshot import GraphSnapshot
+
+        output_folder = f"{self.__ontology_name}_output"
+
+        if not os.path.exists(output_folder):
+            os.makedirs(output_folder)
+
+        file_path = os.path.join(output_folder, f"{self.__ontology_name}.npz" if file_format == "npz" else f"{self.__ontology_name}_snapshot")
+        with profile_stage("save_snapshot", triples=len(self.__rdflib_graph), format=file_format):
+            return GraphSnapshot.from_graph(self.__rdflib_graph).save(file_path)
+
     def save_graphviz_graph(self):
         """
-        Saves the Graphviz graph to a PNG file.
+        Saves the Graphviz graph to a PNG file, or to an SVG file laid out with a faster engine if the graph is large.
+
+        Returns:
+            str: The file path of the saved PNG or SVG file.
 
         Raises:
             graphviz.backend.ExecutableNotFound: If the graph is empty and cannot be printed.
+            TimeoutError: If the layout takes longer than the timeout of the renderer.
         """
+        # Imported here so that saving the RDFLib graph alone, e.g. for merged ontologies, does not load graphviz
+        import graphviz
+
         output_folder = f"{self.__ontology_name}_output"
         
         if not os.path.exists(output_folder):
@@ -103,30 +199,65 @@ class RDFLibGraphSaver:
             raise graphviz.backend.ExecutableNotFound("The graph is empty and cannot be printed")
         else:
             file_path = os.path.join(output_folder, f"{self.__ontology_name}Graph")
-            self.__graphviz_graph.render(file_path, format="png", cleanup=True)
+            return self.__graphviz_renderer.render(self.__graphviz_graph, file_path)
+
+    def save_graphviz_partitions(self):
+        """
+        Saves one SVG diagram of the Graphviz graph per namespace or top-level class subtree, as set in the renderer.
+
+        Returns:
+            dict: A dictionary of the partition names and the file paths of their SVG files, or None for partitions that failed.
+
+        Raises:
+            graphviz.backend.ExecutableNotFound: If the graph is empty and cannot be printed.
+        """
+        import graphviz
 
+        output_folder = f"{self.__ontology_name}_output"
+
+        if not os.path.exists(output_folder):
+            os.makedirs(output_folder)
 
-    def generate_pylode_html(self):
+        if len(self.__graphviz_graph.body) == 0:
+            raise graphviz.backend.ExecutableNotFound("The graph is empty and cannot be printed")
+        file_path = os.path.join(output_folder, f"{self.__ontology_name}Graph")
+        return self.__graphviz_renderer.render_partitions(self.__graphviz_graph, self.__rdflib_graph, file_path, self.__graphviz_node_ids)
+
+
+    def generate_pylode_html(self, ontology_path=None):
             """
             Generates an HTML file using PyLODE for the RDFLib graph containing all information about the ontology.
 
+            Args:
+                ontology_path (str): Path to a TTL file that was already written for the graph (Optional). Without it the graph is first serialized to a temporary TTL file.
+
             Returns:
                 str: The file path of the generated HTML file.
 
             Raises:
                 ValueError: If the graph is empty and cannot be parsed by VocPub()
             """
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.ttl') as temp_file:
-                self.__rdflib_graph.serialize(destination=temp_file, format='turtle')
-                temp_file_path = temp_file.name
-
-            
-            if len(self.__graphviz_graph.body) == 0:
+            if len(self.__rdflib_graph) == 0:
                 raise ValueError("Graph is empty")
 
-            op = VocPub(ontology=temp_file_path)
+            # PyLODE and its dependencies take longer to import than the rest of the package together and configure
+            # logging on import, so they are only loaded when documentation is generated
+            from pylode import VocPub
+
+            temp_file_path = None
+            if ontology_path is None:
+                with tempfile.NamedTemporaryFile(delete=False, suffix='.ttl') as temp_file:
+                    self.__rdflib_graph.serialize(destination=temp_file, format='turtle')
+                    temp_file_path = ontology_path = temp_file.name
+
+            # VocPub adds inferred triples to the graph it documents, so it always parses its own copy from the TTL file
+            try:
+                with profile_stage("pylode_load", triples=len(self.__rdflib_graph)):
+                    op = VocPub(ontology=ontology_path)
+            finally:
+                if temp_file_path is not None:
+                    os.remove(temp_file_path)
 
-            html = op.make_html()
             output_folder = f"{self.__ontology_name}_output"
             
             if not os.path.exists(output_folder):
@@ -134,8 +265,126 @@ class RDFLibGraphSaver:
             
             file_path = os.path.join(output_folder, f"{self.__ontology_name}.html")
 
-            with open(file_path, 'w') as file:
-                pass  # 'pass' is used here to create an empty file
-
-            op.make_html(destination=file_path)
+            # make_html() appends to the document on every call, so it is only called once
+            with profile_stage("pylode_html"):
+                op.make_html(destination=file_path)
             return file_path
+
+    def save_all(self, include_graphviz=True, include_pylode_docs=False, include_ntriples=False, compress_ntriples=False, render_pool=None, snapshot_format=None):
+        """
+        Saves the RDFLib graph in every enabled format and generates the enabled visualization and documentation.
+
+        The TTL file is written first, since the HTML documentation is generated from it. All other outputs only read
+        the final graph and are written concurrently. With a render pool, the Graphviz diagrams and the HTML
+        documentation are submitted to the pool instead and this method returns without waiting for them.
+
+        A Graphviz layout that exceeds the timeout of the renderer is reported with a warning instead of failing the other outputs.
+
+        Args:
+            include_graphviz (bool): Whether to save the Graphviz graph to a PNG or SVG file, or to one SVG file per partition if the renderer splits diagrams.
+            include_pylode_docs (bool): Whether to generate HTML documentation with PyLODE.
+            include_ntriples (bool): Whether to save the RDFLib graph to an N-Triples file.
+            compress_ntriples (bool): Whether to gzip-compress the N-Triples file.
+            render_pool (RenderPool): Pool rendering the Graphviz diagrams and HTML documentation in the background (Optional).
+            snapshot_format (str): Whether to save a binary snapshot of the RDFLib graph as "npz" or "npy", or None for no snapshot (Optional).
+
+        Returns:
+            dict: A dictionary of the saved outputs ("ttl", "jsonld", "ntriples", "snapshot", "graphviz" or "graphviz_partitions", "html") and their file paths. A diagram that timed out is None and the partitioned diagrams are a dictionary of partitions; outputs submitted to a render pool are futures. See resolve_outputs() and get_missing_outputs().
+
+        Raises:
+            ValueError: RDF Graph is empty.
+        """
+        outputs = {"ttl": self.save_rdflib_graph_owl()}
+
+        writers = {"jsonld": self.save_rdflib_graph_jsonld}
+        if include_ntriples:
+            writers["ntriples"] = partial(self.save_rdflib_graph_ntriples, compress=compress_ntriples)
+        if snapshot_format is not None:
+            writers["snapshot"] = partial(self.save_rdflib_graph_snapshot, file_format=snapshot_format)
+        renderers = {}
+        if include_graphviz and self.__graphviz_renderer.get_partition_by() is not None:
+            renderers["graphviz_partitions"] = self.save_graphviz_partitions
+        elif include_graphviz:
+            renderers["graphviz"] = self.__save_graphviz_graph_within_timeout
+        if include_pylode_docs:
+            renderers["html"] = partial(self.generate_pylode_html, ontology_path=outputs["ttl"])
+        if render_pool is None:
+            writers.update(renderers)
+        else:
+            for name, renderer in renderers.items():
+                outputs[name] = render_pool.submit(f"{self.__ontology_name} {name}", renderer)
+
+        with ThreadPoolExecutor(max_workers=len(writers), thread_name_prefix="graph-saver") as executor:
+            # Every writer runs in a copy of the caller's context, so profiled stages keep their parent stage
+            futures = {name: executor.submit(contextvars.copy_context().run, writer) for name, writer in writers.items()}
+        outputs.update({name: future.result() for name, future in futures.items()})
+        return outputs
+
+    @staticmethod
+    def resolve_outputs(outputs):
+        """
+        Waits for the outputs that are still rendering and gets the file paths of all outputs.
+
+        Args:
+            outputs (dict): Dictionary of outputs and their file paths or futures, as returned by save_all().
+
+        Returns:
+            dict: A dictionary of the outputs and their file paths, with one "graphviz_<partition>" output per partition and without diagrams that timed out.
+
+        Raises:
+            Exception: The error of a failed output.
+        """
+        resolved = {}
+        for name, output in outputs.items():
+            if isinstance(output, Future):
+                output = output.result()
+            if name == "graphviz_partitions":
+                resolved.update({f"graphviz_{partition}": file_path for partition, file_path in output.items() if file_path is not None})
+            elif output is not None:
+                resolved[name] = output
+        return resolved
+
+    @staticmethod
+    def get_missing_outputs(outputs):
+        """
+        Waits for the outputs that are still rendering and gets the outputs that were not saved, e.g. diagrams whose layout exceeded the timeout.
+
+        Args:
+            outputs (dict): Dictionary of outputs and their file paths or futures, as returned by save_all().
+
+        Returns:
+            list: The names of the missing outputs, sorted.
+        """
+        missing = []
+        for name, output in outputs.items():
+            if isinstance(output, Future):
+                output = output.result()
+            if name == "graphviz_partitions":
+                missing.extend(f"graphviz_{partition}" for partition, file_path in output.items() if file_path is None)
+            elif output is None:
+                missing.append(name)
+        return sorted(missing)
+
+    @staticmethod
+    def __to_nquads_term(term):
+        """
+        Gets the N-Quads form of a term; Literal.n3() writes literals with line breaks in Turtle's triple quotes instead.
+        """
+        if not isinstance(term, Literal):
+            return term.n3()
+        lexical_form = f'"{str(term).translate(RDFLibGraphSaver.ESCAPES)}"'
+        if term.language is not None:
+            return f"{lexical_form}@{term.language}"
+        if term.datatype is not None:
+            return f"{lexical_form}^^{term.datatype.n3()}"
+        return lexical_form
+
+    def __save_graphviz_graph_within_timeout(self):
+        """
+        Saves the Graphviz graph, reporting a layout that exceeds the timeout with a warning.
+        """
+        try:
+            return self.save_graphviz_graph()
+        except TimeoutError as e:
+            warnings.warn(f"The Graphviz graph of {self.__ontology_name} was not saved: {e}")
+            return None
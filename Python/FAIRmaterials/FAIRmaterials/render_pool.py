@@ -0,0 +1,140 @@
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import threading
+import time
+
+class RenderPool:
+    """
+    A bounded pool of background threads for the slow external renderers, Graphviz and PyLODE.
+
+    Renders are submitted with the name of the artifact they produce and return futures, so the caller can go on
+    parsing and serializing the next ontology while diagrams and documentation render. Every render runs in a copy
+    of the caller's context, so its profiled stages keep their parent stage. wait() blocks until all renders, and the
+    follow-up tasks registered with when_done(), have finished and reports the time and error of every artifact.
+
+    Graphviz runs in its own process, so its renders overlap fully with the work of the main thread. PyLODE runs in
+    Python and shares the interpreter with the main thread.
+
+    Attributes:
+        __executor (concurrent.futures.ThreadPoolExecutor): The threads running the renders.
+        __renders (list): A dictionary for every render submitted since the last wait() with its artifact, time, error and future.
+        __outstanding (int): Number of renders and follow-up tasks that have not finished yet.
+        __condition (threading.Condition): Condition guarding the renders and notified when a render finishes.
+    """
+
+    DEFAULT_MAX_WORKERS = 2
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Initializes the RenderPool object.
+
+        Args:
+            max_workers (int): Maximum number of renders running at the same time.
+
+        Raises:
+            ValueError: If max_workers is smaller than 1.
+        """
+        if max_workers < 1:
+            raise ValueError("A render pool needs at least one worker")
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="render-pool")
+        self.__renders = []
+        self.__outstanding = 0
+        self.__condition = threading.Condition()
+
+    def submit(self, artifact, function, *args, **kwargs):
+        """
+        Submits a render to the pool.
+
+        Args:
+            artifact (str): Name of the rendered artifact, used in the report of wait().
+            function (callable): The function rendering the artifact.
+            *args: Positional arguments of the function.
+            **kwargs: Keyword arguments of the function.
+
+        Returns:
+            concurrent.futures.Future: The future of the result of the function.
+        """
+        render = {"artifact": artifact, "seconds": None, "error": None}
+
+        def run():
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            except BaseException as e:
+                render["error"] = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                render["seconds"] = time.perf_counter() - start
+
+        with self.__condition:
+            self.__outstanding += 1
+            render["future"] = self.__executor.submit(contextvars.copy_context().run, run)
+            self.__renders.append(render)
+        render["future"].add_done_callback(lambda _: self.__finish())
+        return render["future"]
+
+    def when_done(self, artifact, futures, function, *args, **kwargs):
+        """
+        Submits a follow-up task that runs once all given futures have succeeded, e.g. writing a build manifest.
+
+        If one of the futures fails, the task is skipped; the failure is reported by wait().
+
+        Args:
+            artifact (str): Name of the artifact of the follow-up task, used in the report of wait().
+            futures (list): The futures the task waits for.
+            function (callable): The function of the follow-up task.
+            *args: Positional arguments of the function.
+            **kwargs: Keyword arguments of the function.
+        """
+        futures = list(futures)
+        remaining = [len(futures)]
+        with self.__condition:
+            # The group counts as outstanding until its task is submitted, so wait() cannot return in between
+            self.__outstanding += 1
+
+        def done(_):
+            with self.__condition:
+                remaining[0] -= 1
+                if remaining[0] > 0:
+                    return
+            if all(not future.cancelled() and future.exception() is None for future in futures):
+                self.submit(artifact, function, *args, **kwargs)
+            self.__finish()
+
+        if not futures:
+            done(None)
+        for future in futures:
+            future.add_done_callback(done)
+
+    def wait(self):
+        """
+        Waits for all submitted renders and follow-up tasks.
+
+        Returns:
+            list: A dictionary with the artifact, the time in seconds and the error, or None, of every render submitted since the last call, in the order they were submitted.
+        """
+        with self.__condition:
+            self.__condition.wait_for(lambda: self.__outstanding == 0)
+            renders, self.__renders = self.__renders, []
+        return [{key: value for key, value in render.items() if key != "future"} for render in renders]
+
+    def shutdown(self):
+        """
+        Waits for all renders and stops the threads of the pool.
+        """
+        self.wait()
+        self.__executor.shutdown()
+
+    def __finish(self):
+        """
+        Marks a render or group of futures as finished.
+        """
+        with self.__condition:
+            self.__outstanding -= 1
+            self.__condition.notify_all()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
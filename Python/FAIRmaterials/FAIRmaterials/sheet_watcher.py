@@ -0,0 +1,137 @@
+from pathlib import Path
+import os
+import time
+from FAIRmaterials.fair_sheet_parser import FairSheetParser
+
+class SheetWatcher:
+    """
+    A class to watch a folder of FAIR sheets for changes by polling the modification times of the sheets.
+
+    A change is only reported once the folder has been quiet for the debounce time, so that saving several sheets
+    or an editor writing a file in several steps leads to one rebuild instead of many.
+
+    Attributes:
+        __folder_path (pathlib.Path): The folder containing ontology CSV files.
+        __interval (float): Time in seconds between two scans of the folder while it is quiet.
+        __debounce (float): Time in seconds the folder has to be quiet after a change before the change is reported.
+        __file_states (dict): Dictionary of the sheet file names and their modification time and size at the last scan.
+    """
+
+    # The sheet of every file name suffix, e.g. "- NameSpace.csv" belongs to the "namespace" sheet of its prefix
+    SHEET_SUFFIXES = {path.name: sheet for sheet, path in FairSheetParser.get_sheet_paths(Path(), "").items()}
+
+    def __init__(self, folder_path: Path, interval=1.0, debounce=0.5):
+        """
+        Initializes the SheetWatcher object and records the current state of the sheets.
+
+        Args:
+            folder_path (pathlib.Path): The folder containing ontology CSV files.
+            interval (float): Time in seconds between two scans of the folder while it is quiet.
+            debounce (float): Time in seconds the folder has to be quiet after a change before the change is reported.
+        """
+        self.__folder_path = Path(folder_path)
+        self.__interval = interval
+        self.__debounce = debounce
+        self.__file_states = self.scan()
+
+    @classmethod
+    def get_sheet(cls, file_name):
+        """
+        Gets the prefix and sheet of a FAIR sheet file name.
+
+        Args:
+            file_name (str): The file name, e.g. "PV- NameSpace.csv".
+
+        Returns:
+            tuple: The prefix and the sheet (as a key of FairSheetParser.get_sheet_paths()), or None if the file is not a FAIR sheet.
+        """
+        # Lock files and backups of spreadsheet editors are not sheets
+        if file_name.startswith(("~$", ".")):
+            return None
+        for suffix, sheet in cls.SHEET_SUFFIXES.items():
+            if file_name.endswith(suffix):
+                return file_name[:-len(suffix)], sheet
+        return None
+
+    @classmethod
+    def get_changed_sheets(cls, file_names):
+        """
+        Groups changed FAIR sheet files by their prefix.
+
+        Args:
+            file_names (iterable of str): The names of the changed files.
+
+        Returns:
+            dict: A dictionary of prefixes and the set of their changed sheets. Files that are not FAIR sheets are ignored.
+        """
+        changed_sheets = {}
+        for file_name in file_names:
+            prefix_and_sheet = cls.get_sheet(file_name)
+            if prefix_and_sheet is not None:
+                prefix, sheet = prefix_and_sheet
+                changed_sheets.setdefault(prefix, set()).add(sheet)
+        return changed_sheets
+
+    def scan(self):
+        """
+        Reads the modification time and size of every FAIR sheet in the folder.
+
+        Returns:
+            dict: A dictionary of the sheet file names and a tuple of their modification time in nanoseconds and their size.
+        """
+        file_states = {}
+        with os.scandir(self.__folder_path) as entries:
+            for entry in entries:
+                if self.get_sheet(entry.name) is None:
+                    continue
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        file_states[entry.name] = (stat.st_mtime_ns, stat.st_size)
+                except FileNotFoundError:
+                    # The file was removed while the folder was scanned
+                    continue
+        return file_states
+
+    def poll(self):
+        """
+        Scans the folder once and compares it to the previous scan.
+
+        Returns:
+            set: The names of the sheets that were created, modified or removed since the previous scan.
+        """
+        file_states = self.scan()
+        changed_files = {
+            file_name for file_name in file_states.keys() | self.__file_states.keys()
+            if file_states.get(file_name) != self.__file_states.get(file_name)
+        }
+        self.__file_states = file_states
+        return changed_files
+
+    def wait_for_changes(self, timeout=None):
+        """
+        Blocks until sheets changed and the folder has been quiet for the debounce time.
+
+        Args:
+            timeout (float): Maximum time in seconds to wait for a first change (Optional, defaults to waiting forever).
+
+        Returns:
+            dict: A dictionary of prefixes and the set of their changed sheets, empty if the timeout passed without a change.
+        """
+        start = time.monotonic()
+        changed_files = self.poll()
+        while not changed_files:
+            if timeout is not None and time.monotonic() - start >= timeout:
+                return {}
+            time.sleep(self.__interval)
+            changed_files = self.poll()
+
+        # Keep collecting changes until no sheet changed for the debounce time
+        last_change = time.monotonic()
+        while time.monotonic() - last_change < self.__debounce:
+            time.sleep(min(self.__interval, self.__debounce))
+            new_changed_files = self.poll()
+            if new_changed_files:
+                changed_files |= new_changed_files
+                last_change = time.monotonic()
+        return self.get_changed_sheets(changed_files)
@@ -0,0 +1,108 @@
+from rdflib import URIRef, Literal
+
+class TermInterner:
+    """
+    A run-wide table of RDFLib terms, so that equal URIs and literals are a single object in memory.
+
+    The parsers of all prefixes and the merge step create the same terms over and over, e.g. the URI of a property
+    for every row using it, an empty alternative label for every entity, or every term of a graph sent back by a
+    worker process. Each copy costs its own memory, and its own hash computation, since a string only caches the hash
+    of the object it was computed for. Terms created with uri() and literal() are looked up by their plain texts, so
+    a term that was created before is neither constructed nor hashed again. intern() deduplicates terms that already
+    exist, e.g. those of other graphs.
+
+    Terms are kept for the lifetime of the interner, which should therefore live as long as the graphs using it,
+    e.g. one run. A long-lived interner, e.g. of watch mode, drops the terms its graphs no longer use with retain().
+    Sharing an interner between threads is safe; two threads interning the same new term at the same time may at
+    worst both keep their own object.
+
+    Attributes:
+        __terms (dict): Dictionary of every interned term to itself.
+        __uris (dict): Dictionary of the texts of URIs created with uri() and their interned URIs.
+        __literals (dict): Dictionary of the values, languages and datatypes of literals created with literal() and their interned literals.
+    """
+
+    def __init__(self):
+        """
+        Initializes the TermInterner object with no interned terms.
+        """
+        self.__terms = {}
+        self.__uris = {}
+        self.__literals = {}
+
+    def __len__(self):
+        return len(self.__terms)
+
+    def intern(self, term):
+        """
+        Gets the interned object equal to a term, interning the term if no equal term was interned before.
+
+        Args:
+            term (rdflib.term.Node): The term to intern.
+
+        Returns:
+            rdflib.term.Node: The interned term.
+        """
+        return self.__terms.setdefault(term, term)
+
+    def intern_triple(self, triple):
+        """
+        Interns the subject, predicate and object of a triple.
+
+        Args:
+            triple (tuple): The triple to intern.
+
+        Returns:
+            tuple: The triple of interned terms.
+        """
+        terms = self.__terms
+        subject, predicate, obj = triple
+        return terms.setdefault(subject, subject), terms.setdefault(predicate, predicate), terms.setdefault(obj, obj)
+
+    def retain(self, graphs):
+        """
+        Removes every interned term that does not occur in any triple of the given graphs.
+
+        Args:
+            graphs (list): The graphs, or sets of triples, whose terms are kept.
+        """
+        used_terms = set()
+        for graph in graphs:
+            for triple in graph:
+                used_terms.update(triple)
+        self.__terms = {term: interned for term, interned in self.__terms.items() if term in used_terms}
+        self.__uris = {value: uri for value, uri in self.__uris.items() if uri in used_terms}
+        self.__literals = {key: literal for key, literal in self.__literals.items() if literal in used_terms}
+
+    def uri(self, value):
+        """
+        Gets the interned URI of a string.
+
+        Args:
+            value (str): The URI.
+
+        Returns:
+            rdflib.URIRef: The interned URI.
+        """
+        uri = self.__uris.get(value)
+        if uri is None:
+            uri = self.__uris[value] = self.intern(URIRef(value))
+        return uri
+
+    def literal(self, value, lang=None, datatype=None):
+        """
+        Gets the interned literal of a string.
+
+        Args:
+            value (str): The lexical form of the literal.
+            lang (str): The language tag of the literal (Optional).
+            datatype (str): The datatype URI of the literal (Optional).
+
+        Returns:
+            rdflib.Literal: The interned literal.
+        """
+        key = (value, lang, datatype)
+        literal = self.__literals.get(key)
+        if literal is None:
+            literal = self.__literals[key] = self.intern(Literal(value, lang=lang, datatype=None if datatype is None else self.uri(datatype)))
+        return literal
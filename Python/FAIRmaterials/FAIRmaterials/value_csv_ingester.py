@@ -0,0 +1,178 @@
+from collections import OrderedDict
+import csv
+import gzip
+import hashlib
+import os
+import re
+from rdflib.namespace import RDF, XSD
+from FAIRmaterials.profiler import profile_stage
+
+class ValueCsvIngester:
+    """
+    Streams the rows of value CSV files into N-Triples files of individuals of an ontology.
+
+    Every column header of a value CSV is the full name of a value type of the ontology, e.g. ``value(Sample->xsd:float)``.
+    Consecutive columns with the same domain entity form one individual of that entity in every row, with one data
+    property triple for every non-empty cell. Individuals of the same row are linked by the object properties of the
+    relationship sheet that go from one of their entities to another.
+
+    The IRI of an individual is the URI of its entity followed by a BLAKE2 hash of its columns and values, so equal
+    individuals get the same IRI in every row, chunk and run. Columns that are all empty in a row create no individual.
+    Individuals and links that were already written are skipped with a bounded LRU cache of their hashes. An individual
+    that was evicted from the cache is written again under the same IRI, which repeats some lines of the file but not
+    triples of the graph it describes.
+
+    The CSV file is read row by row and the lines of every chunk of rows are written at once, so the memory used does
+    not grow with the size of the CSV file and is bounded by the chunk size and the cache size.
+
+    Attributes:
+        __entity_uris (dict): Dictionary of the full names of the entities and their URIs.
+        __data_property_uris (dict): Dictionary of the full names of the data properties and their URIs.
+        __individual_relationships (dict): Dictionary of the full names of domain entities and their (range full name, object property URI) pairs.
+        __chunk_rows (int): Number of rows whose lines are written at once.
+        __max_cached_keys (int): Maximum number of hashes of written individuals and links kept to skip duplicates.
+    """
+
+    # The full name of a value type: its name, then its domain and range in parentheses
+    HEADER = re.compile(r"^([^()]*)\((.*?)->(.*?)\)$")
+    DEFAULT_CHUNK_ROWS = 10000
+    DEFAULT_MAX_CACHED_KEYS = 250000
+    # The characters that must be escaped in quoted N-Triples literals
+    ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r"})
+
+    def __init__(self, fair_sheet_parser, chunk_rows=DEFAULT_CHUNK_ROWS, max_cached_keys=DEFAULT_MAX_CACHED_KEYS):
+        """
+        Initializes the ValueCsvIngester object with the terms of a parsed ontology.
+
+        Args:
+            fair_sheet_parser (FairSheetParser): The parser of the ontology the values belong to.
+            chunk_rows (int): Number of rows whose lines are written at once (Optional).
+            max_cached_keys (int): Maximum number of hashes of written individuals and links kept to skip duplicates (Optional).
+
+        Raises:
+            ValueError: If chunk_rows or max_cached_keys is smaller than 1.
+        """
+        if chunk_rows < 1 or max_cached_keys < 1:
+            raise ValueError("The chunk size and the cache size must be at least 1")
+        self.__entity_uris = fair_sheet_parser.get_entity_uris()
+        self.__data_property_uris = fair_sheet_parser.get_data_property_uris()
+        self.__individual_relationships = fair_sheet_parser.get_individual_relationships()
+        self.__chunk_rows = chunk_rows
+        self.__max_cached_keys = max_cached_keys
+
+    def get_columns(self, header):
+        """
+        Gets the data property of every column of a value CSV file and groups the columns into individuals.
+
+        Args:
+            header (list): The column headers of the value CSV file.
+
+        Returns:
+            list: A (domain full name, entity URI, column headers, list of (column index, property line part, datatype line part)) tuple for every group of consecutive columns with the same domain.
+
+        Raises:
+            ValueError: If a header is not the full name of a value type of the ontology.
+        """
+        groups = []
+        for index, column in enumerate(header):
+            match = self.HEADER.match(column.strip())
+            if match is None:
+                raise ValueError(f"The column {column!r} is not the full name of a value type, e.g. value(Domain->xsd:float)")
+            relationship, domain, range_ = (part.strip() for part in match.groups())
+            if domain not in self.__entity_uris or relationship not in self.__data_property_uris:
+                raise ValueError(f"The column {column!r} references an unknown entity or value type")
+            # Literals of XSD ranges are typed, e.g. "1.5"^^xsd:float
+            datatype = f"^^<{XSD[range_.split(':', 1)[1]]}>" if range_.startswith("xsd:") else ""
+            column_info = (index, f" <{self.__data_property_uris[relationship]}> ", datatype)
+            if groups and groups[-1][0] == domain:
+                groups[-1][2].append(column)
+                groups[-1][3].append(column_info)
+            else:
+                groups.append((domain, self.__entity_uris[domain], [column], [column_info]))
+        return groups
+
+    def ingest(self, csv_path, output_path, compress=False):
+        """
+        Writes the individuals of a value CSV file to an N-Triples file.
+
+        Args:
+            csv_path (str): Path to the value CSV file.
+            output_path (str): Path of the N-Triples file; ".gz" is appended if compressed and missing.
+            compress (bool): Whether to gzip-compress the N-Triples file (Optional).
+
+        Returns:
+            str: The file path of the written N-Triples file.
+
+        Raises:
+            ValueError: If a column header is not the full name of a value type of the ontology.
+        """
+        output_path = str(output_path)
+        if compress and not output_path.endswith(".gz"):
+            output_path += ".gz"
+        output_folder = os.path.dirname(output_path)
+        if output_folder:
+            os.makedirs(output_folder, exist_ok=True)
+
+        open_file = gzip.open if compress else open
+        with profile_stage("ingest_values", compressed=compress) as counts, open(csv_path, newline="") as csv_file:
+            csv_reader = csv.reader(csv_file)
+            groups = self.get_columns(next(csv_reader, []))
+            domains = {domain for domain, _, _, _ in groups}
+            # Only the object properties between entities with columns can link individuals of a row
+            links = [
+                (domain, f" <{property_uri}> ", range_, property_uri)
+                for domain in sorted(domains)
+                for range_, property_uri in self.__individual_relationships.get(domain, [])
+                if range_ in domains
+            ]
+            type_line = f" <{RDF.type}> "
+            written_keys = OrderedDict()
+            counts["rows"] = counts["triples"] = 0
+
+            with open_file(output_path, "wt", encoding="utf-8", newline="\n") as output_file:
+                lines = []
+                for row in csv_reader:
+                    if not row:
+                        continue
+                    row_length = len(row)
+                    instances = {}
+                    for domain, entity_uri, headers, columns in groups:
+                        values = [row[index] if index < row_length else "" for index, _, _ in columns]
+                        if not any(values):
+                            continue
+                        # The ASCII record and unit separators keep the hashed fields apart
+                        instance_hash = hashlib.blake2b("\x1e".join(["\x1f".join(headers), "\x1f".join(values)]).encode("utf-8"), digest_size=16).digest()
+                        subject = f"<{entity_uri}_{instance_hash.hex()}>"
+                        instances[domain] = (instance_hash, subject)
+                        if self.__is_written(written_keys, instance_hash):
+                            continue
+                        lines.append(f"{subject}{type_line}<{entity_uri}> .\n")
+                        for value, (_, predicate, datatype) in zip(values, columns):
+                            if value != "":
+                                lines.append(f"{subject}{predicate}\"{value.translate(self.ESCAPES)}\"{datatype} .\n")
+                    for domain, predicate, range_, property_uri in links:
+                        if domain in instances and range_ in instances:
+                            (domain_hash, subject), (range_hash, obj) = instances[domain], instances[range_]
+                            if not self.__is_written(written_keys, (domain_hash, property_uri, range_hash)):
+                                lines.append(f"{subject}{predicate}{obj} .\n")
+
+                    counts["rows"] += 1
+                    if counts["rows"] % self.__chunk_rows == 0:
+                        output_file.writelines(lines)
+                        counts["triples"] += len(lines)
+                        lines = []
+                output_file.writelines(lines)
+                counts["triples"] += len(lines)
+        return output_path
+
+    def __is_written(self, written_keys, key):
+        """
+        Checks whether the lines of a key were written before and records the key as written, evicting the least recently used key when the cache is full.
+        """
+        if key in written_keys:
+            written_keys.move_to_end(key)
+            return True
+        written_keys[key] = None
+        if len(written_keys) > self.__max_cached_keys:
+            written_keys.popitem(last=False)
+        return False
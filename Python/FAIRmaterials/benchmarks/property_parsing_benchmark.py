@@ -0,0 +1,75 @@
+"""
+Benchmarks how parsing relationship and value type sheets scales with the number of rows.
+
+Usage:
+    python benchmarks/property_parsing_benchmark.py [--rows 1000 10000 100000] [--entities 100]
+
+For every row count a set of FAIR sheets with that many relationships and value types is written to a temporary
+folder and parsed with FairSheetParser. The time per row should stay roughly constant as the row count grows.
+"""
+from pathlib import Path
+import argparse
+import csv
+import tempfile
+import time
+import graphviz
+from rdflib import Graph as rdfGraph
+from FAIRmaterials.fair_sheet_parser import FairSheetParser
+
+def write_sheets(folder, rows, entities):
+    """
+    Writes a synthetic set of FAIR sheets with the given number of property rows and entities.
+    """
+    with open(folder / "- OntologyInfo.csv", "w", newline="") as file:
+        csv.writer(file).writerows([
+            ["Ontology Name", "Bench"],
+            ["Ontology URI", "http://example.com/bench#"],
+            ["Ontology Version", "1.0"],
+            ["Ontology Author(s)", "Benchmark"],
+            ["Ontology Description", "Synthetic ontology"]
+        ])
+
+    with open(folder / "- NameSpace.csv", "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Prefix Name", "Ontology URL", "Ontology Info"])
+        writer.writerow(["", "", ""])
+        writer.writerow(["Bench", "http://example.com/bench#", ""])
+
+    with open(folder / "- VariableDefinitions.csv", "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Variable Name", "Belongs to Ontology", "Parent Variable", "Definition of Variable", "Alternative Name(s)", "Unit", "fullName"])
+        writer.writerow([""] * 7)
+        for index in range(entities):
+            writer.writerow([f"Entity{index}", "", "", f"Entity {index}", "", "", f"Entity{index}"])
+
+    with open(folder / "- RelationshipDefinitions.csv", "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Relationship Name", "Belongs to Ontology", "Domain", "Range", "Definition", "Alternative Name(s)", "fullName"])
+        writer.writerow([""] * 7)
+        for index in range(rows):
+            writer.writerow([f"relation{index}", "", f"Entity{index % entities}", f"Entity{(index + 1) % entities}", f"Relation {index}", "", f"relation{index}"])
+
+    with open(folder / "- ValueTypeDefinitions.csv", "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["ValueType Name", "Belongs to Ontology", "Domain", "Range", "Definition of Property", "Alternative Name(s)", "fullName"])
+        writer.writerow([""] * 7)
+        for index in range(rows):
+            writer.writerow([f"value{index}", "", f"Entity{index % entities}", "xsd:float", f"Value {index}", "", f"value{index}"])
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark parsing of relationship and value type sheets.")
+    argument_parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000], help='Number of relationship and value type rows')
+    argument_parser.add_argument('--entities', type=int, default=100, help='Number of entities the properties link')
+    args = argument_parser.parse_args()
+
+    print(f"{'rows':>10} {'seconds':>10} {'us/row':>10}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as folder:
+            write_sheets(Path(folder), rows, args.entities)
+            start = time.perf_counter()
+            FairSheetParser(Path(folder), "", False, rdfGraph(), graphviz.Digraph(strict=False), False)
+            elapsed = time.perf_counter() - start
+        print(f"{rows:>10} {elapsed:>10.2f} {elapsed / (2 * rows) * 1e6:>10.1f}")
+
+if __name__ == "__main__":
+    main()
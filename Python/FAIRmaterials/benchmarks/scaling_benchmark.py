@@ -0,0 +1,149 @@
+"""
+Benchmarks every stage of building ontologies from FAIR sheets at growing sizes, recording time and peak memory.
+
+Usage:
+    python benchmarks/scaling_benchmark.py [--entities 1000 10000] [--prefixes 2] [--output results.json]
+
+For every entity count a synthetic set of FAIR sheets is written with FairSheetGenerator, with as many relationships
+and value types as entities. The stages are:
+
+    parse      FairSheetParser for every prefix, including the external ontology information from local files
+    merge      RDFLibGraphMerger.merge_many over the parsed graphs
+    ttl, jsonld, ntriples, ntriples_gz
+               the outputs of RDFLibGraphSaver for the merged graph
+    graphviz, html
+               rendering the Graphviz graph of the first prefix and documenting the merged graph with PyLODE,
+               only with --render and --pylode
+
+Every stage is timed on its own, then run again under tracemalloc to record its peak memory, since tracing slows the
+code down. With --output the results are written as JSON together with the package version, so that runs of
+different releases can be compared.
+"""
+from pathlib import Path
+import argparse
+import gc
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+import warnings
+import graphviz
+from rdflib import Graph as rdfGraph
+from FAIRmaterials.fair_sheet_generator import FairSheetGenerator
+from FAIRmaterials.fair_sheet_parser import FairSheetParser
+from FAIRmaterials.rdflib_graph_merger import RDFLibGraphMerger
+from FAIRmaterials.rdflib_graph_saver import RDFLibGraphSaver
+from FAIRmaterials.build_manifest import BuildManifest
+
+def run_stage(function, memory):
+    """
+    Runs a stage and returns its result, its wall time in seconds and its peak traced memory in bytes.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+
+    peak_memory = None
+    if memory:
+        del result
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = function()
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, elapsed, peak_memory
+
+def parse_all(folder_path, prefixes):
+    return [
+        FairSheetParser(folder_path, prefix, True, rdfGraph(), graphviz.Digraph(strict=False), True)
+        for prefix in prefixes
+    ]
+
+def benchmark(entities, args, output_folder):
+    """
+    Benchmarks all stages for one size and returns the result of every stage.
+    """
+    sheet_folder = Path(output_folder) / "sheets"
+    generator = FairSheetGenerator(
+        entities=entities, depth=args.depth, relationships=entities, value_types=entities,
+        external_namespaces=args.external_namespaces, prefixes=args.prefixes, external_ontology_files=True
+    )
+    prefixes = generator.generate(sheet_folder)
+    rows = args.prefixes * 3 * entities
+    results = []
+
+    def record(stage, elapsed, peak_memory, triples):
+        results.append({
+            "entities": entities, "stage": stage, "seconds": elapsed, "peak_memory_bytes": peak_memory,
+            "triples": triples, "triples_per_second": triples / elapsed if elapsed > 0 else None
+        })
+        memory = f"{peak_memory / 2 ** 20:>10.1f}" if peak_memory is not None else f"{'':>10}"
+        print(f"{entities:>10} {stage:>16} {elapsed:>10.3f} {memory} {triples:>10}")
+
+    parsers, elapsed, peak_memory = run_stage(lambda: parse_all(sheet_folder, prefixes), args.memory)
+    graphs = [parser.get_rdf_graph() for parser in parsers]
+    record("parse", elapsed, peak_memory, sum(len(graph) for graph in graphs))
+    results[-1]["rows_per_second"] = rows / elapsed
+
+    merged_graph, elapsed, peak_memory = run_stage(lambda: RDFLibGraphMerger.merge_many(graphs), args.memory)
+    record("merge", elapsed, peak_memory, len(merged_graph))
+
+    # The saver writes into the working directory, which is the temporary folder during the benchmark
+    saver = RDFLibGraphSaver("merged", merged_graph, parsers[0].get_graphviz_graph())
+    stages = {
+        "ttl": saver.save_rdflib_graph_owl,
+        "jsonld": saver.save_rdflib_graph_jsonld,
+        "ntriples": saver.save_rdflib_graph_ntriples,
+        "ntriples_gz": lambda: saver.save_rdflib_graph_ntriples(compress=True),
+    }
+    if args.render:
+        stages["graphviz"] = saver.save_graphviz_graph
+    if args.pylode:
+        stages["html"] = saver.generate_pylode_html
+    for stage, function in stages.items():
+        _, elapsed, peak_memory = run_stage(function, args.memory)
+        record(stage, elapsed, peak_memory, len(merged_graph))
+    return results
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark every stage of building ontologies from synthetic FAIR sheets.")
+    argument_parser.add_argument('--entities', type=int, nargs='+', default=[1000, 10000], help='Number of entities, relationships and value types of every ontology')
+    argument_parser.add_argument('--prefixes', type=int, default=2, help='Number of ontologies that are parsed and merged')
+    argument_parser.add_argument('--depth', type=int, default=3, help='Length of the subclass chains of the entities')
+    argument_parser.add_argument('--external_namespaces', type=int, default=2, help='Number of external namespaces shared by the ontologies')
+    argument_parser.add_argument('--render', action='store_true', help='Also render the Graphviz graph, which needs the Graphviz executables')
+    argument_parser.add_argument('--pylode', action='store_true', help='Also generate the PyLODE documentation')
+    argument_parser.add_argument('--no_memory', dest='memory', action='store_false', help='Skip the second run of every stage that measures peak memory')
+    argument_parser.add_argument('--output', type=Path, help='JSON file the results are written to')
+    args = argument_parser.parse_args()
+
+    results = []
+    print(f"{'entities':>10} {'stage':>16} {'seconds':>10} {'peak MiB':>10} {'triples':>10}")
+    working_directory = os.getcwd()
+    for entities in args.entities:
+        with tempfile.TemporaryDirectory() as folder:
+            os.chdir(folder)
+            try:
+                with warnings.catch_warnings():
+                    # Every ontology defines the same local names, which the merge reports as conflicts
+                    warnings.simplefilter("ignore")
+                    results += benchmark(entities, args, folder)
+            finally:
+                os.chdir(working_directory)
+
+    if args.output is not None:
+        with open(args.output, "w") as output_file:
+            json.dump({
+                "version": BuildManifest.get_package_version(),
+                "python": platform.python_version(),
+                "prefixes": args.prefixes,
+                "results": results
+            }, output_file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmarks reloading built ontologies from binary NumPy snapshots against parsing their Turtle files.
+
+Usage:
+    python benchmarks/snapshot_benchmark.py [--entities 1000 10000]
+
+For every entity count a synthetic ontology is written with FairSheetGenerator and parsed. Its graph is saved as
+Turtle, as a .npz snapshot and as a folder of .npy files. Each is then loaded again: the Turtle file is parsed into a
+graph, and the snapshots are loaded into a graph with to_graph() and queried directly for all subclass triples.
+"""
+from pathlib import Path
+import argparse
+import gc
+import tempfile
+import time
+import warnings
+import graphviz
+from rdflib import Graph as rdfGraph
+from rdflib.namespace import RDFS
+from FAIRmaterials.fair_sheet_generator import FairSheetGenerator
+from FAIRmaterials.fair_sheet_parser import FairSheetParser
+from FAIRmaterials.graph_snapshot import GraphSnapshot
+
+def measure(function, *args):
+    gc.collect()
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark loading ontologies from snapshots against parsing Turtle.")
+    argument_parser.add_argument('--entities', type=int, nargs='+', default=[1000, 10000], help='Number of entities, relationships and value types of the ontology')
+    args = argument_parser.parse_args()
+
+    print(f"{'entities':>10} {'triples':>10} {'ttl s':>10} {'npz s':>10} {'npy s':>10} {'query s':>10}")
+    for entities in args.entities:
+        with tempfile.TemporaryDirectory() as folder:
+            folder = Path(folder)
+            FairSheetGenerator(entities=entities, relationships=entities, value_types=entities).generate(folder / "sheets")
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                graph = FairSheetParser(folder / "sheets", "Synthetic0", True, rdfGraph(), graphviz.Digraph(strict=False), False).get_rdf_graph()
+            graph.serialize(destination=str(folder / "graph.ttl"), format="ttl")
+            snapshot = GraphSnapshot.from_graph(graph)
+            snapshot.save(folder / "graph.npz")
+            snapshot.save(folder / "graph_snapshot")
+
+            ttl_time, ttl_graph = measure(lambda: rdfGraph().parse(folder / "graph.ttl", format="ttl"))
+            npz_time, npz_graph = measure(lambda: GraphSnapshot.load(folder / "graph.npz").to_graph())
+            npy_time, _ = measure(lambda: GraphSnapshot.load(folder / "graph_snapshot").to_graph())
+            query_time, _ = measure(lambda: GraphSnapshot.load(folder / "graph_snapshot").triples((None, RDFS.subClassOf, None)))
+            assert len(npz_graph) == len(ttl_graph)
+        print(f"{entities:>10} {len(graph):>10} {ttl_time:>10.2f} {npz_time:>10.2f} {npy_time:>10.2f} {query_time:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmarks building and merging several ontologies with a run-wide TermInterner against a table per parser.
+
+Usage:
+    python benchmarks/term_interning_benchmark.py [--entities 1000 10000] [--prefixes 4]
+
+For every entity count a synthetic set of FAIR sheets with several prefixes is written with FairSheetGenerator. The
+ontologies are built and merged twice:
+
+    separate   every FairSheetParser interns its terms in its own table and the merge does not intern,
+               as before the run-wide table existed
+    shared     all parsers and RDFLibGraphMerger.merge_many share one TermInterner, as in a run of FAIRmaterials
+
+Both are also measured for the graphs of the --jobs mode, which are pickled by the worker processes, so that every
+graph arrives with its own copies of all terms. The memory is the traced memory held by all graphs and the merged
+graph once the merge is done, measured with tracemalloc in a second run since tracing slows the code down.
+"""
+from pathlib import Path
+import argparse
+import gc
+import pickle
+import tempfile
+import time
+import tracemalloc
+import warnings
+import graphviz
+from rdflib import Graph as rdfGraph
+from FAIRmaterials.fair_sheet_generator import FairSheetGenerator
+from FAIRmaterials.fair_sheet_parser import FairSheetParser
+from FAIRmaterials.rdflib_graph_merger import RDFLibGraphMerger
+from FAIRmaterials.term_interner import TermInterner
+
+def build(folder, prefixes, shared, pickled):
+    term_interner = TermInterner() if shared else None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        graphs = [
+            FairSheetParser(folder, prefix, True, rdfGraph(), graphviz.Digraph(strict=False), False, term_interner=term_interner).get_rdf_graph()
+            for prefix in prefixes
+        ]
+        if pickled:
+            graphs = [pickle.loads(pickle.dumps(graph)) for graph in graphs]
+        return graphs, RDFLibGraphMerger.merge_many(graphs, term_interner=term_interner)
+
+def measure(function, *args):
+    gc.collect()
+    start = time.perf_counter()
+    function(*args)
+    seconds = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, current, result
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark a run-wide term interning table against a table per parser.")
+    argument_parser.add_argument('--entities', type=int, nargs='+', default=[1000, 10000], help='Number of entities, relationships and value types of every ontology')
+    argument_parser.add_argument('--prefixes', type=int, default=4, help='Number of ontologies that are merged')
+    args = argument_parser.parse_args()
+
+    print(f"{'entities':>10} {'graphs':>8} {'triples':>10} {'mode':>10} {'terms':>10} {'objects':>10} {'seconds':>10} {'memory MB':>10}")
+    for entities in args.entities:
+        with tempfile.TemporaryDirectory() as folder:
+            folder = Path(folder)
+            prefixes = FairSheetGenerator(entities=entities, relationships=entities, value_types=entities, prefixes=args.prefixes).generate(folder)
+            for pickled in (False, True):
+                for shared in (False, True):
+                    seconds, memory, (_, merged_graph) = measure(build, folder, prefixes, shared, pickled)
+                    mode = "shared" if shared else "separate"
+                    terms = [term for triple in merged_graph for term in triple]
+                    print(f"{entities:>10} {'pickled' if pickled else 'parsed':>8} {len(merged_graph):>10} {mode:>10} {len(set(terms)):>10} {len(set(map(id, terms))):>10} {seconds:>10.2f} {memory / 1024 / 1024:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmarks adding the triples of large FAIR sheets to an RDFLib graph one by one against buffering them and adding them with one addN call.
+
+Usage:
+    python benchmarks/triple_insertion_benchmark.py [--entities 10000 30000 100000]
+
+For every entity count a set of FAIR sheets is written to a temporary folder and parsed with FairSheetParser, which
+buffers the triples of every sheet. The triples the parser produced are then inserted again into empty graphs with
+Graph.add for every triple, as the parser did before, and with one deduplicated Graph.addN call during which garbage
+collection is paused, as the parser does now.
+"""
+from pathlib import Path
+import argparse
+import gc
+import tempfile
+import time
+import graphviz
+from rdflib import Graph as rdfGraph
+from rdflib.namespace import RDF, OWL
+from FAIRmaterials.fair_sheet_parser import FairSheetParser
+from FAIRmaterials.garbage_collection import paused_garbage_collection
+from property_parsing_benchmark import write_sheets
+
+def insert_one_by_one(triples):
+    graph = rdfGraph()
+    for triple in triples:
+        graph.add(triple)
+    return graph
+
+def insert_buffered(triples):
+    graph = rdfGraph()
+    buffer = dict.fromkeys(triples)
+    with paused_garbage_collection():
+        graph.addN((subject, predicate, obj, graph) for subject, predicate, obj in buffer)
+    return graph
+
+def measure(function, *args):
+    gc.collect()
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark triple insertion of large FAIR sheets.")
+    argument_parser.add_argument('--entities', type=int, nargs='+', default=[10000, 30000, 100000], help='Number of entities in the sheets')
+    args = argument_parser.parse_args()
+
+    print(f"{'entities':>10} {'triples':>10} {'parse s':>10} {'add s':>10} {'addN s':>10}")
+    for entities in args.entities:
+        with tempfile.TemporaryDirectory() as folder:
+            write_sheets(Path(folder), entities, entities)
+            parse_time, parser = measure(FairSheetParser, Path(folder), "", False, rdfGraph(), graphviz.Digraph(strict=False), False)
+
+        # Properties used to be typed twice, which the one-by-one path paid for on every property
+        triples = list(parser.get_rdf_graph())
+        triples += [triple for triple in triples if triple[1] == RDF.type and triple[2] in (OWL.ObjectProperty, OWL.DatatypeProperty)]
+
+        add_time, one_by_one_graph = measure(insert_one_by_one, triples)
+        add_n_time, buffered_graph = measure(insert_buffered, triples)
+        assert len(one_by_one_graph) == len(buffered_graph)
+        print(f"{entities:>10} {len(triples):>10} {parse_time:>10.2f} {add_time:>10.2f} {add_n_time:>10.2f}")
+
+if __name__ == "__main__":
+    main()
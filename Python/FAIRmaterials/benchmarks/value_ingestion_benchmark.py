@@ -0,0 +1,80 @@
+"""
+Benchmarks streaming value CSV files of growing size into N-Triples files of individuals.
+
+Usage:
+    python benchmarks/value_ingestion_benchmark.py [--rows 100000 1000000] [--columns 8] [--cache_size 250000] [--compress]
+
+A synthetic ontology is written with FairSheetGenerator and parsed. For every row count a value CSV is written whose
+columns are value types of the ontology, sorted by their domain, with random values drawn from a small set so that
+individuals repeat across rows. The file is then ingested with ValueCsvIngester. Every ingestion is timed on its own,
+then run again under tracemalloc to record its peak memory. The memory grows with the cache of written individuals
+until it holds --cache_size keys, and stays flat for larger files.
+"""
+from pathlib import Path
+import argparse
+import csv
+import gc
+import gzip
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import warnings
+import graphviz
+from rdflib import Graph as rdfGraph
+from FAIRmaterials.fair_sheet_generator import FairSheetGenerator
+from FAIRmaterials.fair_sheet_parser import FairSheetParser
+from FAIRmaterials.value_csv_ingester import ValueCsvIngester
+
+def write_values(path, headers, rows, seed=0):
+    randomizer = random.Random(seed)
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(headers)
+        for _ in range(rows):
+            writer.writerow([str(randomizer.randrange(1000)) for _ in headers])
+
+def measure(function, *args):
+    gc.collect()
+    start = time.perf_counter()
+    function(*args)
+    seconds = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak, result
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark streaming value CSV files into N-Triples files.")
+    argument_parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000], help='Number of rows of the value CSV file')
+    argument_parser.add_argument('--columns', type=int, default=8, help='Number of columns of the value CSV file')
+    argument_parser.add_argument('--cache_size', type=int, default=ValueCsvIngester.DEFAULT_MAX_CACHED_KEYS, help='Number of written individuals and links remembered to skip duplicates')
+    argument_parser.add_argument('--compress', action='store_true', help='Gzip-compress the N-Triples files')
+    args = argument_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        folder = Path(folder)
+        FairSheetGenerator(entities=100, relationships=100, value_types=max(args.columns, 100)).generate(folder)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            fair_sheet_parser = FairSheetParser(folder, "Synthetic0", False, rdfGraph(), graphviz.Digraph(strict=False), False)
+        headers = sorted((record.full_name for record in fair_sheet_parser.get_value_type_records() if not record.ontology), key=lambda name: name.split("(")[1])[:args.columns]
+        ingester = ValueCsvIngester(fair_sheet_parser, max_cached_keys=args.cache_size)
+
+        print(f"{'rows':>10} {'CSV MB':>10} {'triples':>10} {'seconds':>10} {'rows/s':>10} {'peak MB':>10}")
+        for rows in args.rows:
+            csv_path = folder / f"values{rows}.csv"
+            write_values(csv_path, headers, rows)
+            seconds, peak, output_path = measure(ingester.ingest, csv_path, folder / f"values{rows}.nt", args.compress)
+            with (gzip.open if args.compress else open)(output_path, "rb") as output_file:
+                triples = sum(1 for _ in output_file)
+            print(f"{rows:>10} {os.path.getsize(csv_path) / 1024 / 1024:>10.1f} {triples:>10} {seconds:>10.2f} {rows / seconds:>10.0f} {peak / 1024 / 1024:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -13,11 +13,12 @@ setup(
     install_requires=[
         'rdflib>=7.0.0',
         'pylode>=3.1.4',
-        'matplotlib>=3.6.2',
-        'numpy>=1.9.3',
         'graphviz>=0.20.1'
     ],
     extras_require={
+        'snapshot': [
+            'numpy>=1.21'
+        ],
         'dev': [
             'pytest',
             'pytest-cov'
@@ -0,0 +1,88 @@
+import os
+import pytest
+import graphviz
+from rdflib import Graph, Literal, URIRef
+from FAIRmaterials.__main__ import get_build_manifest, save_ontology
+from FAIRmaterials.build_manifest import BuildManifest
+from FAIRmaterials.fair_sheet_generator import FairSheetGenerator
+from FAIRmaterials.fair_sheet_parser import FairSheetParser
+from FAIRmaterials.graphviz_renderer import GraphvizRenderer
+from FAIRmaterials.render_pool import RenderPool
+
+@pytest.fixture
+def sheets(tmp_path):
+    paths = []
+    for name in ("- OntologyInfo.csv", "- NameSpace.csv"):
+        path = tmp_path / name
+        path.write_text(f"{name}\n")
+        paths.append(path)
+    return paths
+
+@pytest.fixture
+def output_folder(tmp_path):
+    folder = tmp_path / "TestOntology_output"
+    folder.mkdir()
+    graph = Graph()
+    graph.add((URIRef("http://example.com/ontology#Sample"), URIRef("http://www.w3.org/2000/01/rdf-schema#label"), Literal("Sample")))
+    graph.serialize(destination=str(folder / "TestOntology.ttl"), format="ttl")
+    (folder / "TestOntology.json").write_text("{}")
+    return str(folder)
+
+def build(sheets, output_folder, options=None):
+    manifest = BuildManifest(sheets, options or {"include_pylode_docs": False}, version="1.0")
+    manifest.write(output_folder, {
+        "ttl": os.path.join(output_folder, "TestOntology.ttl"),
+        "jsonld": os.path.join(output_folder, "TestOntology.json")
+    })
+
+def test_unchanged_inputs_are_up_to_date(sheets, output_folder):
+    build(sheets, output_folder)
+
+    assert BuildManifest(sheets, {"include_pylode_docs": False}, version="1.0").is_up_to_date(output_folder)
+    assert len(BuildManifest.load_graph(output_folder)) == 1
+
+def test_changed_inputs_are_rebuilt(sheets, output_folder):
+    build(sheets, output_folder)
+
+    assert not BuildManifest(sheets, {"include_pylode_docs": True}, version="1.0").is_up_to_date(output_folder)
+    assert not BuildManifest(sheets, {"include_pylode_docs": False}, version="1.1").is_up_to_date(output_folder)
+    sheets[1].write_text("changed\n")
+    assert not BuildManifest(sheets, {"include_pylode_docs": False}, version="1.0").is_up_to_date(output_folder)
+
+def test_missing_outputs_are_rebuilt(sheets, output_folder, tmp_path):
+    assert not BuildManifest(sheets, {"include_pylode_docs": False}, version="1.0").is_up_to_date(str(tmp_path / "missing"))
+
+    build(sheets, output_folder)
+    os.remove(os.path.join(output_folder, "TestOntology.json"))
+
+    assert not BuildManifest(sheets, {"include_pylode_docs": False}, version="1.0").is_up_to_date(output_folder)
+
+def test_remove(sheets, output_folder):
+    build(sheets, output_folder)
+    BuildManifest.remove(output_folder)
+    BuildManifest.remove(output_folder)
+
+    assert BuildManifest.read(output_folder) is None
+
+@pytest.mark.parametrize("render_workers", [0, 1])
+def test_timed_out_render_leaves_build_incomplete(tmp_path, monkeypatch, render_workers):
+    def render(self, graphviz_graph, file_path, output_format=None):
+        raise TimeoutError("The layout did not finish")
+    monkeypatch.setattr(GraphvizRenderer, "render", render)
+    FairSheetGenerator(entities=5, relationships=5, value_types=5).generate(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    parser = FairSheetParser(tmp_path, "Synthetic0", False, Graph(), graphviz.Digraph(strict=False), False)
+    build_manifest = get_build_manifest(tmp_path, "Synthetic0", False, False, False)
+    # The manifest of a previous, complete build of the same sheets must not survive
+    os.makedirs("Synthetic0_output")
+    build_manifest.write("Synthetic0_output", {"ttl": "Synthetic0.ttl"})
+
+    with pytest.warns(UserWarning, match="graphviz missing"):
+        if render_workers:
+            with RenderPool(render_workers) as render_pool:
+                save_ontology(parser, build_manifest, False, render_pool=render_pool)
+        else:
+            save_ontology(parser, build_manifest, False)
+
+    assert BuildManifest.read("Synthetic0_output") is None
+    assert not build_manifest.is_up_to_date("Synthetic0_output")
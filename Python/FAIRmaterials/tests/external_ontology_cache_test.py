@@ -0,0 +1,72 @@
+import pytest
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import RDF, OWL, SKOS
+from FAIRmaterials.external_ontology_cache import ExternalOntologyCache
+
+def write_ontology(path, terms):
+    graph = Graph()
+    for term, definition in terms.items():
+        graph.add((URIRef("http://example.org/onto#" + term), RDF.type, OWL.Class))
+        graph.add((URIRef("http://example.org/onto#" + term), SKOS.definition, Literal(definition)))
+    graph.serialize(destination=str(path), format="ttl")
+    return str(path)
+
+@pytest.fixture
+def ontology_file(tmp_path):
+    return write_ontology(tmp_path / "onto.ttl", {"Sample": "A sample", "Tool": "A tool"})
+
+def test_load_keeps_only_imported_triples(tmp_path, ontology_file):
+    cache = ExternalOntologyCache(tmp_path / "cache")
+
+    graph = cache.load(ontology_file)
+
+    assert len(graph) == 2
+    assert (URIRef("http://example.org/onto#Sample"), SKOS.definition, Literal("A sample")) in graph
+    assert cache.get_cached_sources() == [ontology_file]
+
+def test_load_reuses_unchanged_content(tmp_path, ontology_file, monkeypatch):
+    cache = ExternalOntologyCache(tmp_path / "cache")
+    cache.load(ontology_file)
+
+    # Unchanged content must not be parsed as Turtle again
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("Turtle content was parsed again")
+    monkeypatch.setattr("FAIRmaterials.external_ontology_cache.ExternalOntologyCache._ExternalOntologyCache__store", fail_parse)
+
+    graph = cache.load(ontology_file)
+    assert (URIRef("http://example.org/onto#Tool"), SKOS.definition, Literal("A tool")) in graph
+
+def test_load_refreshes_changed_content(tmp_path, ontology_file):
+    cache = ExternalOntologyCache(tmp_path / "cache")
+    cache.load(ontology_file)
+
+    write_ontology(ontology_file, {"Sample": "An updated sample"})
+    graph = cache.load(ontology_file)
+
+    assert len(graph) == 1
+    assert (URIRef("http://example.org/onto#Sample"), SKOS.definition, Literal("An updated sample")) in graph
+
+def test_offline_mode(tmp_path, ontology_file):
+    ExternalOntologyCache(tmp_path / "cache").load(ontology_file)
+    offline_cache = ExternalOntologyCache(tmp_path / "cache", offline=True)
+
+    # Cached ontologies are loaded without touching the source
+    write_ontology(ontology_file, {"Sample": "An updated sample"})
+    graph = offline_cache.load(ontology_file)
+    assert (URIRef("http://example.org/onto#Sample"), SKOS.definition, Literal("A sample")) in graph
+
+    with pytest.raises(LookupError):
+        offline_cache.load("http://example.org/not-cached.ttl")
+
+def test_eviction_of_least_recently_used(tmp_path):
+    first = write_ontology(tmp_path / "first.ttl", {"First": "x" * 100})
+    second = write_ontology(tmp_path / "second.ttl", {"Second": "x" * 100})
+    third = write_ontology(tmp_path / "third.ttl", {"Third": "x" * 100})
+    cache = ExternalOntologyCache(tmp_path / "cache", max_size=400)
+
+    cache.load(first)
+    cache.load(second)
+    cache.load(first)
+    cache.load(third)
+
+    assert cache.get_cached_sources() == [first, third]
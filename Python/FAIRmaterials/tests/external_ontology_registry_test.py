@@ -0,0 +1,179 @@
+import pickle
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import SKOS
+from FAIRmaterials.external_ontology_cache import ExternalOntologyCache
+from FAIRmaterials.external_ontology_registry import ExternalOntologyRegistry
+
+class CountingRegistry(ExternalOntologyRegistry):
+    def __init__(self):
+        super().__init__()
+        self.loaded_sources = []
+
+    def load(self, source):
+        self.loaded_sources.append(source)
+        time.sleep(0.05)
+        if source == "broken.ttl":
+            raise ValueError("broken ontology")
+        graph = Graph()
+        graph.add((URIRef("http://example.org/onto#" + source), SKOS.definition, Literal(source)))
+        return graph
+
+def test_get_loads_each_ontology_once():
+    registry = CountingRegistry()
+
+    first = registry.get("a.ttl")
+    second = registry.get("a.ttl")
+    registry.get("b.ttl")
+
+    assert first is second
+    assert registry.loaded_sources == ["a.ttl", "b.ttl"]
+    assert registry.get_loaded_sources() == ["a.ttl", "b.ttl"]
+
+def test_concurrent_gets_are_deduplicated():
+    registry = CountingRegistry()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("a.ttl"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert registry.loaded_sources == ["a.ttl"]
+    assert all(result is results[0] for result in results)
+
+def test_failed_loads_are_not_retried():
+    registry = CountingRegistry()
+    assert registry.prefetch(["broken.ttl", "a.ttl"]) == {"broken.ttl": False, "a.ttl": True}
+
+    with pytest.raises(ValueError):
+        registry.get("broken.ttl")
+    assert sorted(registry.loaded_sources) == ["a.ttl", "broken.ttl"]
+    assert registry.get_loaded_sources() == ["a.ttl"]
+
+def test_pickled_registry_keeps_loaded_ontologies(tmp_path):
+    ontology_path = tmp_path / "onto.ttl"
+    ontology_path.write_text('<http://example.org/onto#Sample> <http://www.w3.org/2004/02/skos/core#definition> "A sample" .\n')
+    registry = ExternalOntologyRegistry()
+    registry.prefetch([str(ontology_path), str(tmp_path / "missing.ttl")])
+
+    copy = pickle.loads(pickle.dumps(registry))
+
+    # The copy must not touch the sources again
+    ontology_path.unlink()
+    assert (URIRef("http://example.org/onto#Sample"), SKOS.definition, Literal("A sample")) in copy.get(str(ontology_path))
+    with pytest.raises(RuntimeError):
+        copy.get(str(tmp_path / "missing.ttl"))
+
+def turtle_for(name):
+    return '<http://example.org/onto#{0}> <http://www.w3.org/2004/02/skos/core#definition> "{0}" .\n'.format(name).encode("utf-8")
+
+class OntologyRequestHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for the servers hosting external ontologies.
+    """
+
+    def do_GET(self):
+        name = self.path.strip("/").split(".")[0]
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        if name == "slow":
+            time.sleep(1)
+        if name == "flaky" and sum(1 for path, _ in self.server.requests if path == self.path) == 1:
+            self.send_response(503)
+            self.end_headers()
+            return
+        if name == "missing":
+            self.send_response(404)
+            self.end_headers()
+            return
+        if name == "etag" and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = turtle_for(name)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/turtle")
+        self.send_header("Content-Length", str(len(body)))
+        if name == "etag":
+            self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def ontology_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OntologyRequestHandler)
+    server.daemon_threads = True
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, "http://127.0.0.1:{}".format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+def test_prefetch_from_http_server(ontology_server):
+    server, url = ontology_server
+    sources = [url + "/c.ttl", url + "/a.ttl", url + "/missing.ttl", url + "/b.ttl"]
+    registry = ExternalOntologyRegistry(retries=0, max_workers=4)
+
+    results = registry.prefetch(sources)
+
+    # Results come back in the order of the sources, whatever order the loads finished in
+    assert list(results.items()) == [(sources[0], True), (sources[1], True), (sources[2], False), (sources[3], True)]
+    assert (URIRef("http://example.org/onto#a"), SKOS.definition, Literal("a")) in registry.get(sources[1])
+    assert len(server.requests) == 4
+
+def test_per_host_timeout_and_retries(ontology_server):
+    server, url = ontology_server
+    registry = ExternalOntologyRegistry(timeout=5, host_timeouts={"127.0.0.1": 0.2}, retries=1)
+
+    assert registry.get_timeout(url + "/slow.ttl") == 0.2
+    assert registry.get_timeout("http://example.org/onto.ttl") == 5
+    assert registry.prefetch([url + "/slow.ttl", url + "/flaky.ttl"]) == {url + "/slow.ttl": False, url + "/flaky.ttl": True}
+    assert [path for path, _ in server.requests].count("/flaky.ttl") == 2
+
+def test_prefetch_deadline(ontology_server):
+    server, url = ontology_server
+    registry = ExternalOntologyRegistry(retries=0)
+
+    start = time.perf_counter()
+    results = registry.prefetch([url + "/slow.ttl", url + "/fast.ttl"], deadline=0.5)
+
+    assert time.perf_counter() - start < 0.9
+    assert results == {url + "/slow.ttl": False, url + "/fast.ttl": True}
+    with pytest.raises(TimeoutError):
+        registry.get(url + "/slow.ttl")
+
+def test_cache_revalidates_with_etag(ontology_server, tmp_path):
+    server, url = ontology_server
+    cache = ExternalOntologyCache(tmp_path / "cache")
+
+    ExternalOntologyRegistry(cache).get(url + "/etag.ttl")
+    graph = ExternalOntologyRegistry(cache).get(url + "/etag.ttl")
+
+    assert server.requests == [("/etag.ttl", None), ("/etag.ttl", '"v1"')]
+    assert (URIRef("http://example.org/onto#etag"), SKOS.definition, Literal("etag")) in graph
+
+def test_concurrent_prefetch_through_one_cache(tmp_path):
+    sources = []
+    for index in range(200):
+        path = tmp_path / f"onto{index}.ttl"
+        path.write_text(f'<http://example.org/onto#Term{index}> <http://www.w3.org/2004/02/skos/core#definition> "Term {index}" .\n')
+        sources.append(str(path))
+    cache = ExternalOntologyCache(tmp_path / "cache")
+    registry = ExternalOntologyRegistry(cache, max_workers=16)
+
+    assert registry.prefetch(sources) == {source: True for source in sources}
+    assert sorted(cache.get_cached_sources()) == sorted(sources)
+    assert not list((tmp_path / "cache").glob("*.tmp"))
+
+    # A second prefetch loads every ontology from the cache and keeps every entry
+    second_registry = ExternalOntologyRegistry(cache, max_workers=16)
+    assert second_registry.prefetch(sources) == {source: True for source in sources}
+    assert sorted(cache.get_cached_sources()) == sorted(sources)
+    assert len(second_registry.get(sources[0])) == 1
@@ -0,0 +1,49 @@
+import filecmp
+import pytest
+import graphviz
+from rdflib import Graph as rdfGraph, URIRef, Literal
+from rdflib.namespace import RDF, RDFS, OWL, SKOS
+from FAIRmaterials.fair_sheet_generator import FairSheetGenerator
+from FAIRmaterials.fair_sheet_parser import FairSheetParser
+
+def parse(folder_path, prefix, add_external_onto_info=False):
+    return FairSheetParser(folder_path, prefix, True, rdfGraph(), graphviz.Digraph(strict=False), add_external_onto_info)
+
+def test_generate(tmp_path):
+    generator = FairSheetGenerator(entities=40, depth=4, relationships=20, value_types=30, external_namespaces=2, prefixes=2)
+
+    prefixes = generator.generate(tmp_path)
+
+    assert prefixes == ["Synthetic0", "Synthetic1"]
+    assert len(list(tmp_path.iterdir())) == 10
+    parser = parse(tmp_path, "Synthetic0")
+    graph = parser.get_rdf_graph()
+    assert len(parser.get_entity_records()) == 40
+    assert len(set(graph.subjects(RDF.type, OWL.Class))) == 40
+    assert len(set(graph.subjects(RDF.type, OWL.ObjectProperty))) == 20
+    assert len(set(graph.subjects(RDF.type, OWL.DatatypeProperty))) == 30
+    # Chains of four entities have three subclass links each
+    assert len(list(graph.triples((None, RDFS.subClassOf, None)))) == 30
+    assert (URIRef("http://example.com/synthetic/external1/Entity9"), RDF.type, OWL.Class) in graph
+
+def test_generate_is_deterministic(tmp_path):
+    FairSheetGenerator(entities=20, prefixes=1, seed=3).generate(tmp_path / "first")
+    FairSheetGenerator(entities=20, prefixes=1, seed=3).generate(tmp_path / "second")
+
+    _, mismatch, errors = filecmp.cmpfiles(tmp_path / "first", tmp_path / "second", [path.name for path in (tmp_path / "first").iterdir()], shallow=False)
+    assert mismatch == [] and errors == []
+
+def test_generate_external_ontology_files(tmp_path):
+    FairSheetGenerator(entities=20, relationships=10, value_types=10, external_namespaces=1, external_ontology_files=True).generate(tmp_path)
+
+    graph = parse(tmp_path, "Synthetic0", add_external_onto_info=True).get_rdf_graph()
+
+    assert (tmp_path / "external" / "ext0.ttl").exists()
+    assert (URIRef("http://example.com/synthetic/external0/Entity19"), SKOS.definition, Literal("External definition of Entity19")) in graph
+    assert (URIRef("http://example.com/synthetic/external0/relation9"), SKOS.altLabel, Literal("External relation9")) in graph
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        FairSheetGenerator(entities=0)
+    with pytest.raises(ValueError):
+        FairSheetGenerator(relationships=-1)
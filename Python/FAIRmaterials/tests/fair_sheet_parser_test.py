@@ -1,7 +1,11 @@
 import pytest
 import csv
-from rdflib import Namespace
+import zipfile
+import warnings
+from rdflib import Namespace, Literal, URIRef
+from rdflib.namespace import RDFS, SKOS
 from FAIRmaterials.fair_sheet_parser import FairSheetParser
+from FAIRmaterials.external_ontology_registry import ExternalOntologyRegistry
 from rdflib import Graph as rdfGraph
 import graphviz
 
@@ -139,3 +143,158 @@ def test_init(create_test_files):
         "owl": Namespace("http://www.w3.org/2002/07/owl#"),
         "TestOntology": Namespace("http://example.com/ontology#")
     }
+
+def test_zip_input_csv_files(create_test_files, tmp_path):
+    # Arrange
+    parser = FairSheetParser(create_test_files, "", False, rdfGraph(), graphviz.Digraph(strict=False), False)
+    output_folder = tmp_path / "TestOntology_output"
+
+    # Act
+    zip_file_name = parser.zip_input_csv_files(str(output_folder))
+
+    # Assert
+    assert zip_file_name == str(output_folder / "input_sheets.zip")
+    with zipfile.ZipFile(zip_file_name) as zipf:
+        assert sorted(zipf.namelist()) == sorted([
+            "- OntologyInfo.csv",
+            "- RelationshipDefinitions.csv",
+            "- ValueTypeDefinitions.csv",
+            "- NameSpace.csv",
+            "- VariableDefinitions.csv"
+        ])
+
+def test_shared_external_ontology_registry(create_test_files, tmp_path):
+    # Arrange
+    ontology_path = tmp_path / "pmdco.ttl"
+    ontology_path.write_text(
+        '<https://w3id.org/pmd/co/Identifier> <http://www.w3.org/2004/02/skos/core#definition> "An identifier" .\n'
+        '<https://w3id.org/pmd/co/Identifier> <http://www.w3.org/2000/01/rdf-schema#comment> "Not imported" .\n'
+    )
+    with open(create_test_files / "- NameSpace.csv", "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=["Prefix Name", "Ontology URL", "Ontology Info"])
+        writer.writeheader()
+        for data in namespace_data:
+            writer.writerow(dict(data, **({"Ontology Info": str(ontology_path)} if data["Prefix Name"] == "PMDCo" else {})))
+    registry = ExternalOntologyRegistry()
+
+    # Act
+    first = FairSheetParser(create_test_files, "", False, rdfGraph(), graphviz.Digraph(strict=False), True, external_ontology_registry=registry)
+    ontology_path.unlink()
+    second = FairSheetParser(create_test_files, "", False, rdfGraph(), graphviz.Digraph(strict=False), True, external_ontology_registry=registry)
+
+    # Assert
+    assert FairSheetParser.get_external_ontology_sources(create_test_files, "") == [str(ontology_path)]
+    for parser in (first, second):
+        graph = parser.get_rdf_graph()
+        assert (URIRef("https://w3id.org/pmd/co/Identifier"), SKOS.definition, Literal("An identifier")) in graph
+        assert (URIRef("https://w3id.org/pmd/co/Identifier"), RDFS.comment, Literal("Not imported")) not in graph
+
+def test_data_property_definition(create_test_files):
+    # Arrange
+    with open(create_test_files / "- ValueTypeDefinitions.csv", "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=["ValueType Name", "Belongs to Ontology", "Domain", "Range", "Definition of Property", "Logical Axioms", "Alternative Name(s)", "fullName"])
+        writer.writeheader()
+        writer.writerow({})
+        writer.writerow({
+            "ValueType Name": "IdentifierValue",
+            "Domain": "PMDCo:Identifier",
+            "Range": "xsd:string",
+            "Definition of Property": "The value of an identifier",
+            "fullName": "IdentifierValue"
+        })
+
+    # Act
+    parser = FairSheetParser(create_test_files, "", False, rdfGraph(), graphviz.Digraph(strict=False), False)
+
+    # Assert
+    property_uri = URIRef("http://example.com/ontology#IdentifierValue")
+    assert [record.full_name for record in parser.get_value_type_records()] == ["IdentifierValue"]
+    assert (property_uri, SKOS.definition, Literal("The value of an identifier")) in parser.get_rdf_graph()
+
+def test_repeated_relationships(create_test_files):
+    # Arrange
+    with open(create_test_files / "- RelationshipDefinitions.csv", "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=["Relationship Name", "Belongs to Ontology", "Domain", "Range", "Definition", "Logical Axioms", "Alternative Name(s)", "fullName"])
+        writer.writeheader()
+        writer.writerow({})
+        for _ in range(2):
+            writer.writerow({
+                "Relationship Name": "hasIdentifier",
+                "Domain": "PMDCo:Identifier",
+                "Range": "PMDCo:Identifier",
+                "fullName": "hasIdentifier"
+            })
+
+    # Act
+    parser = FairSheetParser(create_test_files, "", False, rdfGraph(), graphviz.Digraph(strict=False), False)
+
+    # Assert
+    property_uri = URIRef("http://example.com/ontology#hasIdentifier")
+    assert len(list(parser.get_rdf_graph().triples((property_uri, RDFS.label, None)))) == 1
+    assert parser.get_property_links("PMDCo:Identifier", "PMDCo:Identifier") == [property_uri, property_uri]
+    assert parser.get_property_links("PMDCo:Identifier", "xsd:float") == []
+
+def write_value_types(folder, rows):
+    with open(folder / "- ValueTypeDefinitions.csv", "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=["ValueType Name", "Belongs to Ontology", "Domain", "Range", "Definition of Property", "Logical Axioms", "Alternative Name(s)", "fullName"])
+        writer.writeheader()
+        writer.writerow({})
+        for row in rows:
+            writer.writerow(row)
+
+def test_rebuild_value_types(create_test_files):
+    # Arrange
+    write_value_types(create_test_files, [{"ValueType Name": "IdentifierValue", "Domain": "PMDCo:Identifier", "Range": "xsd:string", "fullName": "IdentifierValue"}])
+    parser = FairSheetParser(create_test_files, "", True, rdfGraph(), graphviz.Digraph(strict=False), False)
+    entity_triples = set(parser.get_rdf_graph().triples((URIRef("https://w3id.org/pmd/co/Identifier"), None, None)))
+    write_value_types(create_test_files, [{"ValueType Name": "IdentifierCode", "Domain": "PMDCo:Identifier", "Range": "xsd:integer", "fullName": "IdentifierCode"}])
+
+    # Act
+    rebuilt_sheets = parser.rebuild(["value_type"])
+    fresh_parser = FairSheetParser(create_test_files, "", True, rdfGraph(), graphviz.Digraph(strict=False), False)
+
+    # Assert
+    assert rebuilt_sheets == {"value_type"}
+    assert parser.get_rdf_graph().isomorphic(fresh_parser.get_rdf_graph())
+    assert parser.get_graphviz_graph().body == fresh_parser.get_graphviz_graph().body
+    assert set(parser.get_rdf_graph().triples((URIRef("https://w3id.org/pmd/co/Identifier"), None, None))) == entity_triples
+    assert (URIRef("http://example.com/ontology#IdentifierValue"), None, None) not in parser.get_rdf_graph()
+    assert parser.get_property_links("PMDCo:Identifier", "xsd:integer") == [URIRef("http://example.com/ontology#IdentifierCode")]
+
+def write_entities(folder, rows):
+    with open(folder / "- VariableDefinitions.csv", "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=["Variable Name", "Belongs to Ontology", "Parent Variable", "Definition of Variable", "Alternative Name(s)", "Unit", "Logical Axioms", "fullName"])
+        writer.writeheader()
+        writer.writerow({})
+        for row in rows:
+            writer.writerow(row)
+
+def test_rebuild_renamed_entity(create_test_files):
+    # Arrange
+    write_entities(create_test_files, [{"Variable Name": "Sample-1", "Belongs to Ontology": "PMDCo", "fullName": "PMDCo:Sample-1"}])
+    parser = FairSheetParser(create_test_files, "", True, rdfGraph(), graphviz.Digraph(strict=False), False)
+    write_entities(create_test_files, [{"Variable Name": "Sample1", "Belongs to Ontology": "PMDCo", "fullName": "PMDCo:Sample1"}])
+
+    # Act
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        parser.rebuild(["entity"])
+    fresh_parser = FairSheetParser(create_test_files, "", True, rdfGraph(), graphviz.Digraph(strict=False), False)
+
+    # Assert
+    # The node ID of the retracted entity is not kept, so the renamed entity gets the ID of a fresh build
+    assert parser.get_graphviz_node_ids().get_collisions() == {}
+    assert parser.get_graphviz_graph().body == fresh_parser.get_graphviz_graph().body
+
+def test_rebuild_dependent_sheets(create_test_files):
+    # Arrange
+    parser = FairSheetParser(create_test_files, "", False, rdfGraph(), graphviz.Digraph(strict=False), False)
+
+    # Act and Assert
+    assert parser.rebuild(["relationship"]) == {"relationship"}
+    assert parser.rebuild(["entity"]) == {"entity", "relationship", "value_type"}
+    assert parser.rebuild(["namespace", "value_type"]) == {"namespace", "entity", "relationship", "value_type"}
+    assert parser.rebuild(["ontology_info"]) == {"ontology_info", "namespace", "entity", "relationship", "value_type"}
+    assert parser.get_rdf_graph().isomorphic(FairSheetParser(create_test_files, "", False, rdfGraph(), graphviz.Digraph(strict=False), False).get_rdf_graph())
+    with pytest.raises(ValueError):
+        parser.rebuild(["values"])
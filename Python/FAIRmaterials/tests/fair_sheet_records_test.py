@@ -0,0 +1,56 @@
+import pickle
+import pytest
+from FAIRmaterials.fair_sheet_records import (
+    EntityRecord, NamespaceRecord, read_entities, read_namespaces, read_ontology_info, read_value_types
+)
+
+def write_sheet(path, text):
+    path.write_text(text)
+    return path
+
+def test_read_ontology_info(tmp_path):
+    path = write_sheet(tmp_path / "- OntologyInfo.csv",
+        "Ontology Name,TestOntology\n"
+        "Ontology URI,http://example.com/ontology#\n"
+        "Ontology Version,1.0\n"
+        "Ontology Author(s),\"John Doe, Jane Smith\"\n"
+        "Ontology Description,A test ontology\n")
+
+    info = read_ontology_info(path)
+
+    assert info.name == "TestOntology"
+    assert info.base_uri == "http://example.com/ontology#"
+    assert info.authors == "John Doe, Jane Smith"
+
+def test_read_entities_skips_description_and_blank_rows(tmp_path):
+    path = write_sheet(tmp_path / "- VariableDefinitions.csv",
+        "Variable Name,Belongs to Ontology,Parent Variable,Definition of Variable,Alternative Name(s),Unit,fullName\n"
+        "Name of the variable,Prefix,Parent,Definition,Alt names,Unit,Full name\n"
+        "Sample,,,A sample,\"Specimen,Piece\",,Sample\n"
+        "\n"
+        "Length,,Sample,,,qudt:M,Length\n")
+
+    records = read_entities(path)
+
+    assert records == [
+        EntityRecord("Sample", "", "", "A sample", ("Specimen", "Piece"), "", "Sample"),
+        EntityRecord("Length", "", "Sample", "", ("",), "qudt:M", "Length")
+    ]
+
+def test_read_short_rows_and_missing_columns(tmp_path):
+    path = write_sheet(tmp_path / "- NameSpace.csv",
+        "Prefix Name,Ontology URL,Ontology Info\n"
+        "Description,Description,Description\n"
+        "owl,http://www.w3.org/2002/07/owl#\n")
+
+    assert read_namespaces(path) == [NamespaceRecord("owl", "http://www.w3.org/2002/07/owl#", "")]
+
+    with pytest.raises(KeyError):
+        read_value_types(path)
+
+def test_records_are_hashable_and_picklable():
+    record = EntityRecord("Sample", "", "", "A sample", ("",), "", "Sample")
+
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert len({record, EntityRecord("Sample", "", "", "A sample", ("",), "", "Sample")}) == 1
+    assert not hasattr(record, "__dict__")
@@ -0,0 +1,44 @@
+import gc
+import threading
+import pytest
+from FAIRmaterials.garbage_collection import paused_garbage_collection
+
+@pytest.fixture
+def gc_enabled():
+    gc.enable()
+    yield
+    gc.enable()
+
+def test_nested_pauses(gc_enabled):
+    with paused_garbage_collection():
+        assert not gc.isenabled()
+        with paused_garbage_collection():
+            assert not gc.isenabled()
+        # The outer pause is still running
+        assert not gc.isenabled()
+    assert gc.isenabled()
+
+def test_disabled_collection_stays_disabled(gc_enabled):
+    gc.disable()
+    with paused_garbage_collection():
+        pass
+    assert not gc.isenabled()
+
+def test_overlapping_pauses_of_threads(gc_enabled):
+    started, release = threading.Event(), threading.Event()
+
+    def pause():
+        with paused_garbage_collection():
+            started.set()
+            release.wait()
+
+    thread = threading.Thread(target=pause)
+    thread.start()
+    started.wait()
+    # A pause ending while another thread's pause is running must not enable the collection
+    with paused_garbage_collection():
+        pass
+    assert not gc.isenabled()
+    release.set()
+    thread.join()
+    assert gc.isenabled()
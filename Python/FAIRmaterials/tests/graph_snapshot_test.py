@@ -0,0 +1,69 @@
+import os
+import numpy as np
+import pytest
+from rdflib import Graph, Literal, URIRef, BNode
+from rdflib.namespace import RDF, RDFS, OWL, SKOS, XSD
+from FAIRmaterials.graph_snapshot import GraphSnapshot
+from FAIRmaterials.rdflib_graph_saver import RDFLibGraphSaver
+from FAIRmaterials.build_manifest import BuildManifest
+
+EX = "http://example.com/ontology#"
+
+@pytest.fixture
+def graph():
+    graph = Graph()
+    graph.bind("ex", EX)
+    sample = URIRef(EX + "Sample")
+    graph.add((sample, RDF.type, OWL.Class))
+    graph.add((sample, RDFS.label, Literal("Sample")))
+    graph.add((sample, SKOS.altLabel, Literal("Échantillon", lang="fr")))
+    graph.add((sample, SKOS.altLabel, Literal("Sample", lang="en")))
+    graph.add((sample, URIRef(EX + "count"), Literal("3", datatype=XSD.integer)))
+    graph.add((sample, URIRef(EX + "part"), BNode("part1")))
+    graph.add((URIRef(EX + "Part"), RDFS.subClassOf, sample))
+    return graph
+
+@pytest.mark.parametrize("file_name", ["graph.npz", "graph_snapshot"])
+def test_save_and_load(graph, tmp_path, file_name):
+    GraphSnapshot.from_graph(graph).save(tmp_path / file_name)
+
+    snapshot = GraphSnapshot.load(tmp_path / file_name)
+    loaded = snapshot.to_graph()
+
+    assert len(snapshot) == len(graph)
+    assert set(loaded) == set(graph)
+    assert dict(loaded.namespaces())["ex"] == URIRef(EX)
+
+def test_triples(graph):
+    snapshot = GraphSnapshot.from_graph(graph)
+    sample = URIRef(EX + "Sample")
+
+    assert sorted(snapshot.triples((sample, SKOS.altLabel, None))) == sorted(graph.triples((sample, SKOS.altLabel, None)))
+    assert snapshot.triples((None, None, Literal("Sample", lang="en"))) == [(sample, SKOS.altLabel, Literal("Sample", lang="en"))]
+    # A literal with the same text but another datatype is a different term
+    assert snapshot.triples((None, None, Literal("3"))) == []
+    assert snapshot.triples((URIRef(EX + "Unknown"), None, None)) == []
+    assert len(snapshot.triples()) == len(graph)
+
+def test_triples_of_loaded_snapshot(graph, tmp_path):
+    GraphSnapshot.from_graph(graph).save(tmp_path / "graph_snapshot")
+
+    snapshot = GraphSnapshot.load(tmp_path / "graph_snapshot", mmap=True)
+
+    assert snapshot.triples((None, RDFS.subClassOf, None)) == [(URIRef(EX + "Part"), RDFS.subClassOf, URIRef(EX + "Sample"))]
+
+def test_unsupported_version(graph, tmp_path):
+    GraphSnapshot.from_graph(graph).save(tmp_path / "graph_snapshot")
+    np.save(tmp_path / "graph_snapshot" / "format_version.npy", np.array([GraphSnapshot.FORMAT_VERSION + 1], dtype=np.int32))
+
+    with pytest.raises(ValueError):
+        GraphSnapshot.load(tmp_path / "graph_snapshot")
+
+def test_saved_snapshot_is_loaded_by_manifest(graph, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    outputs = RDFLibGraphSaver("TestOntology", graph, None).save_all(include_graphviz=False, snapshot_format="npz")
+    BuildManifest([], {}, version="1.0").write("TestOntology_output", outputs)
+
+    assert os.path.basename(outputs["snapshot"]) == "TestOntology.npz"
+    assert BuildManifest.read("TestOntology_output")["snapshot"] == "TestOntology.npz"
+    assert set(BuildManifest.load_graph("TestOntology_output")) == set(graph)
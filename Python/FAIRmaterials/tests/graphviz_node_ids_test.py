@@ -0,0 +1,33 @@
+import pytest
+from rdflib import URIRef
+from FAIRmaterials.graphviz_node_ids import GraphvizNodeIds
+
+def test_get_sanitizes_and_memoizes():
+    node_ids = GraphvizNodeIds()
+
+    assert node_ids.get(URIRef("http://example.com/ontology#Sample")) == "httpexamplecomontologySample"
+    assert node_ids.get("http://example.com/ontology#Sample") == "httpexamplecomontologySample"
+    assert node_ids.get_collisions() == {}
+
+def test_collisions_get_numbered_ids():
+    node_ids = GraphvizNodeIds()
+    node_ids.get("http://example.com/ontology#Sample-1")
+
+    with pytest.warns(UserWarning, match="httpexamplecomontologySample1"):
+        assert node_ids.get("http://example.com/ontology#Sample1") == "httpexamplecomontologySample1_2"
+    with pytest.warns(UserWarning):
+        assert node_ids.get("http://example.com/ontology/Sample1") == "httpexamplecomontologySample1_3"
+
+    # Repeated lookups return the assigned ID without warning again
+    assert node_ids.get("http://example.com/ontology#Sample1") == "httpexamplecomontologySample1_2"
+    assert node_ids.get_collisions() == {
+        "http://example.com/ontology#Sample1": "httpexamplecomontologySample1_2",
+        "http://example.com/ontology/Sample1": "httpexamplecomontologySample1_3"
+    }
+
+def test_find_does_not_assign():
+    node_ids = GraphvizNodeIds()
+    node_ids.get("http://example.com/ontology#Sample")
+
+    assert node_ids.find(URIRef("http://example.com/ontology#Sample")) == "httpexamplecomontologySample"
+    assert node_ids.find("http://example.com/ontology#Tool") is None
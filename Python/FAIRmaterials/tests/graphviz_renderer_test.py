@@ -0,0 +1,138 @@
+import subprocess
+import warnings
+import pytest
+import graphviz
+from rdflib import Graph as rdfGraph, Namespace
+from rdflib.namespace import RDF, RDFS, OWL
+from FAIRmaterials.graphviz_node_ids import GraphvizNodeIds
+from FAIRmaterials.graphviz_renderer import GraphvizRenderer
+
+EX = Namespace("http://example.org/ex#")
+OTHER = Namespace("http://example.org/other#")
+
+@pytest.fixture
+def graphs():
+    rdflib_graph = rdfGraph()
+    rdflib_graph.bind("ex", EX)
+    rdflib_graph.bind("other", OTHER)
+    for class_uri in (EX.Root, EX.Child, EX.Second, OTHER.Thing):
+        rdflib_graph.add((class_uri, RDF.type, OWL.Class))
+    rdflib_graph.add((EX.Child, RDFS.subClassOf, EX.Root))
+
+    # Class nodes are named by their sanitized URIs, like in FairSheetParser
+    root, child, second, thing = "httpexampleorgexRoot", "httpexampleorgexChild", "httpexampleorgexSecond", "httpexampleorgotherThing"
+    graphviz_graph = graphviz.Digraph(strict=False)
+    for node_id in (root, child, second, thing):
+        graphviz_graph.node(node_id)
+    graphviz_graph.node("superclassOf" + child, label="subclass of")
+    graphviz_graph.edge(root, "superclassOf" + child)
+    graphviz_graph.edge("superclassOf" + child, child)
+    graphviz_graph.node("has part", label="has part")
+    graphviz_graph.edge(second, "has part")
+    graphviz_graph.edge("has part", thing)
+    return rdflib_graph, graphviz_graph
+
+def get_nodes(partition_graph):
+    return {node_ids[0] for kind, node_ids, _ in GraphvizRenderer.parse_body(partition_graph.body) if kind == "node"}
+
+def test_parse_body(graphs):
+    _, graphviz_graph = graphs
+    graphviz_graph.attr("graph", rankdir="LR")
+
+    statements = GraphvizRenderer.parse_body(graphviz_graph.body)
+
+    assert [kind for kind, _, _ in statements].count("node") == 6
+    assert ("edge", ('"has part"', "httpexampleorgotherThing")) in [(kind, node_ids) for kind, node_ids, _ in statements]
+    assert statements[-1][0] == "other"
+    assert GraphvizRenderer.count(statements) == (6, 4)
+
+def test_get_engine():
+    renderer = GraphvizRenderer(node_threshold=10, edge_threshold=20, large_engine="neato")
+
+    assert renderer.get_engine(10, 20) == ("dot", "png")
+    assert renderer.get_engine(11, 0) == ("neato", "svg")
+    assert renderer.get_engine(0, 21) == ("neato", "svg")
+
+def test_namespace_partitions(graphs):
+    rdflib_graph, graphviz_graph = graphs
+
+    partitions = GraphvizRenderer(partition_by="namespace").get_partitions(graphviz_graph, rdflib_graph)
+
+    assert list(partitions) == ["ex", "other"]
+    assert get_nodes(partitions["ex"]) == {"httpexampleorgexRoot", "httpexampleorgexChild", "httpexampleorgexSecond", "superclassOfhttpexampleorgexChild", '"has part"', "httpexampleorgotherThing"}
+    # The property box linking both namespaces is drawn in both partitions
+    assert get_nodes(partitions["other"]) == {"httpexampleorgotherThing", '"has part"', "httpexampleorgexSecond"}
+
+def test_subtree_partitions(graphs):
+    rdflib_graph, graphviz_graph = graphs
+
+    partitions = GraphvizRenderer(partition_by="subtree").get_partitions(graphviz_graph, rdflib_graph)
+
+    assert list(partitions) == ["ex_Root", "ex_Second", "other_Thing"]
+    assert get_nodes(partitions["ex_Root"]) == {"httpexampleorgexRoot", "httpexampleorgexChild", "superclassOfhttpexampleorgexChild"}
+    assert len([kind for kind, _, _ in GraphvizRenderer.parse_body(partitions["ex_Root"].body) if kind == "edge"]) == 2
+
+def test_loose_nodes_join_the_other_namespace(graphs):
+    rdflib_graph, graphviz_graph = graphs
+    graphviz_graph.node("loose")
+
+    partitions = GraphvizRenderer(partition_by="namespace").get_partitions(graphviz_graph, rdflib_graph)
+
+    # The namespace bound to the prefix "other" keeps its classes next to the node attached to no class
+    assert list(partitions) == ["ex", "other"]
+    assert get_nodes(partitions["other"]) == {"httpexampleorgotherThing", '"has part"', "httpexampleorgexSecond", "loose"}
+
+def test_partitions_with_colliding_node_ids():
+    rdflib_graph = rdfGraph()
+    rdflib_graph.bind("ex", EX)
+    rdflib_graph.bind("other", OTHER)
+    for class_uri in (EX["Sample-1"], EX.Sample1, OTHER.Thing):
+        rdflib_graph.add((class_uri, RDF.type, OWL.Class))
+
+    # The parser names the second class httpexampleorgexSample1_2, since both sanitize to the same ID
+    graphviz_node_ids = GraphvizNodeIds()
+    graphviz_graph = graphviz.Digraph(strict=False)
+    with pytest.warns(UserWarning):
+        for class_uri in (EX["Sample-1"], EX.Sample1, OTHER.Thing):
+            graphviz_graph.node(graphviz_node_ids.get(class_uri))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        partitions = GraphvizRenderer(partition_by="namespace").get_partitions(graphviz_graph, rdflib_graph, graphviz_node_ids)
+
+    assert list(partitions) == ["ex", "other"]
+    assert get_nodes(partitions["ex"]) == {"httpexampleorgexSample1", "httpexampleorgexSample1_2"}
+    assert get_nodes(partitions["other"]) == {"httpexampleorgotherThing"}
+
+def test_render(graphs, tmp_path, monkeypatch):
+    commands = []
+    monkeypatch.setattr(subprocess, "run", lambda command, **kwargs: commands.append((command, kwargs["timeout"])))
+    _, graphviz_graph = graphs
+
+    small = GraphvizRenderer(timeout=5).render(graphviz_graph, str(tmp_path / "small"))
+    large = GraphvizRenderer(node_threshold=2, timeout=5).render(graphviz_graph, str(tmp_path / "large"))
+
+    assert small == str(tmp_path / "small.png")
+    assert large == str(tmp_path / "large.svg")
+    assert commands[0] == (["dot", "-Tpng", "-o", small], 5)
+    assert commands[1] == (["sfdp", "-Tsvg", "-o", large, "-Goverlap=false"], 5)
+
+def test_render_timeout(graphs, tmp_path, monkeypatch):
+    def run(command, **kwargs):
+        raise subprocess.TimeoutExpired(command, kwargs["timeout"])
+    monkeypatch.setattr(subprocess, "run", run)
+    rdflib_graph, graphviz_graph = graphs
+    renderer = GraphvizRenderer(timeout=1, partition_by="subtree")
+
+    with pytest.raises(TimeoutError):
+        renderer.render(graphviz_graph, str(tmp_path / "graph"))
+    with pytest.warns(UserWarning):
+        assert renderer.render_partitions(graphviz_graph, rdflib_graph, str(tmp_path / "graph")) == {"ex_Root": None, "ex_Second": None, "other_Thing": None}
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        GraphvizRenderer(large_engine="dot")
+    with pytest.raises(ValueError):
+        GraphvizRenderer(partition_by="module")
+    with pytest.raises(ValueError):
+        GraphvizRenderer(timeout=0)
@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+
+PACKAGE_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the command line interface must not load unless the feature that needs them is used
+HEAVY_MODULES = ["pylode", "matplotlib", "numpy", "graphviz"]
+
+def import_in_subprocess(module):
+    """
+    Imports a module in a fresh interpreter and reports the loaded modules and the cumulative import times.
+    """
+    code = f"import sys, json; import {module}; print(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PACKAGE_FOLDER, capture_output=True, text=True, check=True
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                import_times[name.strip()] = int(cumulative) / 1e6
+    return set(json.loads(result.stdout)), import_times
+
+def test_main_does_not_import_heavy_modules():
+    modules, _ = import_in_subprocess("FAIRmaterials.__main__")
+
+    assert "FAIRmaterials.rdflib_graph_saver" in modules
+    for heavy_module in HEAVY_MODULES:
+        assert heavy_module not in modules
+
+def test_main_import_time():
+    _, import_times = import_in_subprocess("FAIRmaterials.__main__")
+
+    # rdflib dominates the startup time; the bound leaves ample room for slow machines while catching eagerly
+    # imported dependency trees such as pylode's
+    package_time = import_times["FAIRmaterials.__main__"] - import_times.get("rdflib", 0)
+    assert package_time < 1.0, f"Importing FAIRmaterials.__main__ took {package_time:.3f} s without rdflib"
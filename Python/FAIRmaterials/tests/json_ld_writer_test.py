@@ -0,0 +1,69 @@
+import io
+import json
+import pytest
+from rdflib import Graph, Namespace, Literal, URIRef, BNode
+from rdflib.namespace import RDF, RDFS, OWL, SKOS, XSD
+from FAIRmaterials.json_ld_writer import JSONLDWriter
+
+EX = Namespace("http://example.com/ontology#")
+PMD = Namespace("https://w3id.org/pmd/co/")
+
+@pytest.fixture
+def ontology_graph():
+    graph = Graph()
+    graph.bind("ex", EX)
+    graph.bind("pmdco", PMD)
+    graph.bind("xml", "http://www.w3.org/XML/1998/namespace")
+
+    graph.add((EX.Ontology, RDF.type, OWL.Ontology))
+    graph.add((EX.Sample, RDF.type, OWL.Class))
+    graph.add((EX.Sample, RDFS.label, Literal("Sample")))
+    graph.add((EX.Sample, SKOS.altLabel, Literal("Specimen")))
+    graph.add((EX.Sample, SKOS.altLabel, Literal("Piece")))
+    graph.add((EX.Sample, SKOS.definition, Literal("Ein Probenstück", lang="de")))
+    graph.add((EX.Sample, RDFS.subClassOf, PMD.ValueObject))
+    graph.add((EX.Sample, PMD.unit, URIRef("http://qudt.org/2.1/vocab/unit#CentiM")))
+    graph.add((EX.hasWidth, RDF.type, OWL.DatatypeProperty))
+    graph.add((EX.hasWidth, RDF.type, OWL.FunctionalProperty))
+    graph.add((EX.hasWidth, RDFS.domain, EX.Sample))
+    graph.add((EX.hasWidth, RDFS.range, XSD.float))
+    graph.add((EX.hasWidth, SKOS.example, Literal("1.5", datatype=XSD.float)))
+    # Shapes FAIRmaterials does not emit itself, which must still survive the round trip
+    graph.add((EX.Odd, RDF.type, Literal("not an IRI")))
+    graph.add((EX.Odd, RDFS.seeAlso, URIRef("http://www.w3.org/XML/1998/namespacelang")))
+    graph.add((EX.Odd, RDFS.seeAlso, URIRef("https://w3id.org/pmd/co///double")))
+    blank_node = BNode()
+    graph.add((EX.Odd, OWL.equivalentClass, blank_node))
+    graph.add((blank_node, RDF.type, OWL.Restriction))
+    return graph
+
+def write(graph):
+    stream = io.StringIO()
+    JSONLDWriter(graph).write(stream)
+    return stream.getvalue()
+
+def test_round_trip(ontology_graph):
+    assert Graph().parse(data=write(ontology_graph), format="json-ld").isomorphic(ontology_graph)
+
+def test_equivalent_to_rdflib_serializer(ontology_graph):
+    # RDFLib's serializer drops rdf:type triples with literal objects
+    ontology_graph.remove((EX.Odd, RDF.type, None))
+    context = {prefix: str(namespace) for prefix, namespace in ontology_graph.namespaces()}
+    rdflib_output = ontology_graph.serialize(format="json-ld", context=context)
+
+    assert Graph().parse(data=write(ontology_graph), format="json-ld").isomorphic(Graph().parse(data=rdflib_output, format="json-ld"))
+
+def test_compacted_node_objects(ontology_graph):
+    document = json.loads(write(ontology_graph))
+    nodes = {node["@id"]: node for node in document["@graph"]}
+
+    assert document["@context"]["ex"] == str(EX)
+    assert nodes["ex:Sample"]["@type"] == "owl:Class"
+    assert nodes["ex:Sample"]["rdfs:subClassOf"] == {"@id": "pmdco:ValueObject"}
+    assert nodes["ex:Sample"]["skos:altLabel"] == ["Piece", "Specimen"]
+    assert nodes["ex:hasWidth"]["@type"] == ["owl:DatatypeProperty", "owl:FunctionalProperty"]
+    assert nodes["ex:hasWidth"]["skos:example"] == {"@value": "1.5", "@type": "xsd:float"}
+    # The xml namespace does not end with a gen-delim and rdf:type with a literal cannot use @type
+    assert {"@id": "http://www.w3.org/XML/1998/namespacelang"} in nodes["ex:Odd"]["rdfs:seeAlso"]
+    assert {"@id": "https://w3id.org/pmd/co///double"} in nodes["ex:Odd"]["rdfs:seeAlso"]
+    assert "@type" not in nodes["ex:Odd"]
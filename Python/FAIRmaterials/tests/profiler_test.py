@@ -0,0 +1,88 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import pytest
+import graphviz
+from rdflib import Graph as rdfGraph
+from FAIRmaterials.profiler import Profiler, set_profiler, get_profiler, profile_stage
+from FAIRmaterials.fair_sheet_generator import FairSheetGenerator
+from FAIRmaterials.fair_sheet_parser import FairSheetParser
+
+@pytest.fixture
+def profiler():
+    profiler = Profiler()
+    set_profiler(profiler)
+    try:
+        yield profiler
+    finally:
+        set_profiler(None)
+
+def test_nested_stages(profiler):
+    with profile_stage("outer", rows=3):
+        with profile_stage("inner") as counts:
+            counts["triples"] = 10
+
+    stages = profiler.get_stages()
+    assert [stage["path"] for stage in stages] == ["outer/inner", "outer"]
+    assert stages[0]["counts"] == {"triples": 10}
+    assert stages[1]["counts"] == {"rows": 3}
+    assert stages[1]["wall_seconds"] >= stages[0]["wall_seconds"] >= 0
+    assert stages[1]["cpu_seconds"] >= 0
+    assert stages[1]["peak_rss_bytes"] > 0
+
+def test_profile_stage_without_profiler():
+    assert get_profiler() is None
+    with profile_stage("stage", rows=1) as counts:
+        counts["triples"] = 2
+    assert counts == {"rows": 1, "triples": 2}
+
+def test_stage_error(profiler):
+    with pytest.raises(ValueError):
+        with profile_stage("failing"):
+            raise ValueError("failed")
+
+    assert profiler.get_stages()[0]["error"] == "ValueError"
+
+def test_stages_in_threads(profiler):
+    def work():
+        with profile_stage("thread"):
+            pass
+
+    with profile_stage("outer"):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for future in [executor.submit(contextvars.copy_context().run, work) for _ in range(2)]:
+                future.result()
+
+    assert [stage["path"] for stage in profiler.get_stages()] == ["outer/thread", "outer/thread", "outer"]
+
+def test_add_stages(profiler):
+    worker_profiler = Profiler()
+    with worker_profiler.stage("build_ontology"):
+        pass
+
+    with profile_stage("main"):
+        profiler.add_stages(worker_profiler.get_stages())
+
+    assert [stage["path"] for stage in profiler.get_stages()] == ["main/build_ontology", "main"]
+
+def test_write(profiler, tmp_path):
+    with profile_stage("stage"):
+        pass
+
+    profiler.write(tmp_path / "profile.json", version="1.0")
+
+    with open(tmp_path / "profile.json") as profile_file:
+        profile = json.load(profile_file)
+    assert profile["version"] == "1.0"
+    assert profile["wall_seconds"] >= 0
+    assert [stage["name"] for stage in profile["stages"]] == ["stage"]
+
+def test_fair_sheet_parser_stages(profiler, tmp_path):
+    FairSheetGenerator(entities=20, relationships=10, value_types=10).generate(tmp_path)
+
+    FairSheetParser(tmp_path, "Synthetic0", True, rdfGraph(), graphviz.Digraph(strict=False), False)
+
+    stages = {stage["name"]: stage for stage in profiler.get_stages()}
+    assert stages["read_sheets"]["counts"]["rows"] > 0
+    assert stages["parse_entity"]["counts"]["triples"] > 0
+    assert "parse_external" not in stages
@@ -1,8 +1,9 @@
 from re import A
+import warnings
 import pytest
 from rdflib import Graph, Literal, URIRef
 from rdflib.namespace import RDF, OWL, DCTERMS
-from FAIRmaterials.rdflib_graph_merger import RDFLibGraphMerger
+from FAIRmaterials.rdflib_graph_merger import RDFLibGraphMerger, LocalNameIndex
 
 @pytest.fixture
 def ontology_one():
@@ -45,3 +46,92 @@ def test_add_ontology_ownership(ontology_one):
     assert (ontology_namespace, DCTERMS.hasVersion, Literal(ontology_version)) in merged_graph
     assert (ontology_namespace, OWL.versionInfo, Literal(ontology_version)) in merged_graph
     assert (ontology_namespace, DCTERMS.description, Literal(ontology_description)) in merged_graph
+
+def test_merge_many(ontology_one, ontology_two):
+    ontology_three = Graph()
+    ontology_three.add((URIRef("http://example.org/three#subject3"), RDF.type, OWL.Class))
+    ontology_three.add((URIRef("http://example.org/three#Ontology"), RDF.type, OWL.Ontology))
+    ontology_three.bind("three", "http://example.org/three#")
+
+    merged_graph = RDFLibGraphMerger.merge_many([ontology_one, ontology_two, ontology_three])
+
+    # Ensure that the triples with "#Ontology" are removed and all other triples are present
+    assert len(merged_graph) == 3
+    assert (Literal("http://example.org/subject1"), RDF.type, Literal("http://example.org/Object")) in merged_graph
+    assert (Literal("http://example.org/subject2"), RDF.type, Literal("http://example.org/Object")) in merged_graph
+    assert (URIRef("http://example.org/three#subject3"), RDF.type, OWL.Class) in merged_graph
+
+    # Ensure that the namespace bindings of the inputs are kept
+    assert ("three", URIRef("http://example.org/three#")) in set(merged_graph.namespaces())
+
+    # Ensure that the input graphs are left untouched
+    assert len(ontology_three) == 2
+
+def test_merge_many_label_conflicts():
+    ontology_one = Graph()
+    ontology_one.add((URIRef("http://example.org/one#Sample"), RDF.type, OWL.Class))
+    ontology_one.add((URIRef("http://example.org/one#Sample"), DCTERMS.title, Literal("Sample")))
+    ontology_two = Graph()
+    ontology_two.add((URIRef("http://example.org/two/Sample"), RDF.type, OWL.Class))
+    ontology_two.add((URIRef("http://example.org/two/Tool"), RDF.type, OWL.Class))
+    label_index = LocalNameIndex()
+
+    # One warning per conflicting label, not per triple
+    with pytest.warns(UserWarning) as record:
+        RDFLibGraphMerger.merge_many([ontology_one, ontology_two], label_index=label_index)
+    assert len(record) == 1
+
+    assert label_index.get_conflicts() == {"Sample": ["http://example.org/one", "http://example.org/two"]}
+
+    # The index is updated incrementally by later merges
+    ontology_three = Graph()
+    ontology_three.add((URIRef("http://example.org/three#Tool"), RDF.type, OWL.Class))
+    with pytest.warns(UserWarning):
+        RDFLibGraphMerger.merge_many([ontology_three], label_index=label_index)
+    assert label_index.get_conflicts() == {
+        "Sample": ["http://example.org/one", "http://example.org/two"],
+        "Tool": ["http://example.org/three", "http://example.org/two"]
+    }
+
+def test_update_merged_graph():
+    shared_triple = (URIRef("http://example.org/one#Sample"), RDF.type, OWL.Class)
+    old_triple = (URIRef("http://example.org/one#Old"), RDF.type, OWL.Class)
+    new_triple = (URIRef("http://example.org/one#New"), RDF.type, OWL.Class)
+    ontology_one = {shared_triple, old_triple}
+    ontology_two = Graph()
+    ontology_two.add(shared_triple)
+    merged_graph = RDFLibGraphMerger.merge_many([ontology_two])
+    merged_graph.add(old_triple)
+
+    # The changed ontology drops both of its triples and adds a new one and an ontology header
+    header_triple = (URIRef("http://example.org/one#Ontology"), RDF.type, OWL.Ontology)
+    RDFLibGraphMerger.update_merged_graph(merged_graph, ontology_one, [new_triple, header_triple], [ontology_two])
+
+    # The triple still provided by the other ontology is kept
+    assert set(merged_graph) == {shared_triple, new_triple}
+
+def test_update_merged_graph_removes_subjects_from_label_index():
+    one_sample = (URIRef("http://example.org/one#Sample"), RDF.type, OWL.Class)
+    one_label = (URIRef("http://example.org/one#Sample"), DCTERMS.title, Literal("Sample"))
+    two_sample = (URIRef("http://example.org/two#Sample"), RDF.type, OWL.Class)
+    ontology_one = Graph()
+    ontology_one.add(one_sample)
+    ontology_one.add(one_label)
+    label_index = LocalNameIndex()
+    merged_graph = RDFLibGraphMerger.merge_many([ontology_one], label_index=label_index)
+    with pytest.warns(UserWarning):
+        RDFLibGraphMerger.update_merged_graph(merged_graph, [], [two_sample], [{one_sample, one_label}], label_index=label_index)
+
+    # A subject that keeps some of its triples stays in the index, without warning again
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        RDFLibGraphMerger.update_merged_graph(merged_graph, [one_label], [], [{two_sample}], label_index=label_index)
+    assert label_index.get_conflicts() == {"Sample": ["http://example.org/one", "http://example.org/two"]}
+
+    # Once the changed ontology no longer defines the subject, the conflict is gone
+    RDFLibGraphMerger.update_merged_graph(merged_graph, [one_sample], [], [{two_sample}], label_index=label_index)
+    assert label_index.get_conflicts() == {}
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        RDFLibGraphMerger.update_merged_graph(merged_graph, [two_sample], [two_sample], [], label_index=label_index)
+    assert set(merged_graph) == {two_sample}
@@ -1,9 +1,12 @@
 import os
+import gzip
 import tempfile
+from concurrent.futures import Future
 import pytest
 import rdflib
 import graphviz
 from FAIRmaterials.rdflib_graph_saver import RDFLibGraphSaver
+from FAIRmaterials.render_pool import RenderPool
 from graphviz import backend as gv_backend
 
 @pytest.fixture
@@ -89,3 +92,71 @@ def test_generate_pylode_html_valid(saver):
 def test_generate_pylode_html_empty(empty_saver):
     with pytest.raises(ValueError):
         empty_saver.generate_pylode_html()
+
+def test_save_rdflib_graph_ntriples_valid(saver, rdflib_graph):
+    file_path = saver.save_rdflib_graph_ntriples()
+    assert file_path.endswith(".nt")
+    assert rdflib.Graph().parse(file_path, format="nt").isomorphic(rdflib_graph)
+
+def test_save_rdflib_graph_ntriples_compressed_quads(saver, rdflib_graph):
+    file_path = saver.save_rdflib_graph_ntriples(compress=True, quads=True)
+    assert file_path.endswith(".nq.gz")
+    with gzip.open(file_path, "rt", encoding="utf-8") as f:
+        lines = [line for line in f if line.strip()]
+    assert len(lines) == len(rdflib_graph)
+    quads = rdflib.Dataset().parse(data="".join(lines), format="nquads")
+    assert {(s, p, o) for s, p, o, _ in quads.quads((None, None, None, None))} == set(rdflib_graph)
+
+def test_save_rdflib_graph_quads_escapes_literals(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    graph = rdflib.Graph(identifier=rdflib.URIRef("http://example.org/ontology"))
+    subject = rdflib.URIRef("http://example.org/subject")
+    graph.add((subject, rdflib.RDFS.comment, rdflib.Literal('A "multi-line"\ncomment \\ with ünïcode\r', lang="en")))
+    graph.add((subject, rdflib.RDFS.label, rdflib.Literal("1", datatype=rdflib.XSD.integer)))
+    graph.add((subject, rdflib.RDFS.seeAlso, rdflib.BNode()))
+
+    file_path = RDFLibGraphSaver("Escaped", graph, graphviz.Digraph()).save_rdflib_graph_ntriples(quads=True)
+
+    with open(file_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 3
+    quads = rdflib.Dataset().parse(file_path, format="nquads")
+    parsed_graph = rdflib.Graph()
+    for s, p, o, context in quads.quads((None, None, None, None)):
+        assert context == graph.identifier
+        parsed_graph.add((s, p, o))
+    assert parsed_graph.isomorphic(graph)
+
+def test_save_rdflib_graph_ntriples_empty(empty_saver):
+    with pytest.raises(ValueError):
+        empty_saver.save_rdflib_graph_ntriples()
+
+def test_save_all(saver):
+    outputs = saver.save_all(include_graphviz=False, include_pylode_docs=True, include_ntriples=True)
+    assert sorted(outputs) == ["html", "jsonld", "ntriples", "ttl"]
+    assert all(os.path.exists(file_path) for file_path in outputs.values())
+    with open(outputs["html"], "r") as f:
+        # The HTML document is only rendered once
+        assert f.read().count("<html>") == 1
+
+def test_get_missing_outputs():
+    rendered, timed_out = Future(), Future()
+    rendered.set_result({"ex": "ex.svg", "other": None})
+    timed_out.set_result(None)
+    outputs = {"ttl": "test.ttl", "graphviz_partitions": rendered, "graphviz": timed_out}
+
+    assert RDFLibGraphSaver.get_missing_outputs(outputs) == ["graphviz", "graphviz_other"]
+    assert RDFLibGraphSaver.resolve_outputs(outputs) == {"ttl": "test.ttl", "graphviz_ex": "ex.svg"}
+
+def test_save_all_empty(empty_saver):
+    with pytest.raises(ValueError):
+        empty_saver.save_all()
+
+def test_save_all_render_pool(saver):
+    with RenderPool() as render_pool:
+        outputs = saver.save_all(include_graphviz=False, include_pylode_docs=True, render_pool=render_pool)
+        assert isinstance(outputs["html"], Future)
+
+        outputs = RDFLibGraphSaver.resolve_outputs(outputs)
+        assert sorted(outputs) == ["html", "jsonld", "ttl"]
+        assert os.path.exists(outputs["html"])
+        assert [render["artifact"] for render in render_pool.wait()] == ["test_ontology html"]
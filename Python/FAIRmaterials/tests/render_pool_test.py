@@ -0,0 +1,63 @@
+import threading
+import pytest
+from FAIRmaterials.render_pool import RenderPool
+
+def test_submit():
+    with RenderPool(max_workers=2) as render_pool:
+        future = render_pool.submit("first", lambda value: value * 2, 21)
+
+        assert future.result() == 42
+        renders = render_pool.wait()
+
+    assert renders[0]["artifact"] == "first"
+    assert renders[0]["error"] is None
+    assert renders[0]["seconds"] >= 0
+
+def test_failed_render():
+    def fail():
+        raise RuntimeError("layout failed")
+
+    with RenderPool() as render_pool:
+        future = render_pool.submit("diagram", fail)
+        renders = render_pool.wait()
+
+    assert isinstance(future.exception(), RuntimeError)
+    assert renders[0]["error"] == "RuntimeError: layout failed"
+
+def test_wait_reports_renders_once():
+    with RenderPool() as render_pool:
+        render_pool.submit("first", lambda: None)
+        assert len(render_pool.wait()) == 1
+        assert render_pool.wait() == []
+
+def test_when_done():
+    release = threading.Event()
+    written = []
+    with RenderPool(max_workers=1) as render_pool:
+        futures = [render_pool.submit("diagram", release.wait), render_pool.submit("html", lambda: "page.html")]
+        render_pool.when_done("manifest", futures, lambda: written.append([future.result() for future in futures]))
+        assert written == []
+
+        release.set()
+        renders = render_pool.wait()
+
+    # wait() returns only after the follow-up task has run
+    assert written == [[True, "page.html"]]
+    assert [render["artifact"] for render in renders] == ["diagram", "html", "manifest"]
+
+def test_when_done_skipped_after_failure():
+    def fail():
+        raise RuntimeError("layout failed")
+
+    written = []
+    with RenderPool() as render_pool:
+        futures = [render_pool.submit("diagram", fail)]
+        render_pool.when_done("manifest", futures, lambda: written.append(True))
+        renders = render_pool.wait()
+
+    assert written == []
+    assert [render["artifact"] for render in renders] == ["diagram"]
+
+def test_invalid_max_workers():
+    with pytest.raises(ValueError):
+        RenderPool(max_workers=0)
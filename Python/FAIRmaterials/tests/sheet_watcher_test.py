@@ -0,0 +1,51 @@
+import os
+import threading
+import pytest
+from FAIRmaterials.sheet_watcher import SheetWatcher
+
+@pytest.fixture
+def sheet_folder(tmp_path):
+    for name in ("PV- NameSpace.csv", "PV- ValueTypeDefinitions.csv", "XRay- VariableDefinitions.csv", "notes.txt"):
+        (tmp_path / name).write_text("Prefix Name\n")
+    return tmp_path
+
+def touch(path, content):
+    path.write_text(content)
+    # Make the change visible even on file systems with a coarse modification time
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+def test_get_changed_sheets():
+    changed_sheets = SheetWatcher.get_changed_sheets([
+        "PV- NameSpace.csv",
+        "PV- ValueTypeDefinitions.csv",
+        "XRay- VariableDefinitions.csv",
+        "~$PV- NameSpace.csv",
+        "notes.txt"
+    ])
+
+    assert changed_sheets == {"PV": {"namespace", "value_type"}, "XRay": {"entity"}}
+
+def test_poll(sheet_folder):
+    watcher = SheetWatcher(sheet_folder)
+    assert watcher.poll() == set()
+
+    touch(sheet_folder / "PV- ValueTypeDefinitions.csv", "ValueType Name\n")
+    (sheet_folder / "XRay- VariableDefinitions.csv").unlink()
+    (sheet_folder / "notes.txt").write_text("Not a sheet\n")
+
+    assert watcher.poll() == {"PV- ValueTypeDefinitions.csv", "XRay- VariableDefinitions.csv"}
+    assert watcher.poll() == set()
+
+def test_wait_for_changes_debounces(sheet_folder):
+    watcher = SheetWatcher(sheet_folder, interval=0.01, debounce=0.2)
+    assert watcher.wait_for_changes(timeout=0.05) == {}
+
+    # A second sheet saved shortly after the first one is reported together with it
+    touch(sheet_folder / "PV- NameSpace.csv", "Prefix Name,Ontology URL\n")
+    timer = threading.Timer(0.05, touch, (sheet_folder / "PV- ValueTypeDefinitions.csv", "ValueType Name\n"))
+    timer.start()
+    try:
+        assert watcher.wait_for_changes(timeout=1) == {"PV": {"namespace", "value_type"}}
+    finally:
+        timer.join()
@@ -0,0 +1,70 @@
+import pickle
+import graphviz
+from rdflib import Graph as rdfGraph, URIRef, Literal, BNode
+from rdflib.namespace import XSD
+from FAIRmaterials.term_interner import TermInterner
+from FAIRmaterials.fair_sheet_generator import FairSheetGenerator
+from FAIRmaterials.fair_sheet_parser import FairSheetParser
+from FAIRmaterials.rdflib_graph_merger import RDFLibGraphMerger
+
+def test_intern():
+    term_interner = TermInterner()
+
+    uri = term_interner.uri("http://example.org/ex#Thing")
+    assert term_interner.intern(URIRef("http://example.org/ex#Thing")) is uri
+    assert term_interner.uri("http://example.org/ex#Thing") is uri
+    node = term_interner.intern(BNode("node"))
+    assert term_interner.intern(BNode("node")) is node
+    assert len(term_interner) == 2
+
+def test_intern_literals():
+    term_interner = TermInterner()
+
+    literal = term_interner.literal("1", datatype=XSD.integer)
+    assert term_interner.intern(Literal("1", datatype=XSD.integer)) is literal
+    # Literals differing in their datatype or language are different terms
+    assert term_interner.literal("1") is not literal
+    assert term_interner.literal("1", lang="en") is not term_interner.literal("1", lang="de")
+    # A literal is never the same term as a URI with the same text
+    assert term_interner.literal("http://example.org/ex#Thing") is not term_interner.uri("http://example.org/ex#Thing")
+
+def test_intern_triple():
+    term_interner = TermInterner()
+    triple = (URIRef("http://example.org/s"), URIRef("http://example.org/p"), Literal("o"))
+
+    interned = term_interner.intern_triple(triple)
+    copy = term_interner.intern_triple(pickle.loads(pickle.dumps(triple)))
+
+    assert interned == triple
+    assert all(term is copy_term for term, copy_term in zip(interned, copy))
+
+def test_retain():
+    term_interner = TermInterner()
+    kept = (term_interner.uri("http://example.org/s"), term_interner.uri("http://example.org/p"), term_interner.literal("kept"))
+    term_interner.literal("dropped")
+    term_interner.uri("http://example.org/dropped")
+
+    term_interner.retain([{kept}])
+
+    assert len(term_interner) == 3
+    assert term_interner.literal("kept") is kept[2]
+    assert term_interner.uri("http://example.org/s") is kept[0]
+    # Dropped terms are created again when they are used again
+    assert len(term_interner) == 3
+    term_interner.literal("dropped")
+    assert len(term_interner) == 4
+
+def test_shared_interner(tmp_path):
+    prefixes = FairSheetGenerator(entities=20, relationships=10, value_types=10, prefixes=2).generate(tmp_path)
+    term_interner = TermInterner()
+
+    graphs = [FairSheetParser(tmp_path, prefix, True, rdfGraph(), graphviz.Digraph(strict=False), False, term_interner=term_interner).get_rdf_graph() for prefix in prefixes]
+    # Graphs sent back by worker processes arrive with their own copies of every term
+    merged_graph = RDFLibGraphMerger.merge_many([pickle.loads(pickle.dumps(graph)) for graph in graphs], term_interner=term_interner)
+
+    terms = {}
+    for graph in graphs + [merged_graph]:
+        for triple in graph:
+            for term in triple:
+                assert terms.setdefault(term, term) is term
+    assert len(merged_graph) > 0
@@ -0,0 +1,107 @@
+import csv
+import gzip
+import os
+import pytest
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import RDF, XSD
+from FAIRmaterials.__main__ import ingest_values
+from FAIRmaterials.fair_sheet_generator import FairSheetGenerator
+from FAIRmaterials.value_csv_ingester import ValueCsvIngester
+
+EX = "http://example.org/ex#"
+
+class Parser:
+    """
+    The terms of a parsed ontology, as read by ValueCsvIngester from a FairSheetParser.
+    """
+
+    def get_entity_uris(self):
+        return {"Sample": URIRef(EX + "Sample"), "Measurement": URIRef(EX + "Measurement")}
+
+    def get_data_property_uris(self):
+        return {"name": URIRef(EX + "name"), "voltage": URIRef(EX + "voltage")}
+
+    def get_individual_relationships(self):
+        return {"Sample": [("Measurement", URIRef(EX + "hasMeasurement")), ("Instrument", URIRef(EX + "measuredWith"))]}
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "values.csv"
+    path.write_text(
+        "name(Sample->xsd:string),voltage(Measurement->xsd:float)\n"
+        "S1,1.5\n"
+        "S1,2.5\n"
+        "S2,\n"
+        "S1,1.5\n"
+        ",\n"
+    )
+    return path
+
+def read_graph(path):
+    graph = Graph()
+    with (gzip.open if str(path).endswith(".gz") else open)(path, "rt", encoding="utf-8") as f:
+        graph.parse(data=f.read(), format="nt")
+    return graph
+
+def test_ingest(csv_path, tmp_path):
+    output_path = ValueCsvIngester(Parser()).ingest(csv_path, tmp_path / "values.nt")
+
+    graph = read_graph(output_path)
+    samples = set(graph.subjects(RDF.type, URIRef(EX + "Sample")))
+    measurements = set(graph.subjects(RDF.type, URIRef(EX + "Measurement")))
+    assert len(samples) == 2
+    assert len(measurements) == 2
+    assert {graph.value(sample, URIRef(EX + "name")) for sample in samples} == {Literal("S1", datatype=XSD.string), Literal("S2", datatype=XSD.string)}
+    assert {graph.value(measurement, URIRef(EX + "voltage")) for measurement in measurements} == {Literal("1.5", datatype=XSD.float), Literal("2.5", datatype=XSD.float)}
+    # Only rows with both individuals are linked, the Instrument entity has no columns
+    assert len(list(graph.triples((None, URIRef(EX + "hasMeasurement"), None)))) == 2
+    assert len(list(graph.triples((None, URIRef(EX + "measuredWith"), None)))) == 0
+    # Repeated rows are written once
+    with open(output_path) as f:
+        assert len(f.readlines()) == len(graph)
+
+def test_stable_iris(csv_path, tmp_path):
+    # A small cache and chunk size write repeated individuals again, under the same IRIs
+    first_path = ValueCsvIngester(Parser()).ingest(csv_path, tmp_path / "first.nt", compress=True)
+    second_path = ValueCsvIngester(Parser(), chunk_rows=1, max_cached_keys=1).ingest(csv_path, tmp_path / "second.nt")
+
+    assert first_path == str(tmp_path / "first.nt.gz")
+    assert set(read_graph(first_path)) == set(read_graph(second_path))
+    with open(second_path) as f:
+        assert len(f.readlines()) > len(read_graph(second_path))
+
+def test_unknown_columns(tmp_path):
+    path = tmp_path / "values.csv"
+    path.write_text("name(Sample->xsd:string),current(Sample->xsd:float)\n")
+    with pytest.raises(ValueError):
+        ValueCsvIngester(Parser()).ingest(path, tmp_path / "values.nt")
+    path.write_text("name\n")
+    with pytest.raises(ValueError):
+        ValueCsvIngester(Parser()).ingest(path, tmp_path / "values.nt")
+
+def test_ingest_values_keeps_ontology_file(tmp_path, monkeypatch):
+    prefixes = FairSheetGenerator(entities=10, relationships=10, value_types=10).generate(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    # The ontology file of a build is saved in the same output folder as the values
+    ontology_path = tmp_path / "Synthetic0_output" / "Synthetic0.nt"
+    ontology_path.parent.mkdir()
+    ontology_path.write_text("ontology\n")
+    csv_path = tmp_path / "Synthetic0.csv"
+    csv_path.write_text("value1(Entity7->xsd:float)\n1.5\n")
+
+    file_paths = ingest_values(tmp_path, prefixes, [("Synthetic0", csv_path)])
+
+    assert file_paths == [os.path.join("Synthetic0_output", "Synthetic0.values.nt")]
+    assert ontology_path.read_text() == "ontology\n"
+    assert len(read_graph(file_paths[0])) == 2
+
+def test_escaped_values(tmp_path):
+    path = tmp_path / "values.csv"
+    value = 'A "quoted"\\ name\nwith lines\r and ünïcode'
+    with open(path, "w", newline="") as f:
+        csv.writer(f).writerow(["name(Sample->xsd:string)"])
+        csv.writer(f).writerow([value])
+
+    graph = read_graph(ValueCsvIngester(Parser()).ingest(path, tmp_path / "values.nt"))
+
+    assert set(graph.objects(None, URIRef(EX + "name"))) == {Literal(value, datatype=XSD.string)}